@@ -0,0 +1,134 @@
+"""
+Filtres - Filtrage et tri des actifs côté base de données
+
+Les métriques calculées (valeur, gain, performance) sont des annotations SQL
+(AssetQuerySet.with_metrics) : filtre et tri sans charger les actifs en Python.
+"""
+
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Asset
+
+# Paramètre -> (lookup, conversion)
+RANGE_FILTERS = {
+    'purchase_date_after': ('purchase_date__gte', date.fromisoformat),
+    'purchase_date_before': ('purchase_date__lte', date.fromisoformat),
+    'min_value': ('current_value_sql__gte', float),
+    'max_value': ('current_value_sql__lte', float),
+    'min_gain_loss': ('gain_loss_sql__gte', float),
+    'max_gain_loss': ('gain_loss_sql__lte', float),
+    'min_performance': ('performance_percentage_sql__gte', float),
+    'max_performance': ('performance_percentage_sql__lte', float),
+}
+
+# Bornes applicables à l'archive (colonnes, sans métriques SQL)
+HISTORY_RANGE_FILTERS = {param: RANGE_FILTERS[param] for param in ('purchase_date_after', 'purchase_date_before')}
+
+# Valeur de ?ordering= -> expression de tri
+ORDERING_FIELDS = {
+    'symbol': 'symbol',
+    'name': 'name',
+    'asset_type': 'asset_type',
+    'quantity': 'quantity',
+    'current_price': 'current_price',
+    'purchase_date': 'purchase_date',
+    'created_at': 'created_at',
+    'current_value': 'current_value_sql',
+    'gain_loss': 'gain_loss_sql',
+    'performance_percentage': 'performance_percentage_sql',
+}
+
+
+def split_param(value: str):
+    """Découper un paramètre a,b,c en liste de valeurs non vides"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_filters(query_params, range_filters, errors):
+    """
+    Convertir ?asset_type=, ?symbol= et les bornes en lookups ORM
+
+    Args:
+        query_params: Paramètres de la requête
+        range_filters: Bornes acceptées (paramètre -> (lookup, conversion))
+        errors: Dict complété par les paramètres invalides
+
+    Returns:
+        Dict de lookups
+    """
+    filters = {}
+    if query_params.get('asset_type'):
+        asset_types = split_param(query_params['asset_type'])
+        invalid = [value for value in asset_types if value not in Asset.AssetType.values]
+        if invalid:
+            errors['asset_type'] = f"Types inconnus : {', '.join(invalid)}"
+        filters['asset_type__in'] = asset_types
+    if query_params.get('symbol'):
+        filters['symbol__in'] = split_param(query_params['symbol'])
+
+    for param, (lookup, convert) in range_filters.items():
+        value = query_params.get(param)
+        if value in (None, ''):
+            continue
+        try:
+            filters[lookup] = convert(value)
+        except ValueError:
+            errors[param] = "Valeur invalide"
+    return filters
+
+
+def history_filters(query_params):
+    """
+    Lookups de l'historique (?asset_type=, ?symbol=, ?purchase_date_after=,
+    ?purchase_date_before=), communs aux actifs courants et archivés
+
+    Raises:
+        ValidationError: Si un paramètre est invalide
+    """
+    errors = {}
+    filters = parse_filters(query_params, HISTORY_RANGE_FILTERS, errors)
+    if errors:
+        raise ValidationError(errors)
+    return filters
+
+
+def filter_assets(queryset, query_params):
+    """
+    Appliquer ?asset_type=, ?symbol=, les bornes (dates, valeur, gain,
+    performance) et ?ordering= à un QuerySet d'actifs
+
+    Args:
+        queryset: QuerySet d'Asset (AssetQuerySet)
+        query_params: Paramètres de la requête
+
+    Returns:
+        QuerySet filtré et trié
+
+    Raises:
+        ValidationError: Si un paramètre est invalide
+    """
+    errors = {}
+    filters = parse_filters(query_params, RANGE_FILTERS, errors)
+
+    ordering = []
+    for item in split_param(query_params.get('ordering', '')):
+        descending = item.startswith('-')
+        field = ORDERING_FIELDS.get(item.lstrip('-'))
+        if field is None:
+            errors['ordering'] = f"Tri possible sur : {', '.join(ORDERING_FIELDS)}"
+            break
+        ordering.append(f"-{field}" if descending else field)
+
+    if errors:
+        raise ValidationError(errors)
+
+    if any(lookup.split('__')[0].endswith('_sql') for lookup in filters) \
+            or any(field.lstrip('-').endswith('_sql') for field in ordering):
+        queryset = queryset.with_metrics()
+    queryset = queryset.filter(**filters)
+    if ordering:
+        # id en dernier critère : ordre stable pour les ex aequo
+        queryset = queryset.order_by(*ordering, 'id')
+    return queryset
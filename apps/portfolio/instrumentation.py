@@ -0,0 +1,206 @@
+"""
+Instrumentation - Budget de requêtes SQL et détection des N+1
+
+Les requêtes sont comptées par requête HTTP (QueryBudgetMiddleware) et par
+méthode de service (décorateur track_queries). Un dépassement de budget ou
+une même requête SELECT répétée (N+1 probable) est journalisé avec la pile
+d'appels du projet ; en mode 'raise' (développement, tests), la requête
+échoue avec QueryBudgetExceeded.
+
+Réglages :
+    QUERY_BUDGET_MODE: 'off', 'log' (défaut) ou 'raise'
+    QUERY_BUDGETS: {nom de vue ou 'Classe.méthode': nombre maximal de requêtes}
+    QUERY_BUDGET_DEFAULT: budget des vues absentes de QUERY_BUDGETS (None = aucun)
+    QUERY_N_PLUS_ONE_THRESHOLD: répétitions d'un même SELECT signalées (défaut 5)
+"""
+
+import logging
+import re
+import traceback
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+IN_LIST_RE = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+PROJECT_DIR = str(Path(__file__).resolve().parents[2])
+THIS_FILE = str(Path(__file__).resolve())
+
+
+class QueryBudgetExceeded(Exception):
+    """Budget de requêtes dépassé ou N+1 détecté (mode 'raise')"""
+
+
+def get_mode() -> str:
+    return getattr(settings, 'QUERY_BUDGET_MODE', 'log')
+
+
+def get_budget(name: Optional[str], default: Optional[int] = None) -> Optional[int]:
+    """Budget configuré pour une vue ou une méthode, sinon `default`"""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(name, default)
+
+
+def query_shape(sql: str) -> str:
+    """Forme d'une requête : les listes IN (%s, %s, ...) sont ramenées à une seule"""
+    return IN_LIST_RE.sub('(%s...)', sql)
+
+
+def project_stack(limit: int = 8) -> str:
+    """Pile d'appels limitée au code du projet"""
+    frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(PROJECT_DIR)
+        and frame.filename != THIS_FILE
+        and 'site-packages' not in frame.filename
+    ]
+    return ''.join(traceback.format_list(frames[-limit:]))
+
+
+class QueryRecorder:
+    """
+    Compter les requêtes exécutées sur une connexion (execute_wrapper)
+
+    Seuls des compteurs sont tenus pendant l'exécution : la pile d'appels
+    (coûteuse) n'est capturée que lorsqu'une forme de requête atteint le
+    seuil de N+1, ou pour la requête qui dépasse le budget.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, threshold: Optional[int] = None,
+                 budget: Optional[int] = None):
+        """
+        Args:
+            using: Alias de la connexion
+            threshold: Répétitions d'un SELECT à partir desquelles sa pile est capturée
+                (défaut : QUERY_N_PLUS_ONE_THRESHOLD)
+            budget: Budget de requêtes (modifiable en cours d'enregistrement)
+        """
+        self.using = using
+        self.threshold = threshold if threshold is not None else getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        self.budget = budget
+        self.count = 0
+        self.shapes: Counter = Counter()
+        self.stacks: Dict[str, str] = {}
+        self.budget_stack: Optional[str] = None
+        self._context = None
+
+    def __enter__(self) -> 'QueryRecorder':
+        self._context = connections[self.using].execute_wrapper(self)
+        self._context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._context.__exit__(*exc_info)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        shape = query_shape(sql)
+        self.shapes[shape] += 1
+        if self.shapes[shape] == self.threshold:
+            self.stacks[shape] = project_stack()
+        if self.budget is not None and self.count == self.budget + 1:
+            self.budget_stack = project_stack()
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int, str]]:
+        """SELECT exécutés au moins `threshold` fois : (forme, nombre, pile si capturée)"""
+        return [
+            (shape, count, self.stacks.get(shape, ''))
+            for shape, count in self.shapes.items()
+            if count >= threshold and shape.lstrip().upper().startswith('SELECT')
+        ]
+
+
+def check_queries(recorder: QueryRecorder, label: str, budget: Optional[int]) -> List[str]:
+    """
+    Journaliser les dépassements de budget et les N+1 d'un enregistrement
+
+    Returns:
+        Problèmes détectés
+
+    Raises:
+        QueryBudgetExceeded: En mode 'raise' si un problème est détecté
+    """
+    problems = []
+    if budget is not None and recorder.count > budget:
+        problem = f"{label} : {recorder.count} requêtes (budget {budget})"
+        if recorder.budget_stack and recorder.budget == budget:
+            problem += f"\n{recorder.budget_stack}"
+        problems.append(problem)
+    threshold = getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+    for shape, count, stack in recorder.repeated(threshold):
+        problems.append(f"{label} : requête répétée {count} fois (N+1 probable) : {shape}\n{stack}")
+
+    for problem in problems:
+        logger.warning(problem)
+    if problems and get_mode() == 'raise':
+        raise QueryBudgetExceeded('\n'.join(problems))
+    return problems
+
+
+def track_queries(budget: Optional[int] = None):
+    """
+    Décorateur : budget de requêtes d'une méthode de service
+
+    Args:
+        budget: Budget par défaut (QUERY_BUDGETS['Classe.méthode'] est prioritaire)
+    """
+    def decorator(method):
+        label = method.__qualname__
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if get_mode() == 'off':
+                return method(*args, **kwargs)
+            method_budget = get_budget(label, budget)
+            with QueryRecorder(budget=method_budget) as recorder:
+                result = method(*args, **kwargs)
+            check_queries(recorder, label, method_budget)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Compter les requêtes SQL de chaque requête HTTP et appliquer le budget
+    de la vue (nom de route : 'asset-list', 'portfolio_summary', ...).
+    En DEBUG, le nombre de requêtes est renvoyé dans l'en-tête X-Query-Count.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if get_mode() == 'off':
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            request.query_recorder = recorder
+            response = self.get_response(request)
+
+        budget = self.get_view_budget(request)
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(recorder.count)
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        check_queries(recorder, f"{request.method} {request.path} ({view_name})", budget)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Vue résolue : son budget est connu, la requête qui le dépasse gardera sa pile"""
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            recorder.budget = self.get_view_budget(request)
+
+    @staticmethod
+    def get_view_budget(request) -> Optional[int]:
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        return get_budget(view_name, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
@@ -0,0 +1,56 @@
+"""
+Archivage des actifs froids (lots soldés, portefeuilles inactifs)
+Usage:
+    python manage.py archive_assets                      # lots soldés + inactifs depuis ARCHIVE_DORMANT_DAYS
+    python manage.py archive_assets --dormant-days 0     # lots soldés seulement
+    python manage.py archive_assets --dry-run
+    python manage.py archive_assets --restore-user 42
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.portfolio.services.archive import ArchiveService
+
+
+class Command(BaseCommand):
+    help = "Déplacer les lots soldés et les portefeuilles inactifs vers l'archive, par lots"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dormant-days', type=int, default=settings.ARCHIVE_DORMANT_DAYS,
+                            help="Inactivité avant archivage d'un portefeuille (0 = désactivé)")
+        parser.add_argument('--no-closed', action='store_true', help="Ne pas archiver les lots soldés")
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                            help="Actifs déplacés par transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Compter sans rien déplacer")
+        parser.add_argument('--restore-user', type=int, default=None,
+                            help="Restaurer le portefeuille archivé d'un utilisateur")
+
+    def handle(self, *args, **options):
+        service = ArchiveService(batch_size=max(1, options['batch_size']))
+        started = time.monotonic()
+
+        if options['restore_user'] is not None:
+            report = {'restored': service.restore_user(options['restore_user'])}
+        else:
+            report = {'dormant_users': 0, 'dormant_assets': 0, 'closed': 0}
+            # Inactifs d'abord : leurs lots soldés partent avec le reste du portefeuille
+            if options['dormant_days'] > 0:
+                if options['dry_run']:
+                    user_ids = service.dormant_user_ids(options['dormant_days'])
+                    report['dormant_users'] = len(user_ids)
+                    report['dormant_assets'] = service.count_assets(user_ids)
+                else:
+                    dormant = service.archive_dormant(options['dormant_days'])
+                    report['dormant_users'], report['dormant_assets'] = dormant['users'], dormant['assets']
+            if not options['no_closed']:
+                report['closed'] = (
+                    service.closed_lots().count() if options['dry_run'] else service.archive_closed()
+                )
+            report['dry_run'] = options['dry_run']
+
+        report['elapsed'] = round(time.monotonic() - started, 3)
+        self.stdout.write(json.dumps(report))
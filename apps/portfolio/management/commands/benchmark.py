@@ -0,0 +1,90 @@
+"""
+Microbenchmarks (calculators, PortfolioService, sérialiseurs) et détection des régressions
+Usage:
+    python manage.py benchmark --save                       # enregistrer la baseline
+    python manage.py benchmark --threshold 0.2              # comparer à la baseline
+    python manage.py benchmark --only calculator. --sizes 100,10000
+"""
+
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.portfolio.services.benchmark import DEFAULT_SIZES, BenchmarkSuite, compare
+
+
+def parse_sizes(value: str):
+    sizes = [int(size) for size in value.split(',') if size.strip()]
+    if not sizes or min(sizes) < 1:
+        raise ValueError
+    return sizes
+
+
+class Command(BaseCommand):
+    help = "Mesurer les calculators, le service et les sérialiseurs et comparer à une baseline JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                            help="Tailles de portefeuille, ex. 10,100,1000")
+        parser.add_argument('--only', default='', help="Préfixes de noms (calculator.,service.summary,...)")
+        parser.add_argument('--min-time', type=float, default=0.05, help="Durée minimale d'une mesure (s)")
+        parser.add_argument('--rounds', type=int, default=5, help="Nombre de mesures par benchmark")
+        parser.add_argument('--seed', type=int, default=0, help="Graine des portefeuilles générés")
+        parser.add_argument('--baseline', default=None,
+                            help="Fichier de baseline (par défaut BENCHMARK_BASELINE_FILE)")
+        parser.add_argument('--save', action='store_true', help="Écrire les résultats comme nouvelle baseline")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Ralentissement toléré (0.2 = +20 %%)")
+        parser.add_argument('--output', default=None, help="Écrire le rapport JSON dans ce fichier")
+        parser.add_argument('--list', action='store_true', help="Lister les benchmarks disponibles")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in BenchmarkSuite.get_available_benchmarks():
+                self.stdout.write(name)
+            return
+
+        suite = BenchmarkSuite(
+            sizes=options['sizes'],
+            min_time=options['min_time'],
+            rounds=max(1, options['rounds']),
+            seed=options['seed']
+        )
+        only = [prefix.strip() for prefix in options['only'].split(',') if prefix.strip()]
+        if not suite.select(only):
+            raise CommandError(f"Aucun benchmark ne correspond à '{options['only']}'")
+
+        results = suite.run(only, progress=lambda key, measurement: self.stderr.write(
+            f"{key:<45} {measurement['min_us']:>14.2f} µs  (x{measurement['number']})"
+        ))
+
+        baseline_path = options['baseline'] or str(settings.BENCHMARK_BASELINE_FILE)
+        report = {'meta': results['meta'], 'results': results['results']}
+        regressions = []
+        if os.path.exists(baseline_path) and not options['save']:
+            with open(baseline_path) as handle:
+                baseline = json.load(handle)
+            report['comparison'] = compare(results, baseline, options['threshold'])
+            regressions = [entry for entry in report['comparison'] if entry['status'] == 'regression']
+
+        if options['save']:
+            os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+            if os.path.exists(baseline_path):
+                # Les benchmarks non exécutés cette fois gardent leur ancienne valeur
+                with open(baseline_path) as handle:
+                    results['results'] = {**json.load(handle).get('results', {}), **results['results']}
+            with open(baseline_path, 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output)
+        self.stdout.write(output)
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} régression(s) au-delà de {options['threshold']:.0%} : "
+                + ', '.join(f"{entry['benchmark']} (x{entry['ratio']})" for entry in regressions)
+            )
@@ -0,0 +1,81 @@
+"""
+Génération d'un jeu de données synthétique (utilisateurs et portefeuilles)
+Usage:
+    python manage.py generate_dataset --users 100000 --mean-assets 100 --seed 42
+    python manage.py generate_dataset --users 1000 --prefix bench_ --reset
+"""
+
+import json
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.portfolio.services.datagen import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = "Générer des utilisateurs et des portefeuilles réalistes (bulk_create, reproductible par graine)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, required=True, help="Nombre d'utilisateurs")
+        parser.add_argument('--mean-assets', type=float, default=50.0, help="Lignes Asset moyennes par utilisateur")
+        parser.add_argument('--size-sigma', type=float, default=1.2, help="Asymétrie des tailles de portefeuille")
+        parser.add_argument('--max-assets', type=int, default=5000, help="Taille maximale d'un portefeuille")
+        parser.add_argument('--lots', type=float, default=3.0, help="Lots moyens par symbole détenu")
+        parser.add_argument('--seed', type=int, default=None, help="Graine (données reproductibles)")
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None,
+                            help="Date d'achat la plus récente (AAAA-MM-JJ), aujourd'hui par défaut")
+        parser.add_argument('--prefix', default='synth_', help="Préfixe des noms d'utilisateur")
+        parser.add_argument('--password', default='synthetic', help="Mot de passe commun")
+        parser.add_argument('--user-batch', type=int, default=2000, help="Utilisateurs par transaction")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Lignes par INSERT")
+        parser.add_argument('--reset', action='store_true', help="Supprimer d'abord les utilisateurs du préfixe")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError("--users doit être positif")
+        users = get_user_model().objects.filter(username__startswith=options['prefix'])
+        if options['reset']:
+            users.delete()
+        elif users.exists():
+            raise CommandError(f"Des utilisateurs '{options['prefix']}*' existent déjà (utiliser --reset)")
+
+        try:
+            generator = DatasetGenerator(
+                seed=options['seed'],
+                mean_assets=options['mean_assets'],
+                size_sigma=options['size_sigma'],
+                max_assets=options['max_assets'],
+                lots_per_position=options['lots'],
+                end_date=options['end_date']
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        started = time.monotonic()
+        total_users = total_assets = 0
+        for created_users, created_assets in generator.populate(
+            options['users'],
+            prefix=options['prefix'],
+            password=options['password'],
+            user_batch=options['user_batch'],
+            batch_size=options['batch_size']
+        ):
+            total_users += created_users
+            total_assets += created_assets
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stderr.write(json.dumps({
+                'users': total_users,
+                'assets': total_assets,
+                'assets_per_second': round(total_assets / elapsed, 1),
+            }))
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(json.dumps({
+            'users': total_users,
+            'assets': total_assets,
+            'elapsed_s': round(elapsed, 3),
+            'assets_per_second': round(total_assets / elapsed, 1),
+        }))
@@ -0,0 +1,58 @@
+"""
+Ingestion des prix de marché (boucle asyncio)
+Usage: python manage.py ingest_prices --source tcp:127.0.0.1:9000 --window 0.5
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.portfolio.services.market_data import PriceIngestor, open_source
+
+
+class Command(BaseCommand):
+    help = "Lire des ticks de prix et mettre à jour current_price par lots"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', required=True, help="file:<chemin>, unix:<chemin> ou tcp:<hôte>:<port>")
+        parser.add_argument('--window', type=float, default=0.5, help="Fenêtre de coalescence (s)")
+        parser.add_argument('--max-pending', type=int, default=50000, help="Symboles en attente avant backpressure")
+        parser.add_argument('--stats-interval', type=float, default=10.0, help="Affichage des statistiques (s), 0 pour désactiver")
+        parser.add_argument('--duration', type=float, default=None, help="Arrêter après N secondes")
+        parser.add_argument('--from-start', action='store_true', help="file: lire depuis le début du fichier")
+        parser.add_argument('--no-follow', action='store_true', help="file: s'arrêter en fin de fichier")
+
+    def handle(self, *args, **options):
+        file_options = {}
+        if options['source'].startswith('file:'):
+            file_options = {'from_start': options['from_start'], 'follow': not options['no_follow']}
+        try:
+            source = open_source(options['source'], **file_options)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        ingestor = PriceIngestor(window=options['window'], max_pending=options['max_pending'])
+
+        async def main():
+            reporter = None
+            if options['stats_interval']:
+                reporter = asyncio.create_task(self.report(ingestor, options['stats_interval']))
+            try:
+                return await ingestor.run(source, duration=options['duration'])
+            finally:
+                if reporter is not None:
+                    reporter.cancel()
+
+        try:
+            # async_to_sync : les écritures ORM (thread_sensitive) restent dans ce thread
+            stats = async_to_sync(main)()
+        except KeyboardInterrupt:
+            stats = ingestor.stats
+        self.stdout.write(json.dumps(stats.as_dict()))
+
+    async def report(self, ingestor: PriceIngestor, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.stdout.write(json.dumps(ingestor.stats.as_dict()))
@@ -0,0 +1,67 @@
+"""
+Test de charge de l'API (chemin complet : auth, vue, service, sérialiseur)
+Usage:
+    python manage.py load_test --users 20 --concurrency 8 --duration 30 --mix list=5,summary=2,performance=2,create=1
+    python manage.py load_test --base-url http://127.0.0.1:8000 --requests 5000 --output report.json
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.portfolio.services.loadtest import DEFAULT_MIX, HttpTransport, InProcessTransport, LoadTest, parse_mix
+
+
+class Command(BaseCommand):
+    help = "Mesurer le débit et les latences (p50/p95/p99) des endpoints du portefeuille"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default=None, help="Serveur cible ; par défaut, application en processus")
+        parser.add_argument('--users', type=int, default=10, help="Nombre d'utilisateurs synthétiques")
+        parser.add_argument('--concurrency', type=int, default=8, help="Nombre de threads clients")
+        parser.add_argument('--duration', type=float, default=None, help="Durée (s), 10 par défaut sans --requests")
+        parser.add_argument('--requests', type=int, default=None, help="Nombre total de requêtes")
+        parser.add_argument('--mix', default=DEFAULT_MIX, help="Poids par endpoint (list, summary, performance, create)")
+        parser.add_argument('--seed', type=int, default=None, help="Graine du tirage des requêtes")
+        parser.add_argument('--prefix', default='loadtest', help="Préfixe des utilisateurs synthétiques")
+        parser.add_argument('--output', default=None, help="Écrire le rapport JSON dans ce fichier")
+        parser.add_argument('--cleanup', action='store_true', help="En processus : supprimer les utilisateurs synthétiques à la fin")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--users et --concurrency doivent être positifs")
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        base_url = options['base_url']
+        transport_factory = (lambda: HttpTransport(base_url)) if base_url else InProcessTransport
+        load_test = LoadTest(
+            transport_factory,
+            mix,
+            users=options['users'],
+            concurrency=options['concurrency'],
+            prefix=options['prefix'],
+            seed=options['seed']
+        )
+        duration = options['duration']
+        if duration is None and options['requests'] is None:
+            duration = 10.0
+
+        try:
+            load_test.authenticate_users()
+            report = load_test.run(duration=duration, requests=options['requests'])
+        except RuntimeError as error:
+            raise CommandError(str(error))
+        finally:
+            if options['cleanup'] and not base_url:
+                get_user_model().objects.filter(username__startswith=f"{options['prefix']}_").delete()
+
+        report['config']['target'] = base_url or 'in-process'
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output)
+        self.stdout.write(output)
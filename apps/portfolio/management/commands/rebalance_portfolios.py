@@ -0,0 +1,40 @@
+"""
+Rééquilibrage en lot (passe nocturne des conseillers)
+Usage: python manage.py rebalance_portfolios --tolerance 0.05 --output rebalance.jsonl
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.portfolio.services.rebalancing import RebalancingService
+
+
+class Command(BaseCommand):
+    help = "Calculer écarts et ordres de rééquilibrage pour tous les portefeuilles ayant une cible"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tolerance', type=float, default=0.0, help="Écart de poids toléré (ex: 0.05)")
+        parser.add_argument('--min-trade-value', type=float, default=0.0, help="Ignorer les ordres plus petits")
+        parser.add_argument('--user', type=int, action='append', dest='users', help="Limiter à un utilisateur (répétable)")
+        parser.add_argument('--output', default=None, help="Fichier JSON lines (par défaut la sortie standard)")
+
+    def handle(self, *args, **options):
+        service = RebalancingService(options['tolerance'], options['min_trade_value'])
+        started = time.monotonic()
+        if options['users']:
+            results = service.rebalance(options['users'])
+        else:
+            results = service.rebalance_all()
+        elapsed = time.monotonic() - started
+
+        lines = [json.dumps({'user_id': user_id, **result}) + '\n' for user_id, result in sorted(results.items())]
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.writelines(lines)
+        else:
+            self.stdout.write(''.join(lines), ending='')
+
+        trades = sum(len(result['trades']) for result in results.values())
+        self.stderr.write(f"{len(results)} portefeuille(s), {trades} ordre(s) en {elapsed:.3f}s")
@@ -0,0 +1,34 @@
+"""
+Recalcul du tableau de bord de l'encours sous gestion (GET /api/portfolio/aum/)
+À planifier (cron) avec une période inférieure à PORTFOLIO_AUM_REFRESH_INTERVAL :
+les requêtes lisent alors toujours un résultat à jour depuis le cache.
+Usage:
+    python manage.py refresh_aum
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.portfolio.services.aum import AumService
+
+
+class Command(BaseCommand):
+    help = "Recalculer et mettre en cache le tableau de bord de l'encours sous gestion"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-symbols', type=int, default=settings.PORTFOLIO_AUM_TOP_SYMBOLS,
+                            help="Nombre de symboles retenus, par exposition décroissante")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        snapshot = AumService(top_symbols=max(1, options['top_symbols'])).refresh()
+        report = {
+            'total_value': snapshot['total_value'],
+            'asset_count': snapshot['asset_count'],
+            'user_count': snapshot['user_count'],
+            'elapsed': round(time.monotonic() - started, 3),
+        }
+        self.stdout.write(json.dumps(report))
@@ -0,0 +1,68 @@
+"""
+Worker local pour la file de tâches (table Job)
+Usage: python manage.py run_jobs --workers 4
+"""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, OperationalError
+
+from apps.portfolio.services.jobs import JobService
+
+
+class Command(BaseCommand):
+    help = "Exécuter les tâches en attente (exports, résumés, performances)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Nombre de threads worker")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Attente (s) quand la file est vide")
+        parser.add_argument('--once', action='store_true', help="Vider la file puis s'arrêter")
+        parser.add_argument('--stale-after', type=int, default=600, help="Remettre en attente les tâches RUNNING depuis plus de N secondes")
+
+    def handle(self, *args, **options):
+        service = JobService()
+        requeued = service.requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f"{requeued} tâche(s) abandonnée(s) remise(s) en attente")
+
+        stop = threading.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        processed = []
+
+        def work(index: int) -> None:
+            worker = f"{prefix}:{index}"
+            try:
+                while not stop.is_set():
+                    try:
+                        job = service.run_next(worker)
+                    except OperationalError:
+                        # SQLite: base verrouillée par un autre worker, on réessaie
+                        stop.wait(options['poll_interval'])
+                        continue
+                    if job is not None:
+                        processed.append(job.id)
+                        self.stdout.write(f"[{worker}] {job}")
+                    elif options['once']:
+                        return
+                    else:
+                        stop.wait(options['poll_interval'])
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(work, i) for i in range(options['workers'])]
+            try:
+                while not all(future.done() for future in futures):
+                    time.sleep(0.1)
+            except KeyboardInterrupt:
+                stop.set()
+            for future in futures:
+                future.result()
+
+        self.stdout.write(self.style.SUCCESS(f"{len(processed)} tâche(s) exécutée(s)"))
@@ -0,0 +1,99 @@
+"""
+Simulation du marché (mouvement brownien géométrique corrélé)
+Usage:
+    python manage.py simulate_market ticks --target tcp:127.0.0.1:9000 --rate 5000 --seed 42
+    python manage.py simulate_market history --steps 1440 --interval 60 --seed 42
+"""
+
+import json
+import socket
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.portfolio.services.simulator import SECONDS_PER_YEAR, MarketSimulator
+
+
+@contextmanager
+def open_target(spec: str):
+    """Ouvrir la destination des ticks : -, file:<chemin>, unix:<chemin>, tcp:<hôte>:<port>"""
+    if spec == '-':
+        yield sys.stdout
+        return
+    kind, _, address = spec.partition(':')
+    if kind == 'file':
+        with open(address, 'a', buffering=1) as handle:
+            yield handle
+        return
+    if kind == 'unix':
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address)
+    elif kind == 'tcp':
+        host, _, port = address.rpartition(':')
+        connection = socket.create_connection((host or '127.0.0.1', int(port)))
+    else:
+        raise CommandError(f"Destination '{spec}' invalide (-, file:, unix:, tcp:)")
+    with connection, connection.makefile('w') as handle:
+        yield handle
+
+
+class Command(BaseCommand):
+    help = "Simuler des prix corrélés pour tous les symboles (flux de ticks ou historique)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('mode', choices=['ticks', 'history'], help="Flux de ticks ou remplissage de PricePoint")
+        parser.add_argument('--steps', type=int, default=1000, help="Nombre de pas de simulation")
+        parser.add_argument('--seed', type=int, default=None, help="Graine (trajectoires reproductibles)")
+        parser.add_argument('--drift', type=float, default=0.05, help="Rendement annuel moyen")
+        parser.add_argument('--volatility', type=float, default=None, help="Volatilité annuelle (par défaut selon le type)")
+        parser.add_argument('--correlation', type=float, default=0.3, help="Corrélation entre symboles [0, 1]")
+        parser.add_argument('--interval', type=float, default=1.0, help="Durée simulée d'un pas (s)")
+        parser.add_argument('--target', default='-', help="ticks : -, file:<chemin>, unix:<chemin> ou tcp:<hôte>:<port>")
+        parser.add_argument('--rate', type=float, default=0, help="ticks : ticks par seconde, 0 = sans limite")
+        parser.add_argument('--batch-size', type=int, default=1000, help="history : taille des insertions")
+
+    def handle(self, *args, **options):
+        try:
+            simulator = MarketSimulator.from_assets(
+                volatility=options['volatility'],
+                drift=options['drift'],
+                correlation=options['correlation'],
+                dt=options['interval'] / SECONDS_PER_YEAR,
+                seed=options['seed']
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+        if not simulator.symbols:
+            raise CommandError("Aucun symbole à simuler")
+
+        if options['mode'] == 'history':
+            written = simulator.backfill(
+                options['steps'],
+                timedelta(seconds=options['interval']),
+                batch_size=options['batch_size']
+            )
+            self.stderr.write(json.dumps({'symbols': len(simulator.symbols), 'points': written}))
+            return
+
+        started = time.monotonic()
+        emitted = 0
+        with open_target(options['target']) as handle:
+            for lines in simulator.ticks(options['steps']):
+                handle.writelines(lines)
+                emitted += len(lines)
+                if options['rate']:
+                    # Cadence régulée : on attend l'instant théorique du prochain tick
+                    delay = started + emitted / options['rate'] - time.monotonic()
+                    if delay > 0:
+                        handle.flush()
+                        time.sleep(delay)
+            handle.flush()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stderr.write(json.dumps({
+            'symbols': len(simulator.symbols),
+            'ticks': emitted,
+            'ticks_per_second': round(emitted / elapsed, 1),
+        }))
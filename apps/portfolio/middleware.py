@@ -0,0 +1,97 @@
+"""
+Middlewares - Compression des réponses volumineuses
+"""
+
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+ENCODING_RE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Retourner {encodage: qualité} à partir de l'en-tête Accept-Encoding"""
+    encodings = {}
+    for part in header.split(','):
+        match = ENCODING_RE.match(part)
+        if match and match.group(1):
+            try:
+                quality = float(match.group(2)) if match.group(2) else 1.0
+            except ValueError:
+                quality = 0.0
+            encodings[match.group(1).lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compresser (brotli si disponible, sinon gzip) les réponses dont la taille
+    dépasse RESPONSE_COMPRESSION_MIN_SIZE octets.
+
+    Les petites réponses ne sont pas compressées : le gain ne compense pas
+    le coût CPU. Les réponses en streaming (SSE) sont ignorées.
+
+    BREACH : seules les URL de RESPONSE_COMPRESSION_PATHS (données de
+    portefeuille, sans secret) sont compressées, jamais l'admin, la
+    connexion ni les jetons. gzip ajoute en plus, comme GZipMiddleware,
+    un nombre aléatoire d'octets à l'en-tête pour brouiller la taille.
+    """
+
+    # Comme django.middleware.gzip.GZipMiddleware
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+        self.paths = tuple(getattr(settings, 'RESPONSE_COMPRESSION_PATHS', ('/api/portfolio/',)))
+        self.brotli_quality = getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 5)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if not request.path.startswith(self.paths):
+            return response
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            content = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            content = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # La représentation compressée n'est plus identique octet par octet
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def choose_encoding(self, header: str):
+        """Choisir le meilleur encodage accepté par le client, None si aucun"""
+        accepted = parse_accept_encoding(header)
+        candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best, best_quality = None, 0.0
+        for encoding in candidates:
+            quality = accepted.get(encoding, accepted.get('*', 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_job'),
+        ('users', '0002_remove_user_avatar_url_remove_user_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='portfolio_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Version')),
+                ('updated_at', models.DateTimeField(verbose_name='Date de mise à jour')),
+            ],
+            options={
+                'verbose_name': 'Version du portefeuille',
+                'verbose_name_plural': 'Versions des portefeuilles',
+            },
+        ),
+    ]
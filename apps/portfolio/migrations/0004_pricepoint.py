@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_portfolioversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricePoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=10, verbose_name='Symbole')),
+                ('timestamp', models.DateTimeField(verbose_name='Horodatage')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Prix')),
+            ],
+            options={
+                'verbose_name': 'Point de prix',
+                'verbose_name_plural': 'Historique des prix',
+                'ordering': ['symbol', 'timestamp'],
+                'constraints': [models.UniqueConstraint(fields=('symbol', 'timestamp'), name='unique_price_point')],
+            },
+        ),
+    ]
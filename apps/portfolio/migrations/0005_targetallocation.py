@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_pricepoint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TargetAllocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(blank=True, choices=[('STOCK', 'Action'), ('BOND', 'Obligation'), ('CRYPTO', 'Crypto-monnaie')], default='', max_length=10, verbose_name="Type d'actif")),
+                ('symbol', models.CharField(blank=True, default='', max_length=10, verbose_name='Symbole')),
+                ('weight', models.DecimalField(decimal_places=4, max_digits=5, verbose_name='Poids cible')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='target_allocations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Allocation cible',
+                'verbose_name_plural': 'Allocations cibles',
+                'ordering': ['user', 'asset_type', 'symbol'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'asset_type', 'symbol'), name='unique_target_allocation'), models.CheckConstraint(condition=models.Q(models.Q(('asset_type', ''), models.Q(('symbol', ''), _negated=True)), models.Q(models.Q(('asset_type', ''), _negated=True), ('symbol', '')), _connector='OR'), name='target_allocation_type_xor_symbol')],
+            },
+        ),
+    ]
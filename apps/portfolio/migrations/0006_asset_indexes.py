@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:40
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_targetallocation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['user', 'asset_type'], name='asset_user_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['user', 'purchase_date'], name='asset_user_purchase_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(models.F('user'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('quantity'), '*', models.F('current_price')), output_field=models.FloatField()), name='asset_user_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(models.F('user'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('current_price'), '-', models.F('purchase_price')), '*', models.Value(100)), '/', models.F('purchase_price')), output_field=models.FloatField()), name='asset_user_performance_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_asset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='version',
+            field=models.PositiveIntegerField(default=1, verbose_name='Version'),
+        ),
+    ]
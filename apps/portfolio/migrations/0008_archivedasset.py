@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_asset_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('STOCK', 'Action'), ('BOND', 'Obligation'), ('CRYPTO', 'Crypto-monnaie')], max_length=10, verbose_name="Type d'actif")),
+                ('symbol', models.CharField(max_length=10, verbose_name='Symbole')),
+                ('name', models.CharField(max_length=100, verbose_name="Nom de l'actif")),
+                ('quantity', models.DecimalField(decimal_places=8, max_digits=18, verbose_name='Quantité')),
+                ('purchase_price', models.DecimalField(decimal_places=2, max_digits=18, verbose_name="Prix d'achat")),
+                ('current_price', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Prix actuel')),
+                ('purchase_date', models.DateField(verbose_name="Date d'achat")),
+                ('created_at', models.DateTimeField(verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(verbose_name='Date de mise à jour')),
+                ('version', models.PositiveIntegerField(default=1, verbose_name='Version')),
+                ('closed_at', models.DateTimeField(verbose_name="Date d'archivage")),
+                ('reason', models.CharField(choices=[('CLOSED', 'Position soldée'), ('DORMANT', 'Utilisateur inactif')], max_length=10, verbose_name="Motif d'archivage")),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_assets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Actif archivé',
+                'verbose_name_plural': 'Actifs archivés',
+                'ordering': ['-closed_at'],
+                'indexes': [models.Index(fields=['user', 'purchase_date'], name='archived_user_purchase_idx'), models.Index(fields=['user', 'reason'], name='archived_user_reason_idx')],
+            },
+        ),
+    ]
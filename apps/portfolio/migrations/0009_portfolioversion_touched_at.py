@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+def copy_updated_at(apps, schema_editor):
+    # Pas d'historique des écritures : la dernière modification connue, par excès
+    PortfolioVersion = apps.get_model('portfolio', 'PortfolioVersion')
+    PortfolioVersion.objects.update(touched_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_archivedasset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolioversion',
+            name='touched_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Dernière écriture de l'utilisateur"),
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+    ]
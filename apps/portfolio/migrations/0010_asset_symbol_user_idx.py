@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_portfolioversion_touched_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['symbol', 'user'], name='asset_symbol_user_idx'),
+        ),
+    ]
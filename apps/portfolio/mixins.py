@@ -0,0 +1,50 @@
+"""
+Mixins de vues - Requêtes conditionnelles (ETag / Last-Modified)
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import PortfolioVersion
+
+
+class ConditionalGetMixin:
+    """
+    Répondre 304 Not Modified avant toute requête lourde ou sérialisation.
+
+    Le validateur est la version du portefeuille de l'utilisateur
+    (PortfolioVersion) : une seule lecture par clé primaire, quelle que soit
+    la taille du portefeuille. L'ETag inclut l'URL complète pour que chaque
+    endpoint (et chaque jeu de paramètres) ait son propre validateur.
+    """
+
+    def get_not_modified_response(self, request):
+        """
+        Calculer les validateurs de la requête
+
+        Returns:
+            Réponse 304 si le client possède déjà la représentation, None sinon
+        """
+        version, updated_at = PortfolioVersion.get_validator(request.user.id)
+        key = f"{request.user.id}:{version}:{request.get_full_path()}"
+        self.etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        self.last_modified = int(updated_at.timestamp()) if updated_at else None
+        return get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=self.last_modified
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Ajouter les validateurs aux réponses 200 et 304"""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'etag', None)
+        if etag and response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            if self.last_modified is not None:
+                response.headers.setdefault('Last-Modified', http_date(self.last_modified))
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
@@ -1,18 +1,51 @@
-from django.db import models
+from django.db import connections, models, router
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.dispatch import Signal
+from django.utils import timezone
 
 User = get_user_model()
 
 
-class Asset(models.Model):
-    """Modèle pour représenter un actif (Stock, Obligation, Crypto)"""
-    
+class AssetQuerySet(models.QuerySet):
+    """QuerySet des actifs : métriques calculées en SQL (filtre et tri côté base)"""
+
+    # Expressions identiques à celles des index fonctionnels de Asset :
+    # SQLite n'utilise un index sur expression que si le SQL est le même
+    VALUE_EXPRESSION = models.ExpressionWrapper(
+        models.F('quantity') * models.F('current_price'), output_field=models.FloatField()
+    )
+    PERFORMANCE_EXPRESSION = models.ExpressionWrapper(
+        (models.F('current_price') - models.F('purchase_price')) * 100 / models.F('purchase_price'),
+        output_field=models.FloatField()
+    )
+
+    def with_metrics(self):
+        """
+        Annoter current_value_sql, purchase_value_sql, gain_loss_sql et
+        performance_percentage_sql (équivalents SQL des propriétés du modèle)
+        """
+        return self.annotate(
+            current_value_sql=self.VALUE_EXPRESSION,
+            purchase_value_sql=models.ExpressionWrapper(
+                models.F('quantity') * models.F('purchase_price'), output_field=models.FloatField()
+            ),
+            gain_loss_sql=models.ExpressionWrapper(
+                models.F('quantity') * (models.F('current_price') - models.F('purchase_price')),
+                output_field=models.FloatField()
+            ),
+            performance_percentage_sql=self.PERFORMANCE_EXPRESSION,
+        )
+
+
+class AssetBase(models.Model):
+    """Champs et métriques communs aux actifs courants et archivés"""
+
     class AssetType(models.TextChoices):
         STOCK = 'STOCK', 'Action'
         BOND = 'BOND', 'Obligation'
         CRYPTO = 'CRYPTO', 'Crypto-monnaie'
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assets')
     asset_type = models.CharField(
         max_length=10,
         choices=AssetType.choices,
@@ -44,20 +77,9 @@ class Asset(models.Model):
     purchase_date = models.DateField(
         verbose_name="Date d'achat"
     )
-    created_at = models.DateTimeField(
-        auto_now_add=True,
-        verbose_name="Date de création"
-    )
-    updated_at = models.DateTimeField(
-        auto_now=True,
-        verbose_name="Date de mise à jour"
-    )
 
     class Meta:
-        verbose_name = "Actif"
-        verbose_name_plural = "Actifs"
-        ordering = ['-created_at']
-        unique_together = ('user', 'symbol', 'purchase_date')
+        abstract = True
 
     def __str__(self):
         return f"{self.symbol} - {self.name} ({self.get_asset_type_display()})"
@@ -83,3 +105,343 @@ class Asset(models.Model):
         if self.purchase_value == 0:
             return 0.0
         return (self.gain_loss / self.purchase_value) * 100
+
+
+class Asset(AssetBase):
+    """Modèle pour représenter un actif (Stock, Obligation, Crypto)"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assets')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Date de création"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Date de mise à jour"
+    )
+    # Incrémentée à chaque écriture (verrouillage optimiste des mises à jour)
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Version"
+    )
+
+    objects = AssetQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Actif"
+        verbose_name_plural = "Actifs"
+        ordering = ['-created_at']
+        unique_together = ('user', 'symbol', 'purchase_date')
+        indexes = [
+            models.Index(fields=['user', 'asset_type'], name='asset_user_type_idx'),
+            # Ingestion de prix : UPDATE par symbole et recherche des détenteurs (index couvrant)
+            models.Index(fields=['symbol', 'user'], name='asset_symbol_user_idx'),
+            models.Index(fields=['user', 'purchase_date'], name='asset_user_purchase_date_idx'),
+            models.Index(models.F('user'), AssetQuerySet.VALUE_EXPRESSION, name='asset_user_value_idx'),
+            models.Index(models.F('user'), AssetQuerySet.PERFORMANCE_EXPRESSION, name='asset_user_performance_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Sauvegarder l'actif (une mise à jour incrémente sa version)"""
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+
+    # IDs par DELETE (limites de paramètres de SQLite et PostgreSQL)
+    DELETE_BATCH_SIZE = 500
+
+    @classmethod
+    def delete_rows(cls, asset_ids, user_id=None) -> int:
+        """
+        Supprimer des actifs par DELETE ... WHERE id IN (...) [AND user_id = ?] en SQL
+
+        Asset n'a pas de dépendances : on évite le Collector de
+        QuerySet.delete() (SELECT préalable + un signal post_delete par
+        ligne). Aucun signal n'est émis, l'appelant notifie.
+
+        Returns:
+            Nombre de lignes supprimées
+        """
+        asset_ids = list(asset_ids)
+        connection = connections[router.db_for_write(cls)]
+        quote = connection.ops.quote_name
+        table, pk, user = quote(cls._meta.db_table), quote(cls._meta.pk.column), quote(cls._meta.get_field('user').column)
+        deleted = 0
+        with connection.cursor() as cursor:
+            for start in range(0, len(asset_ids), cls.DELETE_BATCH_SIZE):
+                chunk = asset_ids[start:start + cls.DELETE_BATCH_SIZE]
+                sql = f"DELETE FROM {table} WHERE {pk} IN ({', '.join(['%s'] * len(chunk))})"
+                params = list(chunk)
+                if user_id is not None:
+                    sql += f" AND {user} = %s"
+                    params.append(user_id)
+                cursor.execute(sql, params)
+                deleted += cursor.rowcount
+        return deleted
+
+
+class ArchivedAsset(AssetBase):
+    """
+    Actif sorti de la table courante (position soldée ou utilisateur inactif).
+    Même schéma qu'Asset (l'ID d'origine est conservé) plus la date
+    d'archivage ; les dates sont copiées telles quelles.
+    """
+
+    class Reason(models.TextChoices):
+        CLOSED = 'CLOSED', 'Position soldée'
+        DORMANT = 'DORMANT', 'Utilisateur inactif'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_assets')
+    created_at = models.DateTimeField(
+        verbose_name="Date de création"
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Date de mise à jour"
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Version"
+    )
+    closed_at = models.DateTimeField(
+        verbose_name="Date d'archivage"
+    )
+    reason = models.CharField(
+        max_length=10,
+        choices=Reason.choices,
+        verbose_name="Motif d'archivage"
+    )
+
+    class Meta:
+        verbose_name = "Actif archivé"
+        verbose_name_plural = "Actifs archivés"
+        ordering = ['-closed_at']
+        indexes = [
+            models.Index(fields=['user', 'purchase_date'], name='archived_user_purchase_idx'),
+            models.Index(fields=['user', 'reason'], name='archived_user_reason_idx'),
+        ]
+
+
+class Job(models.Model):
+    """Tâche asynchrone (calculs lourds) exécutée par le worker local"""
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'En attente'
+        RUNNING = 'RUNNING', 'En cours'
+        SUCCEEDED = 'SUCCEEDED', 'Terminée'
+        FAILED = 'FAILED', 'En échec'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(
+        max_length=50,
+        verbose_name="Type de tâche"
+    )
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Paramètres"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Statut"
+    )
+    result = models.JSONField(
+        null=True,
+        encoder=DjangoJSONEncoder,
+        blank=True,
+        verbose_name="Résultat"
+    )
+    error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name="Erreur"
+    )
+    worker = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        verbose_name="Worker"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Date de création"
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Date de démarrage"
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Date de fin"
+    )
+
+    class Meta:
+        verbose_name = "Tâche"
+        verbose_name_plural = "Tâches"
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+
+# Envoyé par PortfolioVersion.bump, quel que soit l'auteur de l'écriture
+# (vues, ingestion de prix, archivage...) : versions_bumped: user_ids (set)
+versions_bumped = Signal()
+
+
+class PortfolioVersion(models.Model):
+    """
+    Compteur de version du portefeuille d'un utilisateur.
+    Incrémenté à chaque modification d'actif, il sert de validateur
+    HTTP (ETag / Last-Modified) sans avoir à relire les actifs.
+    touched_at ne suit que les écritures de l'utilisateur (pas les prix ni
+    l'archivage) : c'est lui qui mesure l'inactivité.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='portfolio_version')
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Version"
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Date de mise à jour"
+    )
+    touched_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Dernière écriture de l'utilisateur"
+    )
+
+    class Meta:
+        verbose_name = "Version du portefeuille"
+        verbose_name_plural = "Versions des portefeuilles"
+
+    BUMP_BATCH_SIZE = 500
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+    @classmethod
+    def bump(cls, user_ids, touch: bool = False) -> None:
+        """
+        Incrémenter la version des portefeuilles donnés
+
+        À appeler après toute écriture qui ne passe pas par save()/delete()
+        (bulk_create, bulk_update, QuerySet.update/delete), les signaux
+        n'étant pas émis dans ce cas.
+
+        Args:
+            user_ids: Utilisateurs dont le portefeuille a changé
+            touch: Écriture faite par l'utilisateur (met à jour touched_at)
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        now = timezone.now()
+        changes = {'version': models.F('version') + 1, 'updated_at': now}
+        if touch:
+            changes['touched_at'] = now
+        ordered = sorted(user_ids)
+        # Listes IN bornées (limites de paramètres de SQLite et PostgreSQL)
+        for start in range(0, len(ordered), cls.BUMP_BATCH_SIZE):
+            chunk = ordered[start:start + cls.BUMP_BATCH_SIZE]
+            updated = cls.objects.filter(user_id__in=chunk).update(**changes)
+            if updated < len(chunk):
+                cls.objects.bulk_create(
+                    [cls(user_id=user_id, version=1, updated_at=now, touched_at=now if touch else None)
+                     for user_id in chunk],
+                    ignore_conflicts=True
+                )
+        versions_bumped.send(sender=cls, user_ids=user_ids)
+
+    @classmethod
+    def get_validator(cls, user_id: int):
+        """Retourner (version, updated_at) du portefeuille, (0, None) s'il n'a jamais été modifié"""
+        row = cls.objects.filter(user_id=user_id).values_list('version', 'updated_at').first()
+        return row or (0, None)
+
+
+class PricePoint(models.Model):
+    """Historique des prix d'un symbole (simulation, import de données)"""
+
+    symbol = models.CharField(
+        max_length=10,
+        verbose_name="Symbole"
+    )
+    timestamp = models.DateTimeField(
+        verbose_name="Horodatage"
+    )
+    price = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name="Prix"
+    )
+
+    class Meta:
+        verbose_name = "Point de prix"
+        verbose_name_plural = "Historique des prix"
+        ordering = ['symbol', 'timestamp']
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'timestamp'], name='unique_price_point'),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} {self.timestamp:%Y-%m-%d %H:%M} {self.price}"
+
+
+class TargetAllocation(models.Model):
+    """
+    Allocation cible d'un portefeuille, par type d'actif ou par symbole.
+    Un symbole ciblé prend le pas sur le type d'actif auquel il appartient.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='target_allocations')
+    asset_type = models.CharField(
+        max_length=10,
+        choices=Asset.AssetType.choices,
+        blank=True,
+        default='',
+        verbose_name="Type d'actif"
+    )
+    symbol = models.CharField(
+        max_length=10,
+        blank=True,
+        default='',
+        verbose_name="Symbole"
+    )
+    weight = models.DecimalField(
+        max_digits=5,
+        decimal_places=4,
+        verbose_name="Poids cible"
+    )  # Fraction du portefeuille, ex: 0.6000
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Date de mise à jour"
+    )
+
+    class Meta:
+        verbose_name = "Allocation cible"
+        verbose_name_plural = "Allocations cibles"
+        ordering = ['user', 'asset_type', 'symbol']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'asset_type', 'symbol'], name='unique_target_allocation'),
+            models.CheckConstraint(
+                condition=(
+                    (models.Q(asset_type='') & ~models.Q(symbol=''))
+                    | (~models.Q(asset_type='') & models.Q(symbol=''))
+                ),
+                name='target_allocation_type_xor_symbol'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol or self.get_asset_type_display()} {self.weight:.2%}"
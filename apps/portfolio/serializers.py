@@ -1,10 +1,71 @@
 from rest_framework import serializers
-from .models import Asset
+from .models import Asset, Job, TargetAllocation
+from .services.jobs import JobService
 
 
-class AssetSerializer(serializers.ModelSerializer):
+def parse_field_selection(query_params, available, fields_param='fields', exclude_param='exclude'):
+    """
+    Appliquer ?fields=a,b et ?exclude=c à une liste de champs disponibles
+
+    Args:
+        query_params: Paramètres de la requête
+        available: Champs disponibles (ordre conservé)
+        fields_param: Nom du paramètre de sélection
+        exclude_param: Nom du paramètre d'exclusion
+
+    Returns:
+        Liste des champs retenus, None si aucun paramètre n'est fourni
+    """
+    fields = query_params.get(fields_param)
+    exclude = query_params.get(exclude_param)
+    if not fields and not exclude:
+        return None
+
+    selected = list(available)
+    if fields:
+        wanted = {name.strip() for name in fields.split(',')}
+        selected = [name for name in selected if name in wanted]
+    if exclude:
+        unwanted = {name.strip() for name in exclude.split(',')}
+        selected = [name for name in selected if name not in unwanted]
+    return selected
+
+
+class SparseFieldsMixin:
+    """
+    Réponses partielles : ne garder que les champs demandés via
+    ?fields= / ?exclude= (ou les arguments fields / exclude)
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        selected = None
+        if fields is not None or exclude is not None:
+            selected = [
+                name for name in self.fields
+                if (fields is None or name in fields) and name not in (exclude or ())
+            ]
+        elif 'request' in self.context:
+            selected = parse_field_selection(self.context['request'].query_params, self.fields)
+
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class AssetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les opérations CRUD sur les actifs"""
     
+    # Colonnes nécessaires au calcul des champs dérivés
+    COMPUTED_FIELD_SOURCES = {
+        'current_value': ('quantity', 'current_price'),
+        'gain_loss': ('quantity', 'current_price', 'purchase_price'),
+        'performance_percentage': ('quantity', 'current_price', 'purchase_price'),
+    }
+
     current_value = serializers.SerializerMethodField()
     gain_loss = serializers.SerializerMethodField()
     performance_percentage = serializers.SerializerMethodField()
@@ -25,8 +86,19 @@ class AssetSerializer(serializers.ModelSerializer):
             'performance_percentage',
             'created_at',
             'updated_at',
+            'version',
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'version', 'current_value', 'gain_loss', 'performance_percentage'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'current_value', 'gain_loss', 'performance_percentage']
+
+    @classmethod
+    def get_model_fields(cls, field_names):
+        """Colonnes à charger (QuerySet.only) pour sérialiser les champs donnés"""
+        columns = {'id'}
+        for name in field_names:
+            columns.update(cls.COMPUTED_FIELD_SOURCES.get(name, (name,)))
+        return sorted(columns)
 
     def get_current_value(self, obj):
         return round(obj.current_value, 2)
@@ -39,7 +111,14 @@ class AssetSerializer(serializers.ModelSerializer):
 
 
 class AssetCreateUpdateSerializer(serializers.ModelSerializer):
-    """Serializer pour créer/modifier les actifs"""
+    """
+    Serializer pour créer/modifier les actifs
+
+    En modification, `version` (facultatif) est la version lue par le
+    client : la mise à jour est refusée (409) si l'actif a changé depuis.
+    """
+
+    version = serializers.IntegerField(required=False, min_value=1)
 
     class Meta:
         model = Asset
@@ -51,8 +130,14 @@ class AssetCreateUpdateSerializer(serializers.ModelSerializer):
             'purchase_price',
             'current_price',
             'purchase_date',
+            'version',
         ]
 
+    def create(self, validated_data):
+        # Un nouvel actif commence toujours à la version 1
+        validated_data.pop('version', None)
+        return super().create(validated_data)
+
     def validate_quantity(self, value):
         if value <= 0:
             raise serializers.ValidationError("La quantité doit être positive")
@@ -69,7 +154,63 @@ class AssetCreateUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class PortfolioSummarySerializer(serializers.Serializer):
+class AssetHistorySerializer(serializers.Serializer):
+    """Lot de l'historique (courant ou archivé)"""
+
+    id = serializers.IntegerField()
+    asset_type = serializers.CharField()
+    symbol = serializers.CharField()
+    name = serializers.CharField()
+    quantity = serializers.DecimalField(max_digits=18, decimal_places=8)
+    purchase_price = serializers.DecimalField(max_digits=18, decimal_places=2)
+    current_price = serializers.DecimalField(max_digits=18, decimal_places=2)
+    purchase_date = serializers.DateField()
+    archived = serializers.SerializerMethodField()
+    archived_at = serializers.DateTimeField(allow_null=True)
+
+    def get_archived(self, obj):
+        return obj['archived_at'] is not None
+
+
+class AssetBatchOperationSerializer(serializers.Serializer):
+    """Serializer pour une opération d'un lot (create / update / delete)"""
+
+    op = serializers.ChoiceField(choices=['create', 'update', 'delete'])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': "Ce champ est obligatoire."})
+        if attrs['op'] == 'delete':
+            attrs.pop('data', None)
+            return attrs
+
+        # Mêmes règles que les endpoints unitaires (update = mise à jour partielle)
+        data_serializer = AssetCreateUpdateSerializer(
+            data=attrs.get('data', {}),
+            partial=attrs['op'] == 'update'
+        )
+        if not data_serializer.is_valid():
+            raise serializers.ValidationError({'data': data_serializer.errors})
+        attrs['data'] = data_serializer.validated_data
+        return attrs
+
+
+class AssetBatchSerializer(serializers.Serializer):
+    """Serializer pour un lot d'opérations sur les actifs"""
+
+    MAX_OPERATIONS = 500
+
+    atomic = serializers.BooleanField(default=True)
+    operations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_OPERATIONS
+    )
+
+
+class PortfolioSummarySerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer pour le résumé du portefeuille"""
     
     total_current_value = serializers.FloatField()
@@ -80,7 +221,7 @@ class PortfolioSummarySerializer(serializers.Serializer):
     by_type = serializers.DictField()
 
 
-class PerformanceSerializer(serializers.Serializer):
+class PerformanceSerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer pour la performance du portefeuille"""
     
     total_assets = serializers.IntegerField()
@@ -88,3 +229,153 @@ class PerformanceSerializer(serializers.Serializer):
     best_performer = serializers.DictField(required=False, allow_null=True)
     worst_performer = serializers.DictField(required=False, allow_null=True)
     assets = serializers.ListField()
+
+
+class RebalanceSerializer(serializers.Serializer):
+    """Serializer pour l'écart à l'allocation cible et les ordres de rééquilibrage"""
+
+    total_value = serializers.FloatField()
+    allocations = serializers.ListField(child=serializers.DictField())
+    trades = serializers.ListField(child=serializers.DictField())
+
+
+class RiskMetricsSerializer(serializers.Serializer):
+    """Serializer pour les métriques de risque du portefeuille"""
+
+    window_days = serializers.IntegerField()
+    confidence = serializers.FloatField()
+    observations = serializers.IntegerField()
+    periods_per_year = serializers.FloatField(required=False)
+    current_value = serializers.FloatField(allow_null=True)
+    volatility = serializers.FloatField(allow_null=True)
+    var_historical = serializers.FloatField(allow_null=True)
+    var_parametric = serializers.FloatField(allow_null=True)
+    max_drawdown = serializers.FloatField(allow_null=True)
+    correlation = serializers.DictField()
+    missing_symbols = serializers.ListField(child=serializers.CharField())
+
+
+class ProjectionSerializer(serializers.Serializer):
+    """Serializer pour la projection Monte Carlo de la valeur du portefeuille"""
+
+    horizon_years = serializers.IntegerField()
+    seed = serializers.IntegerField()
+    initial_value = serializers.FloatField()
+    paths_requested = serializers.IntegerField()
+    paths_simulated = serializers.IntegerField()
+    degraded = serializers.BooleanField()
+    elapsed_ms = serializers.IntegerField()
+    percentiles = serializers.DictField(child=serializers.ListField(child=serializers.FloatField()))
+    terminal = serializers.DictField(allow_null=True)
+
+
+class AumBreakdownSerializer(serializers.Serializer):
+    """Ligne d'une répartition de l'encours (type d'actif ou symbole)"""
+
+    asset_type = serializers.CharField(required=False)
+    symbol = serializers.CharField(required=False)
+    value = serializers.FloatField()
+    share = serializers.FloatField()
+    count = serializers.IntegerField(required=False)
+    holders = serializers.IntegerField(required=False)
+
+
+class AumBucketSerializer(serializers.Serializer):
+    """Tranche d'encours par utilisateur"""
+
+    label = serializers.CharField()
+    min_value = serializers.FloatField()
+    max_value = serializers.FloatField(allow_null=True)
+    users = serializers.IntegerField()
+    value = serializers.FloatField()
+
+
+class AumSerializer(serializers.Serializer):
+    """Serializer pour le tableau de bord de l'encours sous gestion"""
+
+    computed_at = serializers.DateTimeField()
+    stale = serializers.BooleanField()
+    total_value = serializers.FloatField()
+    asset_count = serializers.IntegerField()
+    user_count = serializers.IntegerField()
+    by_asset_type = AumBreakdownSerializer(many=True)
+    top_symbols = AumBreakdownSerializer(many=True)
+    user_buckets = AumBucketSerializer(many=True)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer pour consulter l'état d'une tâche"""
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'kind',
+            'params',
+            'status',
+            'result',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class JobCreateSerializer(serializers.Serializer):
+    """Serializer pour mettre une tâche en file"""
+
+    kind = serializers.CharField(max_length=50)
+    params = serializers.DictField(required=False, default=dict)
+
+    def validate_kind(self, value):
+        if value not in JobService.get_available_kinds():
+            raise serializers.ValidationError(f"Type de tâche '{value}' non enregistré")
+        return value
+
+    def validate(self, attrs):
+        try:
+            JobService.validate_params(attrs['kind'], attrs['params'])
+        except ValueError as exc:
+            raise serializers.ValidationError({'params': str(exc)})
+        return attrs
+
+
+class TargetAllocationSerializer(serializers.ModelSerializer):
+    """Serializer pour les allocations cibles (par type d'actif ou par symbole)"""
+
+    class Meta:
+        model = TargetAllocation
+        fields = [
+            'id',
+            'asset_type',
+            'symbol',
+            'weight',
+            'updated_at',
+        ]
+        read_only_fields = ['id', 'updated_at']
+
+    def validate_symbol(self, value):
+        return value.strip().upper()
+
+    def validate_weight(self, value):
+        if not 0 < value <= 1:
+            raise serializers.ValidationError("Le poids cible doit être compris entre 0 (exclu) et 1")
+        return value
+
+    def validate(self, attrs):
+        asset_type = attrs.get('asset_type', getattr(self.instance, 'asset_type', ''))
+        symbol = attrs.get('symbol', getattr(self.instance, 'symbol', ''))
+        if bool(asset_type) == bool(symbol):
+            raise serializers.ValidationError("Renseigner soit asset_type, soit symbol")
+
+        duplicates = TargetAllocation.objects.filter(
+            user=self.context['request'].user,
+            asset_type=asset_type,
+            symbol=symbol
+        )
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError("Une allocation cible existe déjà pour cette poche")
+        return attrs
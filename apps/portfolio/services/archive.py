@@ -0,0 +1,135 @@
+"""
+Archive - Partitionnement chaud / froid des actifs
+
+Les lots soldés (quantité nulle) et les portefeuilles des utilisateurs
+inactifs quittent la table Asset pour ArchivedAsset : la table courante,
+parcourue par user_id à chaque requête, et ses index restent petits.
+Les déplacements se font par lots, chacun dans sa transaction (copie
+puis DELETE ... WHERE id IN). L'historique relit les deux tables
+(DjangoAssetRepository.find_history_by_user) ; le portefeuille d'un
+utilisateur inactif est restauré à sa prochaine connexion.
+"""
+
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from ..models import ArchivedAsset, Asset, PortfolioVersion
+from .search import SearchService
+
+# Colonnes copiées telles quelles entre les deux tables (ID d'origine compris)
+COPIED_FIELDS = tuple(field.attname for field in Asset._meta.concrete_fields)
+
+
+class ArchiveService:
+    """Déplacement des actifs froids vers l'archive, et retour"""
+
+    def __init__(self, batch_size: int = 1000, clock: Callable = timezone.now):
+        """
+        Args:
+            batch_size: Nombre d'actifs déplacés par transaction
+            clock: Horloge (injectable pour les tests)
+        """
+        self.batch_size = batch_size
+        self.clock = clock
+
+    def closed_lots(self) -> QuerySet:
+        """Lots soldés (quantité nulle) encore dans la table courante"""
+        return Asset.objects.filter(quantity__lte=0)
+
+    def dormant_user_ids(self, days: int) -> List[int]:
+        """
+        Utilisateurs ayant des actifs et inactifs depuis `days` jours :
+        ni connexion (ou inscription, s'ils ne se sont jamais connectés)
+        ni écriture de leur part sur le portefeuille depuis. La version du
+        portefeuille (updated_at) n'entre pas en compte : chaque mise à
+        jour des prix l'incrémente pour tous les détenteurs.
+        """
+        cutoff = self.clock() - timedelta(days=days)
+        users = get_user_model().objects.filter(
+            Q(last_login__lt=cutoff) | Q(last_login__isnull=True, date_joined__lt=cutoff)
+        ).exclude(
+            portfolio_version__touched_at__gte=cutoff
+        ).filter(
+            id__in=Asset.objects.values('user_id')
+        )
+        return list(users.order_by('id').values_list('id', flat=True))
+
+    def count_assets(self, user_ids: List[int]) -> int:
+        """Nombre d'actifs courants des utilisateurs donnés"""
+        return sum(
+            Asset.objects.filter(user_id__in=user_ids[start:start + self.batch_size]).count()
+            for start in range(0, len(user_ids), self.batch_size)
+        )
+
+    def archive_closed(self) -> int:
+        """Archiver les lots soldés ; retourne le nombre d'actifs déplacés"""
+        return sum(self.iter_archive(self.closed_lots(), ArchivedAsset.Reason.CLOSED))
+
+    def archive_dormant(self, days: int) -> Dict[str, int]:
+        """Archiver les portefeuilles des utilisateurs inactifs depuis `days` jours"""
+        user_ids = self.dormant_user_ids(days)
+        moved = 0
+        for start in range(0, len(user_ids), self.batch_size):
+            chunk = user_ids[start:start + self.batch_size]
+            moved += sum(self.iter_archive(
+                Asset.objects.filter(user_id__in=chunk), ArchivedAsset.Reason.DORMANT
+            ))
+        return {'users': len(user_ids), 'assets': moved}
+
+    def iter_archive(self, queryset: QuerySet, reason: str) -> Iterator[int]:
+        """
+        Déplacer les actifs du QuerySet vers l'archive, un lot par transaction
+
+        Yields:
+            Nombre d'actifs déplacés par lot
+        """
+        while True:
+            with transaction.atomic():
+                assets = list(queryset.order_by('id').select_for_update()[:self.batch_size])
+                if not assets:
+                    return
+                closed_at = self.clock()
+                ArchivedAsset.objects.bulk_create([
+                    ArchivedAsset(**{name: getattr(asset, name) for name in COPIED_FIELDS},
+                                  closed_at=closed_at, reason=reason)
+                    for asset in assets
+                ])
+                # DELETE ... WHERE direct, comme DjangoAssetRepository.delete_by_ids
+                Asset.delete_rows([asset.id for asset in assets])
+                PortfolioVersion.bump(asset.user_id for asset in assets)
+            SearchService.bump({asset.user_id for asset in assets})
+            yield len(assets)
+
+    def restore_user(self, user_id: int) -> int:
+        """
+        Remettre dans la table courante le portefeuille archivé pour inactivité
+
+        Les lots dont la clé (symbole, date d'achat) a été réutilisée depuis
+        restent archivés.
+
+        Returns:
+            Nombre d'actifs restaurés
+        """
+        with transaction.atomic():
+            archived = list(
+                ArchivedAsset.objects.filter(user_id=user_id, reason=ArchivedAsset.Reason.DORMANT).select_for_update()
+            )
+            if not archived:
+                return 0
+            taken = set(Asset.objects.filter(user_id=user_id).values_list('symbol', 'purchase_date'))
+            archived = [row for row in archived if (row.symbol, row.purchase_date) not in taken]
+            assets = [Asset(**{name: getattr(row, name) for name in COPIED_FIELDS}) for row in archived]
+            Asset.objects.bulk_create(assets)
+            # bulk_create applique auto_now_add / auto_now : dates d'origine réécrites
+            for asset, row in zip(assets, archived):
+                asset.created_at, asset.updated_at = row.created_at, row.updated_at
+            Asset.objects.bulk_update(assets, ['created_at', 'updated_at'])
+            ArchivedAsset.objects.filter(id__in=[row.id for row in archived]).delete()
+            PortfolioVersion.bump([user_id])
+        SearchService.bump([user_id])
+        return len(assets)
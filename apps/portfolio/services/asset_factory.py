@@ -2,8 +2,11 @@
 Factory Pattern - Création de différents types d'actifs
 """
 
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Iterable, List, Optional
+from django.db import transaction
 from ..models import Asset
+from .interfaces import IAssetRepository
+from .repositories import DjangoAssetRepository
 
 
 class AssetFactory:
@@ -13,17 +16,23 @@ class AssetFactory:
     """
 
     _creators: Dict[str, Callable] = {}
+    _builders: Dict[str, Callable] = {}
 
     @classmethod
-    def register(cls, asset_type: str, creator: Callable) -> None:
+    def register(cls, asset_type: str, creator: Callable, builder: Optional[Callable] = None) -> None:
         """
         Enregistrer un nouveau créateur pour un type d'actif
         
         Args:
             asset_type: Type d'actif (STOCK, BOND, CRYPTO)
             creator: Fonction ou classe qui crée l'actif
+            builder: Fonction qui construit l'actif sans le sauvegarder (utilisée par create_many)
         """
         cls._creators[asset_type] = creator
+        if builder is not None:
+            cls._builders[asset_type] = builder
+        else:
+            cls._builders.pop(asset_type, None)
 
     @classmethod
     def create(cls, asset_type: str, **kwargs) -> Asset:
@@ -45,41 +54,113 @@ class AssetFactory:
             raise ValueError(f"Type d'actif '{asset_type}' non enregistré")
         return creator(**kwargs)
 
+    @classmethod
+    def create_many(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = 500,
+        repository: IAssetRepository = None
+    ) -> List[Asset]:
+        """
+        Créer plusieurs actifs en une transaction
+        
+        Chaque enregistrement est confié au builder de son type (instance non
+        sauvegardée), puis les instances sont insérées par lots avec
+        bulk_create. Les types enregistrés sans builder passent par leur
+        créateur, une insertion par actif.
+        
+        Args:
+            records: Dicts contenant asset_type et les paramètres de create()
+            batch_size: Nombre de lignes par INSERT
+            repository: Repository utilisé pour l'insertion (par défaut DjangoAssetRepository)
+            
+        Returns:
+            Actifs créés, dans l'ordre des enregistrements
+            
+        Raises:
+            ValueError: Si un type d'actif n'est pas enregistré (aucune insertion)
+        """
+        records = [dict(record) for record in records]
+        for record in records:
+            if record.get('asset_type') not in cls._creators:
+                raise ValueError(f"Type d'actif '{record.get('asset_type')}' non enregistré")
+
+        repository = repository or DjangoAssetRepository()
+        results: List[Optional[Asset]] = [None] * len(records)
+        pending: List[Asset] = []
+        pending_positions: List[int] = []
+        with transaction.atomic():
+            for position, record in enumerate(records):
+                asset_type = record.pop('asset_type')
+                builder = cls._builders.get(asset_type)
+                if builder is None:
+                    results[position] = cls._creators[asset_type](**record)
+                else:
+                    pending.append(builder(**record))
+                    pending_positions.append(position)
+            if pending:
+                created = repository.bulk_create(pending, batch_size=batch_size)
+                for position, asset in zip(pending_positions, created):
+                    results[position] = asset
+        return results
+
     @classmethod
     def get_available_types(cls) -> list:
         """Retourner les types d'actifs disponibles"""
         return list(cls._creators.keys())
 
 
-# Créateurs par défaut pour chaque type d'actif
-def create_stock(user_id: int, **kwargs) -> Asset:
-    """Créer un actif de type Action"""
-    return Asset.objects.create(
+# Builders par défaut pour chaque type d'actif (instances non sauvegardées)
+def build_stock(user_id: int, **kwargs) -> Asset:
+    """Construire un actif de type Action"""
+    return Asset(
         user_id=user_id,
         asset_type=Asset.AssetType.STOCK,
         **kwargs
     )
 
 
-def create_bond(user_id: int, **kwargs) -> Asset:
-    """Créer un actif de type Obligation"""
-    return Asset.objects.create(
+def build_bond(user_id: int, **kwargs) -> Asset:
+    """Construire un actif de type Obligation"""
+    return Asset(
         user_id=user_id,
         asset_type=Asset.AssetType.BOND,
         **kwargs
     )
 
 
-def create_crypto(user_id: int, **kwargs) -> Asset:
-    """Créer un actif de type Crypto-monnaie"""
-    return Asset.objects.create(
+def build_crypto(user_id: int, **kwargs) -> Asset:
+    """Construire un actif de type Crypto-monnaie"""
+    return Asset(
         user_id=user_id,
         asset_type=Asset.AssetType.CRYPTO,
         **kwargs
     )
 
 
+# Créateurs par défaut pour chaque type d'actif
+def create_stock(user_id: int, **kwargs) -> Asset:
+    """Créer un actif de type Action"""
+    asset = build_stock(user_id, **kwargs)
+    asset.save(force_insert=True)
+    return asset
+
+
+def create_bond(user_id: int, **kwargs) -> Asset:
+    """Créer un actif de type Obligation"""
+    asset = build_bond(user_id, **kwargs)
+    asset.save(force_insert=True)
+    return asset
+
+
+def create_crypto(user_id: int, **kwargs) -> Asset:
+    """Créer un actif de type Crypto-monnaie"""
+    asset = build_crypto(user_id, **kwargs)
+    asset.save(force_insert=True)
+    return asset
+
+
 # Enregistrer les créateurs
-AssetFactory.register(Asset.AssetType.STOCK, create_stock)
-AssetFactory.register(Asset.AssetType.BOND, create_bond)
-AssetFactory.register(Asset.AssetType.CRYPTO, create_crypto)
+AssetFactory.register(Asset.AssetType.STOCK, create_stock, build_stock)
+AssetFactory.register(Asset.AssetType.BOND, create_bond, build_bond)
+AssetFactory.register(Asset.AssetType.CRYPTO, create_crypto, build_crypto)
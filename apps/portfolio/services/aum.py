@@ -0,0 +1,193 @@
+"""
+AUM - Encours sous gestion de l'ensemble des utilisateurs
+
+Total, répartition par type d'actif, principaux symboles et répartition
+des utilisateurs par tranche d'encours, calculés par agrégats groupés en
+SQL (aucune ligne d'actif ne remonte en Python). Les portefeuilles
+archivés pour inactivité restent sous gestion et sont comptés.
+
+Le résultat est conservé en cache sans expiration avec sa date de calcul :
+au-delà de l'intervalle de rafraîchissement, une seule requête le recalcule
+(verrou cache.add) pendant que les autres servent la version précédente.
+Cache vide (démarrage, éviction) : une seule requête calcule aussi, les
+autres attendent son résultat, puis abandonnent (AumUnavailable → 503).
+`manage.py refresh_aum`, planifié, le tient à jour sans jamais faire
+attendre une requête.
+"""
+
+import time
+from typing import Callable, Dict, List
+
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet, Sum
+from django.utils import timezone
+
+from ..models import ArchivedAsset, Asset, AssetQuerySet
+
+# (libellé, borne basse incluse, borne haute exclue) ; None = sans limite
+USER_BUCKETS = (
+    ('<10k', 0, 10_000),
+    ('10k-100k', 10_000, 100_000),
+    ('100k-1M', 100_000, 1_000_000),
+    ('>=1M', 1_000_000, None),
+)
+
+
+class AumUnavailable(Exception):
+    """Tableau de bord absent du cache et en cours de calcul par une autre requête"""
+
+
+class AumService:
+    """Tableau de bord de l'encours sous gestion (tous utilisateurs)"""
+
+    CACHE_KEY = 'portfolio:aum'
+    LOCK_KEY = 'portfolio:aum:refresh'
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, top_symbols: int = 10, refresh_interval: int = 300, wait_timeout: float = 5.0,
+                 clock: Callable = timezone.now, sleep: Callable = time.sleep):
+        """
+        Args:
+            top_symbols: Nombre de symboles retournés, par exposition décroissante
+            refresh_interval: Âge (s) au-delà duquel le tableau de bord est recalculé
+            wait_timeout: Attente maximale (s) du calcul d'une autre requête, cache vide
+            clock: Horloge (injectable pour les tests)
+            sleep: Attente entre deux lectures du cache (injectable pour les tests)
+        """
+        self.top_symbols = top_symbols
+        self.refresh_interval = refresh_interval
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self.sleep = sleep
+
+    def get_dashboard(self) -> Dict:
+        """
+        Tableau de bord depuis le cache, recalculé s'il est absent ou trop ancien
+
+        Returns:
+            Dict avec computed_at, stale et les agrégats de compute()
+
+        Raises:
+            AumUnavailable: Cache vide et calcul d'une autre requête non terminé après wait_timeout
+        """
+        snapshot = cache.get(self.CACHE_KEY)
+        if (snapshot is None or self._is_stale(snapshot)) and cache.add(self.LOCK_KEY, True, self.refresh_interval):
+            try:
+                return self.refresh()
+            finally:
+                cache.delete(self.LOCK_KEY)
+        if snapshot is None:
+            snapshot = self._wait_for_snapshot()
+        # Calcul en cours dans une autre requête : version précédente
+        return {**snapshot, 'stale': self._is_stale(snapshot)}
+
+    def _wait_for_snapshot(self) -> Dict:
+        """Attendre le résultat du calcul lancé par une autre requête"""
+        waited = 0.0
+        while waited < self.wait_timeout:
+            self.sleep(self.POLL_INTERVAL)
+            waited += self.POLL_INTERVAL
+            snapshot = cache.get(self.CACHE_KEY)
+            if snapshot is not None:
+                return snapshot
+        raise AumUnavailable("Calcul de l'encours en cours")
+
+    def refresh(self) -> Dict:
+        """Recalculer le tableau de bord et le mettre en cache"""
+        snapshot = {'computed_at': self.clock(), **self.compute()}
+        cache.set(self.CACHE_KEY, snapshot, None)
+        return {**snapshot, 'stale': False}
+
+    def _is_stale(self, snapshot: Dict) -> bool:
+        return (self.clock() - snapshot['computed_at']).total_seconds() > self.refresh_interval
+
+    def compute(self) -> Dict:
+        """
+        Agrégats sur la table courante et l'archive des portefeuilles inactifs
+
+        Un portefeuille inactif est archivé en entier : les deux tables
+        portent des utilisateurs distincts et leurs comptes s'additionnent.
+        """
+        sources = [
+            Asset.objects.all(),
+            ArchivedAsset.objects.filter(reason=ArchivedAsset.Reason.DORMANT),
+        ]
+        by_type: Dict[str, Dict] = {}
+        by_symbol: Dict[str, Dict] = {}
+        buckets = {label: {'users': 0, 'value': 0.0} for label, _, _ in USER_BUCKETS}
+        for queryset in sources:
+            self._merge(by_type, self._group(queryset, 'asset_type', count=Count('id')), 'asset_type')
+            self._merge(by_symbol, self._group(
+                queryset, 'symbol', holders=Count('user_id', distinct=True)
+            ), 'symbol')
+            for label, row in self._user_buckets(queryset).items():
+                buckets[label]['users'] += row['users']
+                buckets[label]['value'] += row['value']
+
+        total_value = sum(row['value'] for row in by_type.values())
+        top_symbols = sorted(by_symbol.values(), key=lambda row: (-row['value'], row['symbol']))
+        return {
+            'total_value': total_value,
+            'asset_count': sum(row['count'] for row in by_type.values()),
+            'user_count': sum(row['users'] for row in buckets.values()),
+            'by_asset_type': self._with_share(
+                sorted(by_type.values(), key=lambda row: -row['value']), total_value
+            ),
+            'top_symbols': self._with_share(top_symbols[:self.top_symbols], total_value),
+            'user_buckets': [
+                {'label': label, 'min_value': low, 'max_value': high, **buckets[label]}
+                for label, low, high in USER_BUCKETS
+            ],
+        }
+
+    @staticmethod
+    def _group(queryset: QuerySet, field: str, **extra) -> List[Dict]:
+        """Valeur (quantité × prix courant) groupée par `field`, en une requête"""
+        return list(
+            queryset.values(field)
+            .annotate(value=Sum(AssetQuerySet.VALUE_EXPRESSION), **extra)
+            .order_by()
+        )
+
+    @staticmethod
+    def _merge(target: Dict[str, Dict], rows: List[Dict], field: str) -> None:
+        """Additionner des lignes groupées dans `target` (clé : valeur de `field`)"""
+        for row in rows:
+            row['value'] = row['value'] or 0.0
+            current = target.get(row[field])
+            if current is None:
+                target[row[field]] = row
+            else:
+                for name, value in row.items():
+                    if name != field:
+                        current[name] += value
+
+    @staticmethod
+    def _user_buckets(queryset: QuerySet) -> Dict[str, Dict]:
+        """
+        Utilisateurs et encours par tranche d'encours, en une requête
+
+        SELECT ... FROM (SELECT user_id, SUM(valeur) AS total ... GROUP BY user_id)
+        """
+        per_user = queryset.values('user_id').annotate(total=Sum(AssetQuerySet.VALUE_EXPRESSION)).order_by()
+        aggregates = {}
+        for index, (_, low, high) in enumerate(USER_BUCKETS):
+            condition = Q(total__gte=low) if high is None else Q(total__gte=low, total__lt=high)
+            if index == 0:
+                # Valeur négative ou nulle (prix manquant) : première tranche
+                condition = Q(total__lt=high) | Q(total__isnull=True)
+            aggregates[f'users_{index}'] = Count('user_id', filter=condition)
+            aggregates[f'value_{index}'] = Sum('total', filter=condition)
+        result = per_user.aggregate(**aggregates)
+        return {
+            label: {'users': result[f'users_{index}'], 'value': result[f'value_{index}'] or 0.0}
+            for index, (label, _, _) in enumerate(USER_BUCKETS)
+        }
+
+    @staticmethod
+    def _with_share(rows: List[Dict], total_value: float) -> List[Dict]:
+        """Ajouter la part de l'encours total (en %) à chaque ligne"""
+        for row in rows:
+            row['share'] = round(row['value'] * 100 / total_value, 2) if total_value else 0.0
+        return rows
@@ -0,0 +1,281 @@
+"""
+Benchmark - Microbenchmarks des calculators, du service et des sérialiseurs
+
+Chaque benchmark est enregistré par nom avec une fonction de préparation
+qui reçoit la taille du portefeuille et retourne l'appel à chronométrer.
+Les résultats (temps par appel) sont comparés à une baseline JSON sur le
+meilleur temps des mesures, le moins sensible au bruit de la machine : un
+ralentissement au-delà du seuil est signalé comme régression.
+"""
+
+import platform
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Asset
+from ..serializers import AssetSerializer, PortfolioSummarySerializer
+from .asset_factory import AssetFactory
+from .calculators import AbsoluteGainCalculator, AnnualizedReturnCalculator, SimpleROICalculator
+from .frame import PortfolioFrame
+from .portfolio_service import PortfolioService
+from .repositories import DjangoAssetRepository
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def measure(func: Callable[[], Any], min_time: float = 0.05, rounds: int = 5) -> Dict[str, Any]:
+    """
+    Chronométrer un appel (à la manière de timeit)
+
+    Le nombre d'appels par mesure double jusqu'à ce qu'une mesure dure au
+    moins `min_time`, puis `rounds` mesures sont prises.
+
+    Returns:
+        Temps par appel en microsecondes : médiane, minimum, écart-type
+    """
+    func()  # échauffement (caches, imports paresseux)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return {
+        'median_us': round(statistics.median(samples) * 1e6, 3),
+        'min_us': round(min(samples) * 1e6, 3),
+        'stdev_us': round(statistics.pstdev(samples) * 1e6, 3),
+        'number': number,
+        'rounds': len(samples),
+    }
+
+
+def sample_records(size: int, seed: int = 0, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Portefeuille déterministe de `size` lignes (types alternés, dates distinctes)"""
+    rng = np.random.default_rng(seed + size)
+    types = [Asset.AssetType.STOCK, Asset.AssetType.BOND, Asset.AssetType.CRYPTO]
+    purchase = np.round(rng.uniform(10, 500, size), 2)
+    current = np.round(purchase * rng.lognormal(0.05, 0.3, size), 2)
+    quantity = np.round(rng.uniform(0.5, 100, size), 8)
+    today = date.today()
+    return [
+        {
+            'asset_type': types[index % 3],
+            'user_id': user_id,
+            'symbol': f'BM{index % 50}',
+            'name': f'Benchmark {index % 50}',
+            'quantity': Decimal(f'{quantity[index]:.8f}'),
+            'purchase_price': Decimal(f'{purchase[index]:.2f}'),
+            'current_price': Decimal(f'{max(current[index], 0.01):.2f}'),
+            'purchase_date': today - timedelta(days=1 + index),
+        }
+        for index in range(size)
+    ]
+
+
+class BenchmarkContext:
+    """Données partagées par les benchmarks d'une exécution, construites à la demande"""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._assets: Dict[int, List[Asset]] = {}
+        self._users: Dict[int, int] = {}
+        self.service = PortfolioService(DjangoAssetRepository())
+
+    def assets(self, size: int) -> List[Asset]:
+        """Actifs en mémoire (non sauvegardés)"""
+        if size not in self._assets:
+            assets = []
+            for record in sample_records(size, self.seed):
+                asset_type = record.pop('asset_type')
+                assets.append(Asset(asset_type=asset_type, **record))
+            self._assets[size] = assets
+        return self._assets[size]
+
+    def user_id(self, size: int) -> int:
+        """Utilisateur en base avec un portefeuille de `size` lignes"""
+        if size not in self._users:
+            user = get_user_model().objects.create(
+                username=f'benchmark_{size}', email=f'benchmark_{size}@benchmark.local'
+            )
+            AssetFactory.create_many(sample_records(size, self.seed, user.id))
+            self._users[size] = user.id
+        return self._users[size]
+
+
+class BenchmarkSuite:
+    """
+    Registre des benchmarks (même principe qu'AssetFactory).
+
+    Les données créées en base sont annulées en fin d'exécution
+    (transaction en rollback).
+    """
+
+    _benchmarks: Dict[str, Callable[[BenchmarkContext, int], Callable[[], Any]]] = {}
+
+    @classmethod
+    def register(cls, name: str, setup: Callable[[BenchmarkContext, int], Callable[[], Any]]) -> None:
+        """
+        Enregistrer un benchmark
+
+        Args:
+            name: Nom unique ('calculator.simple_roi', ...)
+            setup: Fonction (contexte, taille) -> appel à chronométrer
+        """
+        cls._benchmarks[name] = setup
+
+    @classmethod
+    def get_available_benchmarks(cls) -> List[str]:
+        return list(cls._benchmarks)
+
+    def __init__(self, sizes: Iterable[int] = DEFAULT_SIZES, min_time: float = 0.05,
+                 rounds: int = 5, seed: int = 0):
+        self.sizes = list(sizes)
+        self.min_time = min_time
+        self.rounds = rounds
+        self.seed = seed
+
+    def select(self, only: Optional[Iterable[str]] = None) -> List[str]:
+        """Benchmarks dont le nom commence par l'un des préfixes `only`"""
+        names = self.get_available_benchmarks()
+        if not only:
+            return names
+        prefixes = tuple(only)
+        return [name for name in names if name.startswith(prefixes)]
+
+    def run(self, only: Optional[Iterable[str]] = None,
+            progress: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Any]:
+        """
+        Exécuter les benchmarks sélectionnés à chaque taille
+
+        Returns:
+            {'meta': {...}, 'results': {'nom[taille]': mesure}}
+        """
+        results = {}
+        with transaction.atomic():
+            context = BenchmarkContext(self.seed)
+            for name in self.select(only):
+                for size in self.sizes:
+                    call = self._benchmarks[name](context, size)
+                    key = f'{name}[{size}]'
+                    results[key] = measure(call, self.min_time, self.rounds)
+                    if progress is not None:
+                        progress(key, results[key])
+            transaction.set_rollback(True)
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'sizes': self.sizes,
+            },
+            'results': results,
+        }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Comparer des résultats à une baseline (meilleurs temps)
+
+    Args:
+        results: Sortie de BenchmarkSuite.run
+        baseline: Baseline au même format
+        threshold: Ralentissement relatif toléré (0.2 = +20 %)
+
+    Returns:
+        Une entrée par benchmark : status 'regression', 'improvement', 'ok' ou 'new'
+    """
+    reference = baseline.get('results', {})
+    comparison = []
+    for key, measurement in results['results'].items():
+        entry = {'benchmark': key, 'min_us': measurement['min_us']}
+        previous = reference.get(key)
+        if previous is None:
+            entry['status'] = 'new'
+        else:
+            ratio = measurement['min_us'] / max(previous['min_us'], 1e-9)
+            entry['baseline_us'] = previous['min_us']
+            entry['ratio'] = round(ratio, 3)
+            if ratio > 1 + threshold:
+                entry['status'] = 'regression'
+            elif ratio < 1 / (1 + threshold):
+                entry['status'] = 'improvement'
+            else:
+                entry['status'] = 'ok'
+        comparison.append(entry)
+    return comparison
+
+
+# Benchmarks par défaut
+def calculator_benchmark(calculator_class):
+    def setup(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+        calculator = calculator_class()
+        assets = context.assets(size)
+        return lambda: [calculator.calculate(asset) for asset in assets]
+    return setup
+
+
+def frame_calculator_benchmark(calculator_class):
+    def setup(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+        calculator = calculator_class()
+        frame = PortfolioFrame.from_assets(context.assets(size))
+        return lambda: calculator.calculate_many(frame)
+    return setup
+
+
+def frame_load_benchmark(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+    user_id = context.user_id(size)
+    repository = DjangoAssetRepository()
+    return lambda: repository.find_frame_by_user(user_id)
+
+
+def summary_benchmark(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+    user_id = context.user_id(size)
+    return lambda: context.service.get_portfolio_summary(user_id)
+
+
+def performance_benchmark(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+    user_id = context.user_id(size)
+    return lambda: context.service.get_portfolio_performance(user_id)
+
+
+def asset_serializer_benchmark(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+    assets = list(Asset.objects.filter(user_id=context.user_id(size)))
+    renderer = JSONRenderer()
+    return lambda: renderer.render(AssetSerializer(assets, many=True).data)
+
+
+def summary_serializer_benchmark(context: BenchmarkContext, size: int) -> Callable[[], Any]:
+    summary = context.service.get_portfolio_summary(context.user_id(size))
+    renderer = JSONRenderer()
+    return lambda: renderer.render(PortfolioSummarySerializer(summary).data)
+
+
+BenchmarkSuite.register('calculator.simple_roi', calculator_benchmark(SimpleROICalculator))
+BenchmarkSuite.register('calculator.absolute_gain', calculator_benchmark(AbsoluteGainCalculator))
+BenchmarkSuite.register('calculator.annualized_return', calculator_benchmark(AnnualizedReturnCalculator))
+BenchmarkSuite.register('frame.simple_roi', frame_calculator_benchmark(SimpleROICalculator))
+BenchmarkSuite.register('frame.annualized_return', frame_calculator_benchmark(AnnualizedReturnCalculator))
+BenchmarkSuite.register('frame.load', frame_load_benchmark)
+BenchmarkSuite.register('service.summary', summary_benchmark)
+BenchmarkSuite.register('service.performance', performance_benchmark)
+BenchmarkSuite.register('serializer.assets', asset_serializer_benchmark)
+BenchmarkSuite.register('serializer.summary', summary_serializer_benchmark)
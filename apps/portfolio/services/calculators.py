@@ -2,6 +2,8 @@
 Strategy Pattern - Calculators pour différents algorithmes de performance
 """
 
+import numpy as np
+
 from .interfaces import IPerformanceCalculator
 
 
@@ -29,6 +31,10 @@ class SimpleROICalculator(IPerformanceCalculator):
         
         return ((current_value - purchase_value) / purchase_value) * 100
 
+    def calculate_many(self, frame) -> np.ndarray:
+        """ROI de toutes les lignes d'un PortfolioFrame"""
+        return frame.performance_percentage
+
 
 class AbsoluteGainCalculator(IPerformanceCalculator):
     """Calcul du gain/perte en valeur absolue"""
@@ -47,6 +53,10 @@ class AbsoluteGainCalculator(IPerformanceCalculator):
         purchase_value = float(asset.quantity * asset.purchase_price)
         return current_value - purchase_value
 
+    def calculate_many(self, frame) -> np.ndarray:
+        """Gain ou perte de toutes les lignes d'un PortfolioFrame"""
+        return frame.gain_loss
+
 
 class AnnualizedReturnCalculator(IPerformanceCalculator):
     """Calcul du retour annualisé"""
@@ -81,3 +91,15 @@ class AnnualizedReturnCalculator(IPerformanceCalculator):
         # Retour annualisé
         annualized = ((1 + roi) ** (1 / years)) - 1
         return annualized * 100
+
+    def calculate_many(self, frame) -> np.ndarray:
+        """Retour annualisé de toutes les lignes d'un PortfolioFrame"""
+        from datetime import datetime
+
+        purchase_value = frame.purchase_value
+        current_value = frame.current_value
+        days = datetime.now().date().toordinal() - frame.purchase_ordinal
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            roi = (current_value - purchase_value) / purchase_value
+            annualized = ((1 + roi) ** (1 / (days / 365.0)) - 1) * 100
+        return np.where((purchase_value == 0) | (days == 0), 0.0, annualized)
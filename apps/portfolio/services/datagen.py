@@ -0,0 +1,267 @@
+"""
+Data Generator - Jeux de données synthétiques à grande échelle
+
+Génère des utilisateurs et des portefeuilles réalistes pour les tests de
+charge et les benchmarks : tailles de portefeuille asymétriques (loi
+log-normale), mélange STOCK/BOND/CRYPTO, popularité des symboles en loi de
+Zipf, plusieurs lots par position, prix d'achat cohérents avec l'âge du lot.
+Le tirage est vectorisé avec NumPy par paquet d'utilisateurs et entièrement
+déterminé par la graine ; les insertions passent par bulk_create.
+"""
+
+import math
+import string
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from ..models import Asset
+from .asset_factory import AssetFactory
+from .simulator import DEFAULT_VOLATILITY
+
+User = get_user_model()
+
+DAYS_PER_YEAR = 365
+
+
+@dataclass(frozen=True)
+class TypeProfile:
+    """Paramètres de génération d'un type d'actif"""
+    weight: float        # part des positions
+    universe: int        # nombre de symboles distincts
+    median_price: float  # prix courant médian
+    price_spread: float  # écart-type du log-prix entre symboles
+    fractional: bool     # quantités fractionnaires (crypto)
+
+
+DEFAULT_PROFILES: Dict[str, TypeProfile] = {
+    Asset.AssetType.STOCK: TypeProfile(0.60, 2000, 80.0, 1.0, False),
+    Asset.AssetType.BOND: TypeProfile(0.25, 500, 100.0, 0.05, False),
+    Asset.AssetType.CRYPTO: TypeProfile(0.15, 100, 20.0, 2.5, True),
+}
+
+
+def letters(index: int, length: int, alphabet: str = string.ascii_uppercase) -> str:
+    """Écrire un entier en base len(alphabet) sur `length` lettres"""
+    result = []
+    for _ in range(length):
+        index, remainder = divmod(index, len(alphabet))
+        result.append(alphabet[remainder])
+    return ''.join(reversed(result))
+
+
+def make_symbol(asset_type: str, index: int) -> str:
+    # Préfixes disjoints : aucun symbole n'appartient à deux types
+    if asset_type == Asset.AssetType.CRYPTO:
+        return 'X' + letters(index, 3)
+    if asset_type == Asset.AssetType.BOND:
+        return f'BD{index:05d}'
+    return letters(index, 4, string.ascii_uppercase[:23])
+
+
+class SymbolUniverse:
+    """Symboles d'un type, avec prix courant et popularité (loi de Zipf)"""
+
+    def __init__(self, asset_type: str, profile: TypeProfile, rng: np.random.Generator, zipf_exponent: float):
+        self.asset_type = asset_type
+        self.profile = profile
+        self.symbols = [make_symbol(asset_type, index) for index in range(profile.universe)]
+        self.names = [f'{asset_type.title()} {symbol}' for symbol in self.symbols]
+        prices = profile.median_price * np.exp(rng.normal(0.0, profile.price_spread, profile.universe))
+        self.prices = np.maximum(np.round(prices, 2), 0.01)
+        popularity = 1.0 / np.arange(1, profile.universe + 1) ** zipf_exponent
+        self.popularity = popularity / popularity.sum()
+        self.volatility = DEFAULT_VOLATILITY.get(asset_type, 0.25)
+
+
+class DatasetGenerator:
+    """
+    Générateur de portefeuilles synthétiques.
+
+    Chaque utilisateur reçoit un nombre de lignes tiré d'une loi log-normale
+    (quelques très gros portefeuilles, beaucoup de petits), réparties en
+    positions (un symbole chacune) de plusieurs lots datés. Les doublons
+    (utilisateur, symbole, date) sont écartés pour respecter la contrainte
+    d'unicité d'Asset.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        mean_assets: float = 50.0,
+        size_sigma: float = 1.2,
+        max_assets: int = 5000,
+        lots_per_position: float = 3.0,
+        history_years: float = 5.0,
+        end_date: Optional[date] = None,
+        zipf_exponent: float = 1.1,
+        profiles: Optional[Dict[str, TypeProfile]] = None
+    ):
+        """
+        Args:
+            seed: Graine (même graine et mêmes paramètres = mêmes données)
+            mean_assets: Nombre moyen de lignes Asset par utilisateur
+            size_sigma: Asymétrie des tailles de portefeuille (sigma du log)
+            max_assets: Taille maximale d'un portefeuille
+            lots_per_position: Nombre moyen de lots par symbole détenu
+            history_years: Profondeur des dates d'achat
+            end_date: Date d'achat la plus récente (par défaut aujourd'hui)
+            zipf_exponent: Concentration de la popularité des symboles
+            profiles: Paramètres par type d'actif (par défaut DEFAULT_PROFILES)
+        """
+        if mean_assets < 1 or lots_per_position < 1:
+            raise ValueError("mean_assets et lots_per_position doivent être au moins égaux à 1")
+        self.rng = np.random.default_rng(seed)
+        self.mean_assets = mean_assets
+        self.size_sigma = size_sigma
+        self.max_assets = max_assets
+        self.lots_per_position = lots_per_position
+        self.history_days = max(1, int(history_years * DAYS_PER_YEAR))
+        self.end_date = end_date or date.today()
+        profiles = profiles or DEFAULT_PROFILES
+        self.types = list(profiles)
+        weights = np.array([profiles[asset_type].weight for asset_type in self.types], dtype=np.float64)
+        self.type_weights = weights / weights.sum()
+        self.universes = [SymbolUniverse(asset_type, profiles[asset_type], self.rng, zipf_exponent)
+                          for asset_type in self.types]
+        self.max_universe = max(universe.profile.universe for universe in self.universes)
+
+    def portfolio_sizes(self, count: int) -> np.ndarray:
+        # Log-normale de moyenne mean_assets : mu = ln(moyenne) - sigma² / 2
+        mu = math.log(self.mean_assets) - self.size_sigma ** 2 / 2
+        sizes = np.rint(self.rng.lognormal(mu, self.size_sigma, count))
+        return np.clip(sizes, 1, self.max_assets).astype(np.int64)
+
+    def generate_lots(self, user_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Tirer les lots d'un paquet d'utilisateurs (tableaux colonnes)
+
+        Returns:
+            Dict user_id, type (indice), symbol (indice), day (jours avant end_date),
+            quantity, purchase_price, current_price
+        """
+        rng = self.rng
+        sizes = self.portfolio_sizes(len(user_ids))
+        positions = np.maximum(1, np.rint(sizes / self.lots_per_position)).astype(np.int64)
+
+        # Positions : un type et un symbole (selon la popularité) chacune
+        position_user = np.repeat(np.arange(len(user_ids)), positions)
+        position_type = rng.choice(len(self.types), size=len(position_user), p=self.type_weights)
+        position_symbol = np.empty(len(position_user), dtype=np.int64)
+        for type_index, universe in enumerate(self.universes):
+            mask = position_type == type_index
+            position_symbol[mask] = rng.choice(universe.profile.universe, size=int(mask.sum()), p=universe.popularity)
+
+        # Lots : chaque ligne est rattachée à une position de son utilisateur
+        row_user = np.repeat(np.arange(len(user_ids)), sizes)
+        first_position = np.concatenate(([0], np.cumsum(positions)[:-1]))
+        row_position = first_position[row_user] + (rng.random(len(row_user)) * positions[row_user]).astype(np.int64)
+        row_type = position_type[row_position]
+        row_symbol = position_symbol[row_position]
+        row_day = rng.integers(0, self.history_days, len(row_user))
+
+        # Contrainte d'unicité (utilisateur, symbole, date d'achat)
+        key = ((row_user * len(self.types) + row_type) * self.max_universe + row_symbol) * self.history_days + row_day
+        _, keep = np.unique(key, return_index=True)
+        keep.sort()
+        row_user, row_type, row_symbol, row_day = row_user[keep], row_type[keep], row_symbol[keep], row_day[keep]
+
+        current = np.empty(len(keep))
+        volatility = np.empty(len(keep))
+        fractional = np.zeros(len(keep), dtype=bool)
+        for type_index, universe in enumerate(self.universes):
+            mask = row_type == type_index
+            current[mask] = universe.prices[row_symbol[mask]]
+            volatility[mask] = universe.volatility
+            fractional[mask] = universe.profile.fractional
+
+        # Prix d'achat : le prix courant remonté le long d'une trajectoire log-normale de l'âge du lot
+        age = row_day / DAYS_PER_YEAR
+        purchase = current * np.exp(-volatility * np.sqrt(age) * rng.standard_normal(len(keep)))
+        purchase = np.maximum(np.round(purchase, 2), 0.01)
+        notional = rng.lognormal(math.log(2000.0), 1.0, len(keep))
+        quantity = np.where(
+            fractional,
+            np.maximum(np.round(notional / purchase, 8), 1e-8),
+            np.maximum(np.rint(notional / purchase), 1)
+        )
+        return {
+            'user_id': np.asarray(user_ids)[row_user],
+            'type': row_type,
+            'symbol': row_symbol,
+            'day': row_day,
+            'quantity': quantity,
+            'purchase_price': purchase,
+            'current_price': current,
+        }
+
+    def asset_records(self, user_ids: np.ndarray) -> Iterator[Dict]:
+        """Enregistrements pour AssetFactory.create_many"""
+        lots = self.generate_lots(user_ids)
+        end_date = self.end_date
+        dates = [end_date - timedelta(days=day) for day in range(self.history_days)]
+        for user_id, type_index, symbol_index, day, quantity, purchase, current in zip(
+            lots['user_id'].tolist(), lots['type'].tolist(), lots['symbol'].tolist(), lots['day'].tolist(),
+            lots['quantity'].tolist(), lots['purchase_price'].tolist(), lots['current_price'].tolist()
+        ):
+            universe = self.universes[type_index]
+            yield {
+                'asset_type': universe.asset_type,
+                'user_id': user_id,
+                'symbol': universe.symbols[symbol_index],
+                'name': universe.names[symbol_index],
+                'quantity': Decimal(f'{quantity:.8f}'),
+                'purchase_price': Decimal(f'{purchase:.2f}'),
+                'current_price': Decimal(f'{current:.2f}'),
+                'purchase_date': dates[day],
+            }
+
+    @staticmethod
+    def create_users(count: int, prefix: str = 'synth_', password: str = 'synthetic',
+                     start: int = 0, batch_size: int = 5000) -> List[int]:
+        """
+        Créer des utilisateurs par bulk_create (mot de passe haché une seule fois)
+
+        Returns:
+            IDs des utilisateurs créés, dans l'ordre
+        """
+        password_hash = make_password(password)
+        usernames = [f'{prefix}{index:07d}' for index in range(start, start + count)]
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [User(username=username, email=f'{username}@synthetic.local', password=password_hash)
+                 for username in usernames],
+                batch_size=batch_size
+            )
+        if all(user.pk for user in users):
+            return [user.pk for user in users]
+        # Bases sans RETURNING : relire les IDs
+        ids = dict(User.objects.filter(username__startswith=prefix).values_list('username', 'id'))
+        return [ids[username] for username in usernames]
+
+    def populate(self, users: int, prefix: str = 'synth_', password: str = 'synthetic',
+                 user_batch: int = 2000, batch_size: int = 5000) -> Iterator[Tuple[int, int]]:
+        """
+        Créer `users` utilisateurs et leurs portefeuilles, paquet par paquet
+
+        Args:
+            users: Nombre d'utilisateurs
+            prefix: Préfixe des noms d'utilisateur
+            password: Mot de passe commun
+            user_batch: Utilisateurs générés par paquet (une transaction par paquet)
+            batch_size: Lignes par INSERT
+
+        Returns:
+            Itérateur de (utilisateurs créés, actifs créés) par paquet
+        """
+        for start in range(0, users, user_batch):
+            count = min(user_batch, users - start)
+            user_ids = np.array(self.create_users(count, prefix, password, start, batch_size))
+            assets = AssetFactory.create_many(self.asset_records(user_ids), batch_size=batch_size)
+            yield count, len(assets)
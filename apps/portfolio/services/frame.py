@@ -0,0 +1,262 @@
+"""
+PortfolioFrame - Modèle de lecture en colonnes pour les calculs analytiques
+
+Les actifs d'un portefeuille sont chargés par une seule requête values_list
+dans des tableaux typés (array puis vues NumPy sans copie) : une colonne
+par champ au lieu d'une instance Asset par ligne. Les symboles et les noms
+sont internés (un code par valeur distincte), le type d'actif est un petit
+entier. Les valeurs monétaires sont des float64, comme les propriétés
+current_value / purchase_value du modèle.
+
+Les champs décimaux renvoyés aux clients (column, value) restent ceux de
+la base : les rares valeurs dont l'écriture au pas du champ dépasse 15
+chiffres, qu'un float64 ne restitue pas, sont conservées en texte à côté
+de la colonne.
+"""
+
+from array import array
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db.models import CharField, FloatField
+from django.db.models.functions import Cast
+
+from ..models import Asset
+
+# Code entier de chaque type d'actif (ordre des choix du modèle)
+ASSET_TYPES: Tuple[str, ...] = tuple(Asset.AssetType.values)
+ASSET_TYPE_CODES: Dict[str, int] = {value: code for code, value in enumerate(ASSET_TYPES)}
+ASSET_TYPE_LABELS: Tuple[str, ...] = tuple(Asset.AssetType.labels)
+
+COLUMNS = ('id', 'asset_type', 'symbol', 'name', 'quantity', 'purchase_price', 'current_price', 'purchase_date')
+FLOAT_COLUMNS = ('quantity', 'purchase_price', 'current_price')
+COMPUTED_COLUMNS = ('current_value', 'purchase_value', 'gain_loss', 'performance_percentage')
+# Décimales de chaque colonne décimale (decimal_places du modèle)
+PLACES: Dict[str, int] = {name: Asset._meta.get_field(name).decimal_places for name in FLOAT_COLUMNS}
+# Chiffres significatifs décimaux toujours restitués à l'identique par un float64
+FLOAT_DIGITS = 15
+
+# Vue d'une ligne, compatible avec IPerformanceCalculator.calculate
+FrameRow = namedtuple('FrameRow', COLUMNS)
+
+
+class Interner:
+    """Table de chaînes distinctes : chaque valeur est stockée une fois et remplacée par son code"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def exceeds_float(text: str, places: int) -> bool:
+    """
+    Un float64 lu depuis `text` puis écrit avec `places` décimales
+    peut-il différer de `text` (plus de FLOAT_DIGITS chiffres) ?
+    """
+    if 'e' in text or 'E' in text:
+        # Notation scientifique (SQLite) : valeur proche de zéro
+        return False
+    integer = text.lstrip('+-').split('.', 1)[0].lstrip('0')
+    return len(integer) + places > FLOAT_DIGITS
+
+
+class PortfolioFrame:
+    """
+    Colonnes d'un portefeuille (une position par ligne, ordre de la requête)
+
+    Attributs (tableaux NumPy de même longueur) :
+        ids, type_codes, symbol_codes, name_codes, quantity, purchase_price,
+        current_price, purchase_ordinal (date d'achat en jours, date.toordinal)
+    exact : {colonne décimale: {ligne: texte}} des valeurs qu'un float64 ne restitue pas au pas du champ
+    """
+
+    def __init__(self, ids, type_codes, symbol_codes, name_codes, quantity, purchase_price,
+                 current_price, purchase_ordinal, symbols: Sequence[str], names: Sequence[str],
+                 exact: Optional[Dict[str, Dict[int, str]]] = None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.symbol_codes = np.asarray(symbol_codes, dtype=np.int32)
+        self.name_codes = np.asarray(name_codes, dtype=np.int32)
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        self.purchase_price = np.asarray(purchase_price, dtype=np.float64)
+        self.current_price = np.asarray(current_price, dtype=np.float64)
+        self.purchase_ordinal = np.asarray(purchase_ordinal, dtype=np.int32)
+        self.symbols = list(symbols)
+        self.names = list(names)
+        self.exact = exact or {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple]) -> 'PortfolioFrame':
+        """
+        Construire le frame à partir de tuples dans l'ordre de COLUMNS
+
+        Les colonnes sont remplies ligne à ligne dans des array typés :
+        aucun objet n'est conservé par ligne. Les champs décimaux peuvent
+        être suivis de leur texte exact (3 colonnes de plus, voir
+        from_queryset) ; sinon le texte est str(valeur).
+        """
+        ids, type_codes = array('q'), array('b')
+        symbol_codes, name_codes = array('i'), array('i')
+        quantity, purchase_price, current_price = array('d'), array('d'), array('d')
+        purchase_ordinal = array('i')
+        symbols, names = Interner(), Interner()
+        exact: Dict[str, Dict[int, str]] = {}
+        for index, (asset_id, asset_type, symbol, name, qty, purchase, current, purchase_date, *texts) in enumerate(rows):
+            ids.append(asset_id or 0)  # 0 : actif non sauvegardé
+            type_codes.append(ASSET_TYPE_CODES[asset_type])
+            symbol_codes.append(symbols.code(symbol))
+            name_codes.append(names.code(name))
+            quantity.append(float(qty))
+            purchase_price.append(float(purchase))
+            current_price.append(float(current))
+            for column, text in zip(FLOAT_COLUMNS, texts or (qty, purchase, current)):
+                text = str(text)
+                if exceeds_float(text, PLACES[column]):
+                    exact.setdefault(column, {})[index] = text
+            purchase_ordinal.append(purchase_date.toordinal())
+        return cls(
+            np.frombuffer(ids, dtype=np.int64) if ids else (),
+            np.frombuffer(type_codes, dtype=np.int8) if type_codes else (),
+            np.frombuffer(symbol_codes, dtype=np.int32) if symbol_codes else (),
+            np.frombuffer(name_codes, dtype=np.int32) if name_codes else (),
+            np.frombuffer(quantity) if quantity else (),
+            np.frombuffer(purchase_price) if purchase_price else (),
+            np.frombuffer(current_price) if current_price else (),
+            np.frombuffer(purchase_ordinal, dtype=np.int32) if purchase_ordinal else (),
+            symbols.values,
+            names.values,
+            exact,
+        )
+
+    @classmethod
+    def from_queryset(cls, queryset, chunk_size: int = 2000) -> 'PortfolioFrame':
+        """
+        Construire le frame en une requête values_list (lue par blocs)
+
+        Les colonnes décimales sont converties par la base (CAST), sans objet
+        Decimal intermédiaire par valeur : en flottants pour les calculs, et
+        en texte pour repérer (et conserver) les valeurs qu'un float ne
+        représente pas exactement.
+        """
+        floats = {f'{name}_float': Cast(name, FloatField()) for name in FLOAT_COLUMNS}
+        texts = {f'{name}_text': Cast(name, CharField()) for name in FLOAT_COLUMNS}
+        columns = [f'{name}_float' if name in FLOAT_COLUMNS else name for name in COLUMNS] + list(texts)
+        rows = queryset.annotate(**floats, **texts).values_list(*columns)
+        return cls.from_rows(rows.iterator(chunk_size=chunk_size))
+
+    @classmethod
+    def from_assets(cls, assets: Iterable[Asset]) -> 'PortfolioFrame':
+        """Construire le frame à partir d'instances Asset déjà chargées"""
+        return cls.from_rows(tuple(getattr(asset, name) for name in COLUMNS) for asset in assets)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # Colonnes calculées (équivalents vectorisés des propriétés d'Asset)
+    @property
+    def current_value(self) -> np.ndarray:
+        return self.quantity * self.current_price
+
+    @property
+    def purchase_value(self) -> np.ndarray:
+        return self.quantity * self.purchase_price
+
+    @property
+    def gain_loss(self) -> np.ndarray:
+        return self.current_value - self.purchase_value
+
+    @property
+    def performance_percentage(self) -> np.ndarray:
+        purchase_value = self.purchase_value
+        gain_loss = self.current_value - purchase_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(purchase_value == 0, 0.0, gain_loss / purchase_value * 100)
+
+    def type_order(self) -> List[int]:
+        """Codes des types présents, dans l'ordre de leur première apparition"""
+        codes, first = np.unique(self.type_codes, return_index=True)
+        return [int(code) for _, code in sorted(zip(first.tolist(), codes.tolist()))]
+
+    def value(self, name: str, index: int) -> Any:
+        """Valeur d'une colonne pour une ligne (types Python, comme sur Asset)"""
+        if name in COMPUTED_COLUMNS:
+            return float(getattr(self.take([index]), name)[0])
+        return self.column(name, [index])[0]
+
+    def column(self, name: str, indexes: Optional[Sequence[int]] = None) -> List[Any]:
+        """
+        Valeurs Python d'une colonne, pour toutes les lignes ou les indices donnés
+        (Decimal pour les champs décimaux, date pour purchase_date, comme sur Asset)
+        """
+        def select(values: np.ndarray) -> List:
+            return (values if indexes is None else values[np.asarray(indexes, dtype=np.int64)]).tolist()
+
+        def decimals(values: List[float], places: int) -> List[Decimal]:
+            result = [Decimal(f'{value:.{places}f}') for value in values]
+            overrides = self.exact.get(name)
+            if overrides:
+                rows = range(len(self)) if indexes is None else indexes
+                for position, row in enumerate(rows):
+                    if int(row) in overrides:
+                        result[position] = Decimal(overrides[int(row)]).quantize(Decimal(1).scaleb(-places))
+            return result
+
+        if name == 'id':
+            return select(self.ids)
+        if name == 'symbol':
+            return [self.symbols[code] for code in select(self.symbol_codes)]
+        if name == 'name':
+            return [self.names[code] for code in select(self.name_codes)]
+        if name == 'asset_type':
+            return [ASSET_TYPES[code] for code in select(self.type_codes)]
+        if name == 'purchase_date':
+            return [date.fromordinal(ordinal) for ordinal in select(self.purchase_ordinal)]
+        if name in FLOAT_COLUMNS:
+            return decimals(select(getattr(self, name)), PLACES[name])
+        if name in COMPUTED_COLUMNS:
+            return select(getattr(self, name))
+        raise KeyError(name)
+
+    def take(self, indexes: Sequence[int]) -> 'PortfolioFrame':
+        """Sous-ensemble de lignes (tables de chaînes partagées)"""
+        indexes = np.asarray(indexes, dtype=np.int64)
+        exact = {}
+        for name, overrides in self.exact.items():
+            kept = {position: overrides[row] for position, row in enumerate(indexes.tolist()) if row in overrides}
+            if kept:
+                exact[name] = kept
+        return PortfolioFrame(
+            self.ids[indexes], self.type_codes[indexes], self.symbol_codes[indexes], self.name_codes[indexes],
+            self.quantity[indexes], self.purchase_price[indexes], self.current_price[indexes],
+            self.purchase_ordinal[indexes], self.symbols, self.names, exact
+        )
+
+    def rows(self, indexes: Optional[Iterable[int]] = None) -> Iterator[FrameRow]:
+        """Lignes du frame (toutes, ou celles des indices donnés)"""
+        symbols, names = self.symbols, self.names
+        quantity, purchase, current = self.quantity.tolist(), self.purchase_price.tolist(), self.current_price.tolist()
+        ids, types = self.ids.tolist(), self.type_codes.tolist()
+        symbol_codes, name_codes = self.symbol_codes.tolist(), self.name_codes.tolist()
+        ordinals = self.purchase_ordinal.tolist()
+        for index in (range(len(self)) if indexes is None else indexes):
+            yield FrameRow(
+                ids[index], ASSET_TYPES[types[index]], symbols[symbol_codes[index]], names[name_codes[index]],
+                quantity[index], purchase[index], current[index], date.fromordinal(ordinals[index])
+            )
+
+    def nbytes(self) -> int:
+        """Mémoire des colonnes numériques (octets)"""
+        return sum(column.nbytes for column in (
+            self.ids, self.type_codes, self.symbol_codes, self.name_codes,
+            self.quantity, self.purchase_price, self.current_price, self.purchase_ordinal
+        ))
@@ -3,9 +3,11 @@ Interfaces pour implémenter les Design Patterns (Strategy, Repository)
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from decimal import Decimal
 
+import numpy as np
+
 
 class IPerformanceCalculator(ABC):
     """Interface Strategy Pattern pour les calculs de performance"""
@@ -15,6 +17,13 @@ class IPerformanceCalculator(ABC):
         """Calculer la performance d'un actif"""
         pass
 
+    def calculate_many(self, frame: 'PortfolioFrame') -> np.ndarray:
+        """
+        Calculer la performance de toutes les lignes d'un PortfolioFrame
+        (par défaut ligne par ligne ; les implémentations vectorisent)
+        """
+        return np.fromiter((self.calculate(row) for row in frame.rows()), dtype=np.float64, count=len(frame))
+
 
 class IAssetRepository(ABC):
     """Interface Repository Pattern pour l'accès aux données Asset"""
@@ -25,7 +34,7 @@ class IAssetRepository(ABC):
         pass
 
     @abstractmethod
-    def find_all_by_user(self, user_id: int) -> List['Asset']:
+    def find_all_by_user(self, user_id: int, fields: Optional[List[str]] = None) -> List['Asset']:
         """Récupérer tous les actifs d'un utilisateur"""
         pass
 
@@ -35,15 +44,51 @@ class IAssetRepository(ABC):
         pass
 
     @abstractmethod
-    def update(self, asset_id: int, asset_data: Dict[str, Any]) -> 'Asset':
-        """Mettre à jour un actif"""
+    def update(
+        self,
+        asset_id: int,
+        asset_data: Dict[str, Any],
+        user_id: Optional[int] = None,
+        expected_version: Optional[int] = None
+    ) -> 'Asset':
+        """Mettre à jour les champs donnés d'un actif (UPDATE conditionnel sur le propriétaire et la version)"""
+        pass
+
+    @abstractmethod
+    def delete(self, asset_id: int, user_id: Optional[int] = None) -> bool:
+        """Supprimer un actif (avec user_id : une requête, ownership vérifiée par le DELETE)"""
+        pass
+
+    @abstractmethod
+    def find_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> Dict[int, 'Asset']:
+        """Trouver plusieurs actifs d'un utilisateur en une requête"""
+        pass
+
+    @abstractmethod
+    def bulk_create(self, assets: List['Asset'], batch_size: int = 500) -> List['Asset']:
+        """Créer plusieurs actifs en lot"""
+        pass
+
+    @abstractmethod
+    def bulk_update(self, assets: List['Asset'], fields: Iterable[str], batch_size: int = 500) -> int:
+        """Mettre à jour plusieurs actifs en lot"""
         pass
 
     @abstractmethod
-    def delete(self, asset_id: int) -> bool:
-        """Supprimer un actif"""
+    def delete_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> int:
+        """Supprimer plusieurs actifs d'un utilisateur en une requête"""
         pass
 
+    @abstractmethod
+    def find_history_by_user(self, user_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Historique des lots d'un utilisateur, archives comprises"""
+        pass
+
+    def find_frame_by_user(self, user_id: int) -> 'PortfolioFrame':
+        """Charger les actifs d'un utilisateur en colonnes (par défaut depuis find_all_by_user)"""
+        from .frame import PortfolioFrame
+        return PortfolioFrame.from_assets(self.find_all_by_user(user_id))
+
     @abstractmethod
     def sum_by_type(self, user_id: int) -> Dict[str, Decimal]:
         """Obtenir la somme des actifs par type pour un utilisateur"""
@@ -0,0 +1,255 @@
+"""
+Job Queue - File d'attente locale (base de données) pour les calculs lourds
+Aucun broker externe : la table Job sert de file, compatible SQLite.
+"""
+
+import inspect
+import logging
+from datetime import timedelta
+from typing import Dict, Callable, Any, Optional
+
+from django.db.models import Subquery
+from django.utils import timezone
+
+from ..models import Job
+from .calculators import SimpleROICalculator
+from .interfaces import IAssetRepository
+from .portfolio_service import PortfolioService
+from .projection import ProjectionService
+from .rebalancing import RebalancingService
+from .repositories import DjangoAssetRepository
+
+logger = logging.getLogger(__name__)
+
+# Types JSON acceptés pour chaque annotation de paramètre de handler
+PARAM_TYPES = {int: (int,), float: (int, float), str: (str,), bool: (bool,)}
+
+
+class JobService:
+    """
+    Service de gestion des tâches asynchrones.
+    Les handlers sont enregistrés par type de tâche (même principe que AssetFactory).
+    """
+
+    _handlers: Dict[str, Callable] = {}
+
+    def __init__(self, asset_repository: IAssetRepository = None):
+        """
+        Initialiser le service avec ses dépendances
+
+        Args:
+            asset_repository: Repository utilisé par les handlers (par défaut DjangoAssetRepository)
+        """
+        self.asset_repository = asset_repository or DjangoAssetRepository()
+
+    @classmethod
+    def register(cls, kind: str, handler: Callable) -> None:
+        """
+        Enregistrer un handler pour un type de tâche
+
+        Args:
+            kind: Type de tâche (ex: portfolio_performance)
+            handler: Fonction (service, user_id, **params) -> résultat sérialisable en JSON
+        """
+        cls._handlers[kind] = handler
+
+    @classmethod
+    def get_available_kinds(cls) -> list:
+        """Retourner les types de tâches disponibles"""
+        return list(cls._handlers.keys())
+
+    @classmethod
+    def validate_params(cls, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vérifier les paramètres d'une tâche d'après la signature de son handler
+
+        Args:
+            kind: Type de tâche enregistré
+            params: Paramètres fournis par le client
+
+        Returns:
+            Paramètres validés
+
+        Raises:
+            ValueError: Paramètre inconnu ou de type incorrect
+        """
+        # (service, user_id, **params) : les deux premiers sont fournis par run()
+        accepted = list(inspect.signature(cls._handlers[kind]).parameters.values())[2:]
+        accepted = {parameter.name: parameter for parameter in accepted}
+        unknown = sorted(set(params) - set(accepted))
+        if unknown:
+            allowed = ', '.join(accepted) or 'aucun'
+            raise ValueError(f"Paramètre(s) inconnu(s) : {', '.join(unknown)} (acceptés : {allowed})")
+        for name, value in params.items():
+            parameter = accepted[name]
+            types = PARAM_TYPES.get(parameter.annotation)
+            if value is None and parameter.default is None:
+                continue
+            # bool est un int en Python : refusé pour les paramètres numériques
+            if types and (not isinstance(value, types) or (isinstance(value, bool) and bool not in types)):
+                raise ValueError(f"Paramètre '{name}' : {parameter.annotation.__name__} attendu")
+        return params
+
+    def enqueue(self, user_id: int, kind: str, params: Dict[str, Any] = None) -> Job:
+        """
+        Ajouter une tâche dans la file
+
+        Args:
+            user_id: ID de l'utilisateur propriétaire
+            kind: Type de tâche
+            params: Paramètres passés au handler
+
+        Returns:
+            Job créé (statut PENDING)
+
+        Raises:
+            ValueError: Si le type de tâche n'est pas enregistré ou ses paramètres invalides
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Type de tâche '{kind}' non enregistré")
+        params = self.validate_params(kind, params or {})
+        return Job.objects.create(user_id=user_id, kind=kind, params=params)
+
+    def get_job(self, user_id: int, job_id: int) -> Job:
+        """
+        Récupérer une tâche de l'utilisateur
+
+        Raises:
+            Job.DoesNotExist
+        """
+        return Job.objects.get(id=job_id, user_id=user_id)
+
+    def claim_next(self, worker: str) -> Optional[Job]:
+        """
+        Réserver la prochaine tâche en attente
+
+        La réservation est un unique UPDATE conditionnel
+        (WHERE id = <plus ancienne tâche PENDING> AND status = PENDING) :
+        un seul worker peut le réussir, sans verrou applicatif ni transaction
+        longue, ce qui fonctionne aussi sous SQLite. Un worker ne traitant
+        qu'une tâche à la fois, son identifiant suffit à retrouver la ligne.
+
+        Args:
+            worker: Identifiant du worker
+
+        Returns:
+            Job réservé (statut RUNNING) ou None si la file est vide
+        """
+        pending = Job.objects.filter(status=Job.Status.PENDING).order_by('created_at', 'id')
+        while pending.exists():
+            claimed = Job.objects.filter(
+                id=Subquery(pending.values('id')[:1]),
+                status=Job.Status.PENDING
+            ).update(
+                status=Job.Status.RUNNING,
+                worker=worker,
+                started_at=timezone.now(),
+            )
+            if claimed:
+                return Job.objects.filter(status=Job.Status.RUNNING, worker=worker).latest('started_at')
+        return None
+
+    def run(self, job: Job) -> Job:
+        """
+        Exécuter une tâche réservée et enregistrer son résultat
+
+        Args:
+            job: Job au statut RUNNING
+
+        Returns:
+            Job terminé (SUCCEEDED ou FAILED)
+
+        L'erreur enregistrée (visible du client) se limite à la classe de
+        l'exception et, pour une ValueError (paramètre refusé par le
+        service), à son message ; la trace complète part dans les logs.
+        """
+        service = PortfolioService(
+            asset_repository=self.asset_repository,
+            calculator=SimpleROICalculator()
+        )
+        try:
+            handler = self._handlers[job.kind]
+            job.result = handler(service, job.user_id, **job.params)
+            job.status = Job.Status.SUCCEEDED
+        except Exception as exc:
+            logger.exception("Tâche %s (%s) en échec", job.id, job.kind)
+            detail = str(exc) if isinstance(exc, ValueError) else "erreur interne lors de l'exécution"
+            job.error = f"{type(exc).__name__}: {detail}"[:500]
+            job.status = Job.Status.FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['result', 'error', 'status', 'finished_at'])
+        return job
+
+    def run_next(self, worker: str) -> Optional[Job]:
+        """Réserver puis exécuter la prochaine tâche, None si la file est vide"""
+        job = self.claim_next(worker)
+        if job is None:
+            return None
+        return self.run(job)
+
+    def requeue_stale(self, timeout: timedelta) -> int:
+        """
+        Remettre en attente les tâches RUNNING abandonnées (worker arrêté)
+
+        Args:
+            timeout: Durée au-delà de laquelle une tâche RUNNING est considérée abandonnée
+
+        Returns:
+            Nombre de tâches remises en attente
+        """
+        return Job.objects.filter(
+            status=Job.Status.RUNNING,
+            started_at__lt=timezone.now() - timeout
+        ).update(status=Job.Status.PENDING, worker='', started_at=None)
+
+
+# Handlers par défaut
+def portfolio_summary_job(service: PortfolioService, user_id: int) -> Dict[str, Any]:
+    """Calculer le résumé du portefeuille"""
+    return service.get_portfolio_summary(user_id)
+
+
+def portfolio_performance_job(service: PortfolioService, user_id: int) -> Dict[str, Any]:
+    """Calculer la performance du portefeuille"""
+    return service.get_portfolio_performance(user_id)
+
+
+def asset_export_job(service: PortfolioService, user_id: int) -> Dict[str, Any]:
+    """Exporter tous les actifs de l'utilisateur"""
+    assets = [
+        {
+            'id': asset.id,
+            'asset_type': asset.asset_type,
+            'symbol': asset.symbol,
+            'name': asset.name,
+            'quantity': str(asset.quantity),
+            'purchase_price': str(asset.purchase_price),
+            'current_price': str(asset.current_price),
+            'purchase_date': asset.purchase_date,
+            'current_value': asset.current_value,
+        }
+        for asset in service.get_user_assets(user_id)
+    ]
+    return {'count': len(assets), 'assets': assets}
+
+
+def portfolio_rebalance_job(service: PortfolioService, user_id: int,
+                            tolerance: float = 0.0, min_trade_value: float = 0.0) -> Dict[str, Any]:
+    """Calculer les ordres de rééquilibrage vers l'allocation cible"""
+    return RebalancingService(tolerance, min_trade_value).rebalance_user(user_id)
+
+
+def portfolio_projection_job(service: PortfolioService, user_id: int, horizon_years: int = 10,
+                             paths: int = 100000, seed: int = None) -> Dict[str, Any]:
+    """Projeter la valeur future du portefeuille (Monte Carlo)"""
+    return ProjectionService(asset_repository=service.asset_repository).project(
+        user_id, horizon_years=horizon_years, paths=paths, seed=seed
+    )
+
+
+# Enregistrer les handlers
+JobService.register('portfolio_summary', portfolio_summary_job)
+JobService.register('portfolio_performance', portfolio_performance_job)
+JobService.register('asset_export', asset_export_job)
+JobService.register('portfolio_rebalance', portfolio_rebalance_job)
+JobService.register('portfolio_projection', portfolio_projection_job)
@@ -0,0 +1,316 @@
+"""
+Load Test - Mesure du débit du chemin de requête complet
+
+Des utilisateurs synthétiques s'authentifient via /api/auth/login/, puis un
+pool de threads envoie un mélange pondéré de requêtes (liste, résumé,
+performance, création) à l'application, soit en processus (handler WSGI de
+Django, middlewares compris), soit à un serveur local via HTTP. Le rapport
+donne le débit et les latences p50/p95/p99 par endpoint.
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+
+LOGIN_URL = '/api/auth/login/'
+REGISTER_URL = '/api/auth/register/'
+DEFAULT_MIX = 'list=5,summary=2,performance=2,create=1'
+
+
+class InProcessTransport:
+    """Requêtes traitées dans le processus par le client de test Django (WSGI)"""
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client(raise_request_exception=False, SERVER_NAME=self.server_name())
+
+    @staticmethod
+    def server_name() -> str:
+        # Premier hôte explicite d'ALLOWED_HOSTS ; localhost est accepté en DEBUG
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+        return hosts[0] if hosts else 'localhost'
+
+    def request(self, method: str, path: str, body: Optional[Dict] = None,
+                token: Optional[str] = None) -> Tuple[int, bytes]:
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        data = json.dumps(body) if body is not None else None
+        response = self.client.generic(method, path, data or '', content_type='application/json', **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, content
+
+    def close(self) -> None:
+        # Chaque thread ouvre ses propres connexions à la base
+        connections.close_all()
+
+
+class HttpTransport:
+    """Requêtes envoyées à un serveur (runserver, gunicorn, uvicorn...)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body: Optional[Dict] = None,
+                token: Optional[str] = None) -> Tuple[int, bytes]:
+        headers = {'Content-Type': 'application/json', 'Accept-Encoding': 'identity'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Requête d'un scénario ; `body` produit le corps à partir d'une clé (symbole, date d'achat) unique"""
+    method: str
+    path: str
+    body: Optional[Callable[[str, date], Dict]] = None
+
+
+BASE36 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Dates d'achat des actifs créés : une par requête d'un thread à partir de cette date
+FIRST_PURCHASE_DATE = date(1970, 1, 1)
+
+
+def to_base36(number: int) -> str:
+    digits = ''
+    while True:
+        number, digit = divmod(number, 36)
+        digits = BASE36[digit] + digits
+        if not number:
+            return digits
+
+
+def asset_payload(symbol: str, purchase_date: date) -> Dict:
+    return {
+        'asset_type': 'STOCK',
+        'symbol': symbol,
+        'name': f'Actif de charge {symbol} {purchase_date.isoformat()}',
+        'quantity': '10',
+        'purchase_price': '100.00',
+        'current_price': '105.00',
+        'purchase_date': purchase_date.isoformat(),
+    }
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    'list': Endpoint('GET', '/api/portfolio/assets/'),
+    'summary': Endpoint('GET', '/api/portfolio/assets/summary/'),
+    'performance': Endpoint('GET', '/api/portfolio/assets/performance/'),
+    'create': Endpoint('POST', '/api/portfolio/assets/', asset_payload),
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Lire un mélange pondéré "list=5,summary=2,create=1"
+
+    Raises:
+        ValueError: Endpoint inconnu ou poids invalide
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, weight = item.partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Endpoint '{name}' inconnu (disponibles : {', '.join(ENDPOINTS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Poids invalide pour '{name}' : {weight}")
+        if mix[name] < 0:
+            raise ValueError(f"Poids négatif pour '{name}'")
+    if not mix or not sum(mix.values()):
+        raise ValueError("Le mélange de requêtes est vide")
+    return mix
+
+
+def authenticate(transport, username: str, password: str) -> str:
+    """
+    Obtenir un access token, en créant le compte s'il n'existe pas
+
+    Raises:
+        RuntimeError: Si l'authentification échoue
+    """
+    credentials = {'username': username, 'password': password}
+    status, content = transport.request('POST', LOGIN_URL, credentials)
+    if status == 401:
+        transport.request('POST', REGISTER_URL, {**credentials, 'email': f'{username}@loadtest.local'})
+        status, content = transport.request('POST', LOGIN_URL, credentials)
+    if status != 200:
+        raise RuntimeError(f"Authentification impossible pour {username} ({status}) : {content[:200]!r}")
+    return json.loads(content)['access']
+
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict:
+    if not latencies:
+        return {'requests': 0, 'requests_per_second': 0.0}
+    milliseconds = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+    return {
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(float(milliseconds.mean()), 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(milliseconds.max()), 2),
+    }
+
+
+class LoadTest:
+    """
+    Générateur de charge : un pool de threads, un transport par thread.
+
+    Chaque thread utilise le token d'un utilisateur synthétique (attribution
+    circulaire) et tire ses requêtes selon le mélange pondéré, jusqu'à la
+    durée ou au nombre total de requêtes demandé.
+
+    Les actifs créés ont pour clé d'unicité (symbole, date d'achat) :
+    symbole « L » + marqueur aléatoire du run + numéro du thread (10
+    caractères au plus, comme Asset.symbol), date qui avance d'un jour par
+    requête. Un run suivant sans --cleanup ne heurte donc pas les actifs
+    restés en base.
+    """
+
+    NONCE_LENGTH = 4
+
+    def __init__(self, transport_factory: Callable, mix: Dict[str, float], users: int = 10,
+                 concurrency: int = 8, password: str = 'LoadTest-2024!', prefix: str = 'loadtest',
+                 seed: Optional[int] = None):
+        """
+        Args:
+            transport_factory: Crée un transport (InProcessTransport, HttpTransport...)
+            mix: Poids par endpoint (voir parse_mix)
+            users: Nombre d'utilisateurs synthétiques
+            concurrency: Nombre de threads clients
+            password: Mot de passe des utilisateurs synthétiques
+            prefix: Préfixe de leurs noms d'utilisateur
+            seed: Graine du tirage des requêtes (séquences reproductibles)
+        """
+        self.transport_factory = transport_factory
+        self.mix = mix
+        self.users = users
+        self.concurrency = concurrency
+        self.password = password
+        self.prefix = prefix
+        self.seed = seed
+        self.tokens: List[str] = []
+        # Indépendant de la graine : deux runs reproductibles ne créent pas les mêmes actifs
+        self.nonce = ''.join(random.SystemRandom().choice(BASE36) for _ in range(self.NONCE_LENGTH))
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def authenticate_users(self) -> List[str]:
+        transport = self.transport_factory()
+        try:
+            self.tokens = [
+                authenticate(transport, f'{self.prefix}_{index}', self.password)
+                for index in range(self.users)
+            ]
+        finally:
+            transport.close()
+        return self.tokens
+
+    def _take(self, limit: Optional[int]) -> bool:
+        if limit is None:
+            return True
+        with self._lock:
+            if self._issued >= limit:
+                return False
+            self._issued += 1
+            return True
+
+    def _worker(self, index: int, deadline: float, limit: Optional[int]) -> List[Tuple[str, float, int]]:
+        transport = self.transport_factory()
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        names, weights = list(self.mix), list(self.mix.values())
+        token = self.tokens[index % len(self.tokens)]
+        samples = []
+        sequence = 0
+        try:
+            while time.monotonic() < deadline and self._take(limit):
+                name = rng.choices(names, weights)[0]
+                endpoint = ENDPOINTS[name]
+                body = endpoint.body(
+                    f'L{self.nonce}{to_base36(index)}', FIRST_PURCHASE_DATE + timedelta(days=sequence)
+                ) if endpoint.body else None
+                sequence += 1
+                started = time.perf_counter()
+                try:
+                    status, _ = transport.request(endpoint.method, endpoint.path, body, token)
+                except OSError:
+                    status = 0
+                samples.append((name, time.perf_counter() - started, status))
+        finally:
+            transport.close()
+        return samples
+
+    def run(self, duration: Optional[float] = 10.0, requests: Optional[int] = None) -> Dict:
+        """
+        Lancer la charge
+
+        Args:
+            duration: Durée maximale (s), None pour ne limiter que par `requests`
+            requests: Nombre total de requêtes, None pour ne limiter que par `duration`
+
+        Returns:
+            Rapport : débit global et latences par endpoint
+        """
+        if duration is None and requests is None:
+            raise ValueError("Il faut une durée ou un nombre de requêtes")
+        if not self.tokens:
+            self.authenticate_users()
+
+        self._issued = 0
+        deadline = time.monotonic() + duration if duration is not None else float('inf')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._worker, index, deadline, requests) for index in range(self.concurrency)]
+            samples = [sample for future in futures for sample in future.result()]
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        return self.report(samples, elapsed)
+
+    def report(self, samples: List[Tuple[str, float, int]], elapsed: float) -> Dict:
+        endpoints = {}
+        status_codes: Dict[str, int] = {}
+        for name in self.mix:
+            selected = [sample for sample in samples if sample[0] == name]
+            entry = latency_summary([latency for _, latency, _ in selected], elapsed)
+            entry['errors'] = sum(1 for _, _, status in selected if not 200 <= status < 300)
+            endpoints[name] = entry
+        for _, _, status in samples:
+            status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+
+        total = latency_summary([latency for _, latency, _ in samples], elapsed)
+        total['errors'] = sum(entry['errors'] for entry in endpoints.values())
+        return {
+            'config': {
+                'users': self.users,
+                'concurrency': self.concurrency,
+                'mix': self.mix,
+                'seed': self.seed,
+            },
+            'elapsed_s': round(elapsed, 3),
+            'total': total,
+            'endpoints': endpoints,
+            'status_codes': status_codes,
+        }
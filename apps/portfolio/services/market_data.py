@@ -0,0 +1,311 @@
+"""
+Market Data - Ingestion asynchrone des prix de marché
+
+Les ticks (symbole, prix) sont lus depuis une source interchangeable
+(fichier suivi en continu, socket UNIX, socket TCP), regroupés par symbole
+sur une fenêtre de temps (seul le dernier prix compte), puis écrits en un
+UPDATE groupé par fenêtre pour toutes les lignes Asset concernées.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db.models import Case, DecimalField, Value, When
+from django.utils import timezone
+
+from ..models import Asset
+from ..signals import prices_updated
+
+PRICE_QUANTUM = Decimal('0.01')
+
+
+def parse_tick(line: str) -> Optional[Tuple[str, Decimal]]:
+    """
+    Lire un tick : "AAPL 189.5", "AAPL,189.5" ou {"symbol": "AAPL", "price": 189.5}
+
+    Returns:
+        (symbole, prix) ou None si la ligne est invalide
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            data = json.loads(line)
+            symbol, price = data['symbol'], data['price']
+        else:
+            symbol, price = line.replace(',', ' ').split()[:2]
+        price = Decimal(str(price)).quantize(PRICE_QUANTUM)
+    except (ValueError, KeyError, TypeError, InvalidOperation):
+        return None
+    if price <= 0 or not symbol:
+        return None
+    return symbol.upper(), price
+
+
+# Sources de ticks : des itérateurs asynchrones de lignes
+async def file_source(path: str, from_start: bool = False, follow: bool = True,
+                      poll_interval: float = 0.05) -> AsyncIterator[str]:
+    """
+    Suivre un fichier (équivalent de `tail -f`)
+
+    Args:
+        path: Chemin du fichier
+        from_start: Lire depuis le début plutôt que depuis la fin
+        follow: Continuer à attendre de nouvelles lignes en fin de fichier
+        poll_interval: Attente (s) entre deux lectures en fin de fichier
+    """
+    with open(path, 'r') as handle:
+        if not from_start:
+            handle.seek(0, 2)
+        buffer = ''
+        while True:
+            chunk = handle.readline()
+            if chunk:
+                buffer += chunk
+                if buffer.endswith('\n'):
+                    yield buffer
+                    buffer = ''
+                continue
+            if not follow:
+                if buffer:
+                    yield buffer
+                return
+            await asyncio.sleep(poll_interval)
+
+
+async def _server_source(start_server: Callable, max_buffer: int) -> AsyncIterator[str]:
+    """Accepter des connexions et produire leurs lignes (file bornée = backpressure)"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+
+    async def handle(reader, writer):
+        try:
+            async for line in reader:
+                # Bloque la lecture du socket tant que la file est pleine
+                await queue.put(line.decode(errors='replace'))
+        finally:
+            writer.close()
+
+    server = await start_server(handle)
+    async with server:
+        while True:
+            yield await queue.get()
+
+
+def unix_socket_source(path: str, max_buffer: int = 10000) -> AsyncIterator[str]:
+    """Recevoir des ticks sur un socket UNIX"""
+    return _server_source(partial(asyncio.start_unix_server, path=path), max_buffer)
+
+
+def tcp_source(address: str, max_buffer: int = 10000) -> AsyncIterator[str]:
+    """Recevoir des ticks sur un socket TCP (host:port)"""
+    host, _, port = address.rpartition(':')
+    return _server_source(partial(asyncio.start_server, host=host or '127.0.0.1', port=int(port)), max_buffer)
+
+
+TICK_SOURCES: Dict[str, Callable] = {
+    'file': file_source,
+    'unix': unix_socket_source,
+    'tcp': tcp_source,
+}
+
+
+def open_source(spec: str, **options) -> AsyncIterator[str]:
+    """
+    Ouvrir une source à partir de sa description "type:adresse"
+    (file:/var/ticks.log, unix:/tmp/ticks.sock, tcp:127.0.0.1:9000)
+
+    Raises:
+        ValueError: Si le type de source n'est pas enregistré
+    """
+    kind, _, address = spec.partition(':')
+    source = TICK_SOURCES.get(kind)
+    if source is None or not address:
+        raise ValueError(f"Source de ticks '{spec}' invalide (types : {', '.join(TICK_SOURCES)})")
+    if kind == 'file':
+        return source(address, **options)
+    return source(address)
+
+
+class DjangoPriceWriter:
+    """
+    Écriture des prix : un seul UPDATE ... CASE par lot de symboles
+
+    Asset.version n'est pas incrémentée : elle sert au verrouillage optimiste
+    des écritures clientes, qu'un tick ne doit pas invalider. Les lecteurs
+    sont prévenus par la version du portefeuille (signal prices_updated).
+    """
+
+    # Chaque symbole consomme 3 paramètres SQL (WHEN, THEN, IN) : on reste
+    # sous la limite de paramètres de SQLite pour les très grosses fenêtres.
+    MAX_SYMBOLS_PER_STATEMENT = 300
+
+    def write(self, prices: Dict[str, Decimal]) -> int:
+        """
+        Mettre à jour current_price de tous les actifs des symboles donnés
+
+        Args:
+            prices: Dict symbole -> prix
+
+        Returns:
+            Nombre de lignes Asset mises à jour
+        """
+        symbols = list(prices)
+        now = timezone.now()
+        updated = 0
+        for start in range(0, len(symbols), self.MAX_SYMBOLS_PER_STATEMENT):
+            chunk = symbols[start:start + self.MAX_SYMBOLS_PER_STATEMENT]
+            updated += Asset.objects.filter(symbol__in=chunk).update(
+                current_price=Case(
+                    *[When(symbol=symbol, then=Value(prices[symbol])) for symbol in chunk],
+                    output_field=DecimalField(max_digits=18, decimal_places=2)
+                ),
+                updated_at=now
+            )
+        if updated:
+            prices_updated.send(sender=Asset, prices=prices)
+        return updated
+
+
+class IngestionStats:
+    """Compteurs de débit et de latence de l'ingestion"""
+
+    def __init__(self, sample_size: int = 1000):
+        self.started = time.monotonic()
+        self.received = 0
+        self.invalid = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.symbols_written = 0
+        self.rows_updated = 0
+        self.backpressure_waits = 0
+        self.flush_latencies = deque(maxlen=sample_size)
+        self.tick_latencies = deque(maxlen=sample_size)
+
+    @staticmethod
+    def _percentile(values, percentile: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+    def as_dict(self) -> Dict:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'ticks_received': self.received,
+            'ticks_invalid': self.invalid,
+            'ticks_coalesced': self.coalesced,
+            'ticks_per_second': round(self.received / elapsed, 1),
+            'flushes': self.flushes,
+            'symbols_written': self.symbols_written,
+            'rows_updated': self.rows_updated,
+            'backpressure_waits': self.backpressure_waits,
+            'flush_latency_ms_p50': round(self._percentile(self.flush_latencies, 0.5) * 1000, 2),
+            'flush_latency_ms_p99': round(self._percentile(self.flush_latencies, 0.99) * 1000, 2),
+            'tick_latency_ms_p50': round(self._percentile(self.tick_latencies, 0.5) * 1000, 2),
+            'tick_latency_ms_p99': round(self._percentile(self.tick_latencies, 0.99) * 1000, 2),
+        }
+
+
+class PriceIngestor:
+    """
+    Boucle d'ingestion : coalescence par symbole et écritures par fenêtre.
+
+    La mémoire est bornée par le nombre de symboles distincts en attente :
+    au-delà de max_pending, la lecture de la source est suspendue jusqu'à
+    la prochaine écriture (backpressure).
+    """
+
+    def __init__(self, writer=None, window: float = 0.5, max_pending: int = 50000):
+        """
+        Args:
+            writer: Objet exposant write(prices) -> lignes mises à jour (par défaut DjangoPriceWriter)
+            window: Durée (s) de la fenêtre de coalescence
+            max_pending: Nombre maximal de symboles en attente d'écriture
+        """
+        self.writer = writer or DjangoPriceWriter()
+        self.window = window
+        self.max_pending = max_pending
+        self.stats = IngestionStats()
+        self.pending: Dict[str, Decimal] = {}
+        self._window_started: Optional[float] = None
+        self._space = asyncio.Event()
+        self._space.set()
+        self._write = sync_to_async(self.writer.write, thread_sensitive=True)
+
+    async def offer(self, symbol: str, price: Decimal) -> None:
+        """Ajouter un tick à la fenêtre courante"""
+        pending = self.pending
+        if symbol in pending:
+            self.stats.coalesced += 1
+        elif len(pending) >= self.max_pending:
+            self.stats.backpressure_waits += 1
+            self._space.clear()
+            await self._space.wait()
+            pending = self.pending
+        if self._window_started is None:
+            self._window_started = time.monotonic()
+        pending[symbol] = price
+        self.stats.received += 1
+
+    async def flush(self) -> int:
+        """Écrire la fenêtre courante, retourne le nombre de lignes mises à jour"""
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, {}
+        window_started, self._window_started = self._window_started, None
+        self._space.set()
+
+        started = time.monotonic()
+        rows = await self._write(batch)
+        finished = time.monotonic()
+
+        self.stats.flushes += 1
+        self.stats.symbols_written += len(batch)
+        self.stats.rows_updated += rows
+        self.stats.flush_latencies.append(finished - started)
+        self.stats.tick_latencies.append(finished - window_started)
+        return rows
+
+    async def _flush_loop(self, stop: asyncio.Event) -> None:
+        # Arrêt coopératif : une écriture en cours n'est jamais interrompue
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+        await self.flush()
+
+    async def run(self, source: AsyncIterator[str], duration: Optional[float] = None) -> IngestionStats:
+        """
+        Consommer la source jusqu'à son épuisement (ou pendant `duration` secondes)
+
+        Returns:
+            Statistiques de l'ingestion
+        """
+        stop = asyncio.Event()
+        flusher = asyncio.create_task(self._flush_loop(stop))
+        try:
+            await asyncio.wait_for(self._consume(source), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            stop.set()
+            await flusher
+        return self.stats
+
+    async def _consume(self, source: AsyncIterator[str]) -> None:
+        async for line in source:
+            tick = parse_tick(line)
+            if tick is None:
+                self.stats.invalid += 1
+                continue
+            await self.offer(*tick)
@@ -3,10 +3,16 @@ Portfolio Service - Logique métier pour la gestion du portefeuille
 Utilise Dependency Injection pour les dépendances
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from decimal import Decimal
+import numpy as np
+from django.db import IntegrityError
 from .interfaces import IAssetRepository, IPerformanceCalculator
 from .calculators import SimpleROICalculator
+from .frame import ASSET_TYPE_LABELS, ASSET_TYPES, PortfolioFrame
+from .repositories import AssetVersionConflict
+from .unit_of_work import UnitOfWork
+from ..instrumentation import track_queries
 from ..models import Asset
 
 
@@ -16,6 +22,20 @@ class PortfolioService:
     Implémente la Dependency Injection pour faciliter les tests.
     """
 
+    # Clés disponibles pour les réponses partielles (?fields= / ?exclude=)
+    SUMMARY_FIELDS = (
+        'total_current_value',
+        'total_purchase_value',
+        'total_gain_loss',
+        'overall_performance_percentage',
+        'asset_count',
+        'by_type',
+    )
+    SUMMARY_TOTAL_FIELDS = frozenset(SUMMARY_FIELDS[:4])
+    SUMMARY_ASSET_FIELDS = ('id', 'symbol', 'name', 'quantity', 'current_price', 'current_value')
+    PERFORMANCE_FIELDS = ('total_assets', 'average_performance', 'best_performer', 'worst_performer', 'assets')
+    PERFORMANCE_ASSET_FIELDS = ('symbol', 'name', 'performance', 'gain_loss')
+
     def __init__(
         self,
         asset_repository: IAssetRepository,
@@ -43,6 +63,7 @@ class PortfolioService:
         """
         return self.asset_repository.find_all_by_user(user_id)
 
+    @track_queries(1)
     def get_asset_detail(self, user_id: int, asset_id: int) -> Asset:
         """
         Récupérer les détails d'un actif
@@ -62,6 +83,7 @@ class PortfolioService:
             raise Asset.DoesNotExist("Actif non trouvé")
         return asset
 
+    @track_queries(2)
     def create_asset(self, user_id: int, asset_data: Dict[str, Any]) -> Asset:
         """
         Créer un nouvel actif
@@ -75,33 +97,45 @@ class PortfolioService:
         """
         return self.asset_repository.create(user_id, asset_data)
 
+    @track_queries(3)
     def update_asset(
         self,
         user_id: int,
         asset_id: int,
-        asset_data: Dict[str, Any]
+        asset_data: Dict[str, Any],
+        expected_version: Optional[int] = None
     ) -> Asset:
         """
-        Mettre à jour un actif
+        Mettre à jour les champs modifiés d'un actif
+        
+        L'ownership et la version sont vérifiés par l'UPDATE lui-même
+        (aucune lecture préalable).
         
         Args:
             user_id: ID de l'utilisateur (vérification ownership)
             asset_id: ID de l'actif
-            asset_data: Données à mettre à jour
+            asset_data: Champs modifiés
+            expected_version: Version lue par le client (None : pas de contrôle)
             
         Returns:
             Asset mis à jour
             
         Raises:
             Asset.DoesNotExist
+            AssetVersionConflict: Si l'actif a été modifié depuis expected_version
         """
-        asset = self.get_asset_detail(user_id, asset_id)
-        return self.asset_repository.update(asset_id, asset_data)
+        return self.asset_repository.update(
+            asset_id, asset_data, user_id=user_id, expected_version=expected_version
+        )
 
+    @track_queries(2)
     def delete_asset(self, user_id: int, asset_id: int) -> bool:
         """
         Supprimer un actif
         
+        L'ownership est vérifiée par le DELETE lui-même : aucune ligne
+        supprimée signifie actif introuvable (ou d'un autre utilisateur).
+        
         Args:
             user_id: ID de l'utilisateur (vérification ownership)
             asset_id: ID de l'actif à supprimer
@@ -112,99 +146,278 @@ class PortfolioService:
         Raises:
             Asset.DoesNotExist
         """
-        self.get_asset_detail(user_id, asset_id)
-        return self.asset_repository.delete(asset_id)
+        if not self.asset_repository.delete(asset_id, user_id=user_id):
+            raise Asset.DoesNotExist("Actif non trouvé")
+        return True
 
-    def get_portfolio_summary(self, user_id: int) -> Dict[str, Any]:
+    @track_queries()
+    def apply_batch(
+        self,
+        user_id: int,
+        operations: List[Dict[str, Any]],
+        atomic: bool = True
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Appliquer un lot d'opérations create/update/delete en une transaction
+        
+        Les cibles sont chargées en une requête (filtrée par utilisateur, ce qui
+        vérifie l'ownership), puis les écritures sont confiées à une UnitOfWork :
+        un DELETE filtré, un bulk_update des champs modifiés et un bulk_create.
+        Une mise à jour portant `version` est refusée (409) si l'actif chargé
+        a une autre version ; le bulk_update revérifie la version de chaque
+        ligne dans son WHERE (écriture concurrente après le chargement).
+        
+        Args:
+            user_id: ID de l'utilisateur (vérification ownership)
+            operations: Opérations validées {'op', 'id' (update/delete), 'data' (create/update)}
+            atomic: Si True, rien n'est appliqué dès qu'une opération échoue ; sinon
+                une écriture en échec (contrainte, version) est rejouée opération par
+                opération, chacune dans un savepoint
+            
+        Returns:
+            (résultats par opération, True si les écritures ont été appliquées)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+        target_ids = {operation['id'] for operation in operations if operation['op'] != 'create'}
+        targets = self.asset_repository.find_by_ids(user_id, target_ids) if target_ids else {}
+
+        unit = UnitOfWork(self.asset_repository)
+        creates, updates, deletes = [], [], []
+        seen = set()
+        for index, operation in enumerate(operations):
+            kind = operation['op']
+            if kind == 'create':
+                # Comme AssetCreateUpdateSerializer.create : un actif créé part de la version 1
+                data = {key: value for key, value in operation['data'].items() if key != 'version'}
+                asset = Asset(user_id=user_id, **data)
+                unit.register_new(asset)
+                creates.append((index, asset))
+                continue
+
+            asset = targets.get(operation['id'])
+            if asset is None:
+                results[index] = self._batch_result(operation, 404, errors="Actif non trouvé")
+            elif asset.id in seen:
+                results[index] = self._batch_result(
+                    operation, 400, errors="Un actif ne peut apparaître qu'une fois par lot"
+                )
+            elif kind == 'update':
+                seen.add(asset.id)
+                data = dict(operation['data'])
+                expected_version = data.pop('version', None)
+                if expected_version is not None and expected_version != asset.version:
+                    results[index] = self._version_conflict(operation, asset.version)
+                    continue
+                unit.register_clean(asset)
+                for key, value in data.items():
+                    setattr(asset, key, value)
+                unit.register_dirty(asset)
+                updates.append((index, asset))
+            else:
+                seen.add(asset.id)
+                unit.register_removed(asset)
+                deletes.append((index, asset))
+
+        pending = creates + updates + deletes
+        if atomic and any(results):
+            for index, _ in pending:
+                results[index] = self._batch_result(operations[index], 424, errors="Lot annulé")
+            return results, False
+
+        try:
+            unit.commit()
+        except (IntegrityError, AssetVersionConflict, Asset.DoesNotExist) as error:
+            if atomic:
+                # Rien n'est appliqué : l'opération en cause est signalée, les autres annulées
+                asset_id = getattr(error, 'asset_id', None)
+                for index, asset in pending:
+                    if isinstance(error, IntegrityError) or (asset_id is not None and asset.id == asset_id):
+                        results[index] = self._write_error(operations[index], error)
+                    else:
+                        results[index] = self._batch_result(operations[index], 424, errors="Lot annulé")
+                return results, False
+            # Non atomique : chaque écriture est rejouée dans son propre savepoint,
+            # l'échec n'est rapporté qu'à l'opération concernée
+            failures = {}
+            for asset, single in unit.split():
+                try:
+                    single.commit()
+                except (IntegrityError, AssetVersionConflict, Asset.DoesNotExist) as write_error:
+                    failures[id(asset)] = write_error
+            for index, asset in pending:
+                if id(asset) in failures:
+                    results[index] = self._write_error(operations[index], failures[id(asset)])
+
+        for status, done in ((201, creates), (200, updates), (204, deletes)):
+            for index, asset in done:
+                if results[index] is None:
+                    results[index] = self._batch_result(operations[index], status, asset=asset)
+        return results, True
+
+    @classmethod
+    def _write_error(cls, operation: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Résultat d'une opération dont l'écriture a échoué"""
+        if isinstance(error, AssetVersionConflict):
+            return cls._version_conflict(operation, error.current_version)
+        if isinstance(error, Asset.DoesNotExist):
+            return cls._batch_result(operation, 404, errors="Actif non trouvé")
+        return cls._batch_result(
+            operation, 409, errors="Conflit : un actif existe déjà pour ce symbole et cette date"
+        )
+
+    @classmethod
+    def _version_conflict(cls, operation: Dict[str, Any], current_version: int) -> Dict[str, Any]:
+        """Résultat 409 d'une mise à jour dont la version ne correspond plus"""
+        result = cls._batch_result(operation, 409, errors="L'actif a été modifié entre-temps")
+        result['current_version'] = current_version
+        return result
+
+    @staticmethod
+    def _batch_result(operation: Dict[str, Any], status: int, asset: Asset = None, errors: str = None) -> Dict[str, Any]:
+        """Construire le résultat d'une opération du lot"""
+        result = {
+            'op': operation['op'],
+            'id': asset.id if asset is not None else operation.get('id'),
+            'status': status,
+        }
+        if asset is not None and status != 204:
+            result['asset'] = asset
+        if errors is not None:
+            result['errors'] = errors
+        return result
+
+    @track_queries(1)
+    def get_portfolio_summary(
+        self,
+        user_id: int,
+        fields: Optional[Iterable[str]] = None,
+        asset_fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
         """
         Obtenir un résumé du portefeuille avec les totaux
         
         Args:
             user_id: ID de l'utilisateur
+            fields: Clés du résumé à calculer (toutes par défaut)
+            asset_fields: Champs des actifs listés dans by_type (tous par défaut)
             
         Returns:
             Dict contenant les informations du portefeuille
         """
-        assets = self.get_user_assets(user_id)
-        
-        total_current_value = sum(asset.current_value for asset in assets)
-        total_purchase_value = sum(asset.purchase_value for asset in assets)
-        total_gain_loss = total_current_value - total_purchase_value
-        
-        if total_purchase_value > 0:
-            overall_performance = (total_gain_loss / total_purchase_value) * 100
-        else:
-            overall_performance = 0.0
-
-        # Grouper par type d'actif
-        by_type = {}
-        for asset in assets:
-            asset_type = asset.get_asset_type_display()
-            if asset_type not in by_type:
-                by_type[asset_type] = {
-                    'count': 0,
-                    'value': 0.0,
-                    'assets': []
-                }
-            by_type[asset_type]['count'] += 1
-            by_type[asset_type]['value'] += asset.current_value
-            by_type[asset_type]['assets'].append({
-                'id': asset.id,
-                'symbol': asset.symbol,
-                'name': asset.name,
-                'quantity': str(asset.quantity),
-                'current_price': str(asset.current_price),
-                'current_value': asset.current_value,
+        fields = set(self.SUMMARY_FIELDS if fields is None else fields)
+        asset_fields = [
+            name for name in self.SUMMARY_ASSET_FIELDS
+            if asset_fields is None or name in set(asset_fields)
+        ]
+        # Une requête values_list, calculs sur les colonnes
+        frame = self.asset_repository.find_frame_by_user(user_id)
+        current_values = frame.current_value
+
+        summary = {}
+        if fields & self.SUMMARY_TOTAL_FIELDS:
+            total_current_value = float(current_values.sum())
+            total_purchase_value = float(frame.purchase_value.sum())
+            total_gain_loss = total_current_value - total_purchase_value
+            
+            if total_purchase_value > 0:
+                overall_performance = (total_gain_loss / total_purchase_value) * 100
+            else:
+                overall_performance = 0.0
+
+            summary.update({
+                'total_current_value': total_current_value,
+                'total_purchase_value': total_purchase_value,
+                'total_gain_loss': total_gain_loss,
+                'overall_performance_percentage': round(overall_performance, 2),
             })
+        if 'asset_count' in fields:
+            summary['asset_count'] = len(frame)
 
-        return {
-            'total_current_value': total_current_value,
-            'total_purchase_value': total_purchase_value,
-            'total_gain_loss': total_gain_loss,
-            'overall_performance_percentage': round(overall_performance, 2),
-            'asset_count': len(assets),
-            'by_type': by_type
-        }
+        if 'by_type' in fields:
+            # Grouper par type d'actif (dans l'ordre de première apparition)
+            counts = np.bincount(frame.type_codes, minlength=len(ASSET_TYPES))
+            values = np.bincount(frame.type_codes, weights=current_values, minlength=len(ASSET_TYPES))
+            by_type = {}
+            for code in frame.type_order():
+                by_type[ASSET_TYPE_LABELS[code]] = {
+                    'count': int(counts[code]),
+                    'value': float(values[code]),
+                    'assets': self._asset_entries(frame, np.flatnonzero(frame.type_codes == code), asset_fields)
+                }
+            summary['by_type'] = by_type
+
+        return {name: summary[name] for name in self.SUMMARY_FIELDS if name in fields}
 
-    def get_portfolio_performance(self, user_id: int) -> Dict[str, Any]:
+    @track_queries(1)
+    def get_portfolio_performance(
+        self,
+        user_id: int,
+        fields: Optional[Iterable[str]] = None,
+        asset_fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
         """
         Obtenir la performance globale du portefeuille
         
         Args:
             user_id: ID de l'utilisateur
+            fields: Clés de la réponse à calculer (toutes par défaut)
+            asset_fields: Champs de chaque entrée de performance (tous par défaut)
             
         Returns:
             Dict contenant les métriques de performance
         """
-        assets = self.get_user_assets(user_id)
+        fields = set(self.PERFORMANCE_FIELDS if fields is None else fields)
+        asset_fields = [
+            name for name in self.PERFORMANCE_ASSET_FIELDS
+            if asset_fields is None or name in set(asset_fields)
+        ]
+        frame = self.asset_repository.find_frame_by_user(user_id)
         
-        if not assets:
-            return {
+        if not len(frame):
+            empty = {
                 'total_assets': 0,
                 'average_performance': 0.0,
                 'best_performer': None,
                 'worst_performer': None,
                 'assets': []
             }
+            return {name: empty[name] for name in self.PERFORMANCE_FIELDS if name in fields}
 
-        performances = [
-            {
-                'symbol': asset.symbol,
-                'name': asset.name,
-                'performance': self.calculator.calculate(asset),
-                'gain_loss': asset.gain_loss,
-            }
-            for asset in assets
-        ]
+        performances = self.calculator.calculate_many(frame)
+        # Tri décroissant stable : à performance égale, l'ordre du portefeuille est conservé
+        order = np.argsort(-performances, kind='stable')
 
-        performances.sort(key=lambda x: x['performance'], reverse=True)
+        def entries(indexes: np.ndarray) -> List[Dict[str, Any]]:
+            columns = []
+            for name in asset_fields:
+                if name == 'performance':
+                    columns.append(performances[indexes].tolist())
+                else:
+                    columns.append(frame.column(name, indexes))
+            return [dict(zip(asset_fields, values)) for values in zip(*columns)]
 
-        avg_performance = sum(p['performance'] for p in performances) / len(performances)
-
-        return {
-            'total_assets': len(assets),
-            'average_performance': round(avg_performance, 2),
-            'best_performer': performances[0] if performances else None,
-            'worst_performer': performances[-1] if performances else None,
-            'assets': performances
+        # Les entrées ne sont construites que pour les clés demandées
+        performance = {
+            'total_assets': len(frame),
+            'average_performance': round(float(performances.mean()), 2),
         }
+        if 'best_performer' in fields:
+            performance['best_performer'] = entries(order[:1])[0]
+        if 'worst_performer' in fields:
+            performance['worst_performer'] = entries(order[-1:])[0]
+        if 'assets' in fields:
+            performance['assets'] = entries(order)
+        return {name: performance[name] for name in self.PERFORMANCE_FIELDS if name in fields}
+
+    @staticmethod
+    def _asset_entries(frame: PortfolioFrame, indexes: np.ndarray, asset_fields: List[str]) -> List[Dict[str, Any]]:
+        """Construire les entrées des actifs de by_type avec les seuls champs demandés"""
+        if not asset_fields:
+            return []
+        columns = []
+        for name in asset_fields:
+            values = frame.column(name, indexes)
+            if name in ('quantity', 'current_price'):
+                values = [str(value) for value in values]
+            columns.append(values)
+        return [dict(zip(asset_fields, values)) for values in zip(*columns)]
@@ -0,0 +1,272 @@
+"""
+Projection - Distribution de la valeur future du portefeuille (Monte Carlo)
+
+Chaque poche (type d'actif) suit un mouvement brownien géométrique, les
+chocs étant corrélés entre types. Les trajectoires sont simulées par blocs
+de taille fixe (le dernier éventuellement partiel) dans un pool de
+processus ; chaque bloc a sa propre graine dérivée (SeedSequence.spawn), si
+bien que le résultat ne dépend que de la graine et du nombre de trajectoires
+simulées, pas du nombre de workers.
+"""
+
+import atexit
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from ..models import Asset
+from .interfaces import IAssetRepository
+from .repositories import DjangoAssetRepository
+
+# (rendement annuel, volatilité annuelle) estimés par type d'actif
+DEFAULT_ASSUMPTIONS: Dict[str, Tuple[float, float]] = {
+    Asset.AssetType.STOCK: (0.07, 0.18),
+    Asset.AssetType.BOND: (0.03, 0.06),
+    Asset.AssetType.CRYPTO: (0.15, 0.75),
+}
+# Corrélations entre types (ordre de DEFAULT_ASSUMPTIONS)
+DEFAULT_CORRELATION = (
+    (1.0, 0.1, 0.3),
+    (0.1, 1.0, 0.0),
+    (0.3, 0.0, 1.0),
+)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def simulate_chunk(values, drift, volatility, cholesky, years: int, paths: int, seed) -> np.ndarray:
+    """
+    Simuler un bloc de trajectoires (exécuté dans un processus du pool)
+
+    Args:
+        values: Valeur initiale par poche
+        drift: Rendement annuel par poche
+        volatility: Volatilité annuelle par poche
+        cholesky: Facteur de Cholesky de la matrice de corrélation
+        years: Horizon en années (un pas par an, loi log-normale exacte)
+        paths: Nombre de trajectoires
+        seed: SeedSequence du bloc
+
+    Returns:
+        Valeur du portefeuille en fin de chaque année, tableau (paths, years)
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((paths, years, len(values))) @ cholesky.T
+    log_growth = np.cumsum((drift - 0.5 * volatility ** 2) + volatility * shocks, axis=1)
+    return (np.exp(log_growth) @ values).astype(np.float32)
+
+
+def get_executor(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Pool de processus partagé, None pour un calcul en ligne
+
+    Créé à la première utilisation ; recréé si le nombre de workers demandé
+    change (l'ancien pool termine les blocs déjà soumis puis s'arrête).
+    """
+    global _executor, _executor_workers
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is not None and _executor_workers != workers:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+class ProjectionService:
+    """
+    Service de projection Monte Carlo.
+
+    Le nombre de trajectoires demandé est simulé tel quel, borné par
+    max_paths(horizon) : les trajectoires × années conservées tiennent dans
+    MAX_CELLS valeurs (float32), quel que soit l'horizon. Il se dégrade de
+    deux façons : il est réduit d'emblée quand la machine est chargée (load
+    average supérieure au nombre de CPU), puis la simulation s'arrête au
+    premier bloc non terminé dans le budget de temps. Si même le premier
+    bloc ne l'est pas (pool saturé), FALLBACK_PATHS trajectoires sont
+    simulées dans le processus courant. `degraded` ne signale que ces
+    réductions.
+    """
+
+    CHUNK_SIZE = 20000
+    MAX_PATHS = 200000
+    MAX_HORIZON = 50
+    # 8 Mo de résultats (float32) par requête au plus
+    MAX_CELLS = 2000000
+    FALLBACK_PATHS = 1000
+
+    def __init__(
+        self,
+        asset_repository: IAssetRepository = None,
+        assumptions: Dict[str, Tuple[float, float]] = None,
+        workers: Optional[int] = None,
+        time_budget: Optional[float] = None
+    ):
+        """
+        Args:
+            asset_repository: Repository des actifs (par défaut DjangoAssetRepository)
+            assumptions: (rendement, volatilité) par type d'actif
+            workers: Processus du pool, 0 pour calculer dans le processus courant
+            time_budget: Budget de temps (s) de la simulation
+        """
+        self.asset_repository = asset_repository or DjangoAssetRepository()
+        self.assumptions = assumptions or DEFAULT_ASSUMPTIONS
+        self.workers = workers if workers is not None else getattr(
+            settings, 'PORTFOLIO_PROJECTION_WORKERS', min(4, os.cpu_count() or 1)
+        )
+        self.time_budget = time_budget if time_budget is not None else getattr(
+            settings, 'PORTFOLIO_PROJECTION_TIME_BUDGET', 2.0
+        )
+
+    def get_values_by_type(self, user_id: int) -> Dict[str, float]:
+        """Valeur actuelle des positions par type d'actif"""
+        values: Dict[str, float] = {}
+        assets = self.asset_repository.find_all_by_user(
+            user_id, fields=['asset_type', 'quantity', 'current_price']
+        )
+        for asset in assets:
+            values[asset.asset_type] = values.get(asset.asset_type, 0.0) + asset.current_value
+        return values
+
+    @classmethod
+    def max_paths(cls, horizon_years: int) -> int:
+        """Nombre maximal de trajectoires pour un horizon (MAX_PATHS, puis MAX_CELLS)"""
+        return min(cls.MAX_PATHS, cls.MAX_CELLS // max(horizon_years, 1))
+
+    def admissible_paths(self, paths: int, horizon_years: int = 1) -> int:
+        """
+        Réduire le nombre de trajectoires si la machine est chargée
+
+        Sans charge, le nombre demandé (borné par max_paths). Sous charge,
+        le nombre réduit est arrondi au bloc supérieur, sans dépasser la
+        demande.
+        """
+        paths = min(max(paths, 1), self.max_paths(horizon_years))
+        try:
+            load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        except OSError:
+            load = 0.0
+        if load <= 1:
+            return paths
+        return min(paths, math.ceil(paths / load / self.CHUNK_SIZE) * self.CHUNK_SIZE)
+
+    def project(self, user_id: int, horizon_years: int = 10, paths: int = 100000,
+                seed: Optional[int] = None) -> Dict:
+        """
+        Projeter la valeur du portefeuille
+
+        Args:
+            user_id: ID de l'utilisateur
+            horizon_years: Horizon de projection (années)
+            paths: Nombre de trajectoires souhaité
+            seed: Graine (générée et retournée si absente)
+
+        Returns:
+            Percentiles annuels, statistiques de la valeur finale et
+            nombre de trajectoires effectivement simulées
+        """
+        horizon_years = min(max(int(horizon_years), 1), self.MAX_HORIZON)
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2 ** 63)
+        values_by_type = self.get_values_by_type(user_id)
+        initial_value = sum(values_by_type.values())
+        result = {
+            'horizon_years': horizon_years,
+            'seed': seed,
+            'initial_value': round(initial_value, 2),
+            'paths_requested': paths,
+            'paths_simulated': 0,
+            'degraded': False,
+            'elapsed_ms': 0,
+            'percentiles': {},
+            'terminal': None,
+        }
+        if initial_value <= 0:
+            return result
+
+        started = time.monotonic()
+        target = self.admissible_paths(paths, horizon_years)
+        simulated = self._run(values_by_type, horizon_years, target, seed, started + self.time_budget)
+
+        terminal = simulated[:, -1]
+        percentiles = {
+            f'p{percentile}': [round(float(value), 2) for value in row]
+            for percentile, row in zip(PERCENTILES, np.percentile(simulated, PERCENTILES, axis=0))
+        }
+        result.update({
+            'paths_simulated': len(simulated),
+            'degraded': len(simulated) < min(paths, self.max_paths(horizon_years)),
+            'elapsed_ms': round((time.monotonic() - started) * 1000),
+            'percentiles': percentiles,
+            'terminal': {
+                'mean': round(float(terminal.mean()), 2),
+                **{key: row[-1] for key, row in percentiles.items()},
+                'probability_of_loss': round(float((terminal < initial_value).mean()), 4),
+            },
+        })
+        return result
+
+    def _run(self, values_by_type: Dict[str, float], years: int, paths: int, seed: int,
+             deadline: float) -> np.ndarray:
+        """Simuler les blocs dans le budget de temps, en conservant leur ordre"""
+        types = list(self.assumptions)
+        types += [asset_type for asset_type in values_by_type if asset_type not in types]
+        values = np.array([values_by_type.get(asset_type, 0.0) for asset_type in types])
+        drift = np.array([self.assumptions.get(asset_type, (0.0, 0.0))[0] for asset_type in types])
+        volatility = np.array([self.assumptions.get(asset_type, (0.0, 0.0))[1] for asset_type in types])
+        cholesky = np.linalg.cholesky(self._correlation(types))
+
+        chunk_seeds = np.random.SeedSequence(seed).spawn(math.ceil(paths / self.CHUNK_SIZE))
+        # Blocs pleins, le dernier complété au nombre demandé
+        chunk_sizes = [min(self.CHUNK_SIZE, paths - index * self.CHUNK_SIZE) for index in range(len(chunk_seeds))]
+        arguments = (values, drift, volatility, cholesky, years)
+        blocks: List[np.ndarray] = []
+
+        executor = get_executor(self.workers)
+        if executor is None:
+            for chunk_size, chunk_seed in zip(chunk_sizes, chunk_seeds):
+                if blocks and time.monotonic() >= deadline:
+                    break
+                blocks.append(simulate_chunk(*arguments, chunk_size, chunk_seed))
+            return np.concatenate(blocks)
+
+        futures = [
+            executor.submit(simulate_chunk, *arguments, chunk_size, chunk_seed)
+            for chunk_size, chunk_seed in zip(chunk_sizes, chunk_seeds)
+        ]
+        try:
+            for future in futures:
+                try:
+                    blocks.append(future.result(timeout=max(deadline - time.monotonic(), 0)))
+                except FutureTimeoutError:
+                    break
+        finally:
+            for future in futures[len(blocks):]:
+                future.cancel()
+        if not blocks:
+            # Pool saturé : petit échantillon en ligne (préfixe du premier bloc, même graine)
+            blocks.append(simulate_chunk(*arguments, min(chunk_sizes[0], self.FALLBACK_PATHS), chunk_seeds[0]))
+        return np.concatenate(blocks)
+
+    def _correlation(self, types: List[str]) -> np.ndarray:
+        """Matrice de corrélation des poches (identité pour les types hors défauts)"""
+        default_types = list(DEFAULT_ASSUMPTIONS)
+        matrix = np.eye(len(types))
+        for i, first in enumerate(types):
+            for j, second in enumerate(types):
+                if first in default_types and second in default_types:
+                    matrix[i, j] = DEFAULT_CORRELATION[default_types.index(first)][default_types.index(second)]
+        return matrix
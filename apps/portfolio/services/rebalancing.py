@@ -0,0 +1,205 @@
+"""
+Rebalancing - Écart à l'allocation cible et liste d'ordres minimale
+
+Les positions sont agrégées par (utilisateur, symbole) en base, puis tout
+le calcul (valeur des poches, poids, écarts, ordres) est vectorisé avec
+NumPy sur l'ensemble des utilisateurs traités : un utilisateur ou tous
+les utilisateurs ayant une allocation cible passent par le même code.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+
+from ..models import Asset, TargetAllocation
+
+UNTARGETED = ''
+
+
+class RebalancingService:
+    """
+    Moteur de rééquilibrage.
+
+    Règles :
+    - chaque position est rattachée à la cible de son symbole, sinon à celle
+      de son type d'actif ; sans cible, sa poche a un poids cible nul (vente) ;
+    - les poids cibles d'un utilisateur sont normalisés (somme = 1) ;
+    - seules les poches dont l'écart dépasse `tolerance` sont rééquilibrées ;
+    - l'ordre d'une poche est réparti entre ses symboles au prorata de leur valeur.
+    """
+
+    def __init__(self, tolerance: float = 0.0, min_trade_value: float = 0.0, batch_size: int = 1000):
+        """
+        Args:
+            tolerance: Écart de poids absolu toléré avant rééquilibrage (ex: 0.05)
+            min_trade_value: Valeur en dessous de laquelle un ordre est ignoré
+            batch_size: Utilisateurs traités par passe (taille des listes IN, sous
+                les limites de paramètres de SQLite et PostgreSQL)
+        """
+        self.tolerance = tolerance
+        self.min_trade_value = min_trade_value
+        self.batch_size = batch_size
+
+    def rebalance_user(self, user_id: int) -> Dict:
+        """Écarts et ordres pour un utilisateur"""
+        return self.rebalance([user_id]).get(user_id, self._empty())
+
+    def rebalance_all(self) -> Dict[int, Dict]:
+        """Écarts et ordres pour tous les utilisateurs ayant une allocation cible"""
+        results: Dict[int, Dict] = {}
+        for user_ids in self._iter_target_users():
+            results.update(self._rebalance_batch(user_ids))
+        return results
+
+    def _iter_target_users(self) -> Iterator[List[int]]:
+        """Utilisateurs ayant une cible, par lots de batch_size (pagination sur user_id)"""
+        users = TargetAllocation.objects.values_list('user_id', flat=True).distinct().order_by('user_id')
+        last = None
+        while True:
+            batch = list((users if last is None else users.filter(user_id__gt=last))[:self.batch_size])
+            if not batch:
+                return
+            yield batch
+            if len(batch) < self.batch_size:
+                return
+            last = batch[-1]
+
+    def rebalance(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Calculer écarts et ordres pour plusieurs utilisateurs
+
+        Args:
+            user_ids: IDs des utilisateurs (traités par lots de batch_size)
+
+        Returns:
+            Dict user_id -> {total_value, allocations, trades}
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        results: Dict[int, Dict] = {}
+        for start in range(0, len(user_ids), self.batch_size):
+            results.update(self._rebalance_batch(user_ids[start:start + self.batch_size]))
+        return results
+
+    def _rebalance_batch(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """Écarts et ordres d'un lot d'utilisateurs, en une passe vectorisée"""
+        targets = list(
+            TargetAllocation.objects.filter(user_id__in=user_ids)
+            .values_list('user_id', 'asset_type', 'symbol', 'weight')
+        )
+        positions = list(
+            Asset.objects.filter(user_id__in=user_ids)
+            .values('user_id', 'symbol', 'asset_type')
+            .annotate(
+                total_quantity=Sum('quantity'),
+                total_value=Sum(ExpressionWrapper(
+                    F('quantity') * F('current_price'),
+                    output_field=DecimalField(max_digits=36, decimal_places=10)
+                ))
+            )
+            .order_by()
+        )
+        if not targets and not positions:
+            return {}
+
+        # Poches : une par cible, plus une par symbole non ciblé
+        bucket_index: Dict[tuple, int] = {}
+        bucket_keys: List[tuple] = []
+        bucket_weights: List[float] = []
+
+        def add_bucket(key, weight):
+            bucket_index[key] = len(bucket_keys)
+            bucket_keys.append(key)
+            bucket_weights.append(weight)
+
+        for user_id, asset_type, symbol, weight in targets:
+            add_bucket((user_id, asset_type, symbol), float(weight))
+
+        position_bucket = []
+        for position in positions:
+            user_id, symbol = position['user_id'], position['symbol']
+            key = (user_id, UNTARGETED, symbol)
+            if key not in bucket_index:
+                key = (user_id, position['asset_type'], UNTARGETED)
+                if key not in bucket_index:
+                    key = (user_id, UNTARGETED, symbol)
+                    add_bucket(key, 0.0)
+            position_bucket.append(bucket_index[key])
+
+        users = sorted({key[0] for key in bucket_keys})
+        user_index = {user_id: index for index, user_id in enumerate(users)}
+        bucket_user = np.array([user_index[key[0]] for key in bucket_keys], dtype=np.intp)
+        position_bucket = np.array(position_bucket, dtype=np.intp)
+        position_value = np.array([float(p['total_value'] or 0) for p in positions], dtype=np.float64)
+        position_quantity = np.array([float(p['total_quantity'] or 0) for p in positions], dtype=np.float64)
+
+        bucket_count = len(bucket_keys)
+        bucket_value = np.bincount(position_bucket, weights=position_value, minlength=bucket_count)
+        total_value = np.bincount(bucket_user, weights=bucket_value, minlength=len(users))
+        weight_sum = np.bincount(bucket_user, weights=bucket_weights, minlength=len(users))
+
+        target_weight = np.divide(
+            bucket_weights, weight_sum[bucket_user],
+            out=np.zeros(bucket_count), where=weight_sum[bucket_user] > 0
+        )
+        current_weight = np.divide(
+            bucket_value, total_value[bucket_user],
+            out=np.zeros(bucket_count), where=total_value[bucket_user] > 0
+        )
+        drift = current_weight - target_weight
+        # Sans allocation cible, un utilisateur n'a rien à rééquilibrer
+        out_of_band = (np.abs(drift) > self.tolerance) & (weight_sum[bucket_user] > 0)
+        bucket_trade = np.where(out_of_band, (target_weight - current_weight) * total_value[bucket_user], 0.0)
+
+        # Répartition de l'ordre de chaque poche entre ses symboles
+        share = np.divide(
+            position_value, bucket_value[position_bucket],
+            out=np.zeros(len(positions)), where=bucket_value[position_bucket] > 0
+        )
+        trade_value = bucket_trade[position_bucket] * share
+        price = np.divide(
+            position_value, position_quantity,
+            out=np.zeros(len(positions)), where=position_quantity > 0
+        )
+        trade_quantity = np.divide(trade_value, price, out=np.zeros(len(positions)), where=price > 0)
+
+        results = {
+            user_id: {'total_value': round(float(total_value[index]), 2), 'allocations': [], 'trades': []}
+            for user_id, index in user_index.items()
+        }
+        for index, (user_id, asset_type, symbol) in enumerate(bucket_keys):
+            results[user_id]['allocations'].append({
+                'asset_type': asset_type,
+                'symbol': symbol,
+                'current_value': round(float(bucket_value[index]), 2),
+                'current_weight': round(float(current_weight[index]), 4),
+                'target_weight': round(float(target_weight[index]), 4),
+                'drift': round(float(drift[index]), 4),
+                'rebalance': bool(out_of_band[index]),
+            })
+            # Poche ciblée sans position : aucun prix connu, l'ordre reste en valeur
+            if bucket_value[index] == 0 and bucket_trade[index] > self.min_trade_value:
+                results[user_id]['trades'].append(
+                    self._trade(symbol, asset_type, float(bucket_trade[index]), None)
+                )
+        for index, position in enumerate(positions):
+            if abs(trade_value[index]) > max(self.min_trade_value, 0.005):
+                results[position['user_id']]['trades'].append(self._trade(
+                    position['symbol'], position['asset_type'],
+                    float(trade_value[index]), float(trade_quantity[index])
+                ))
+        return results
+
+    @staticmethod
+    def _trade(symbol: str, asset_type: str, value: float, quantity: Optional[float]) -> Dict:
+        return {
+            'symbol': symbol,
+            'asset_type': asset_type,
+            'side': 'BUY' if value > 0 else 'SELL',
+            'value': round(abs(value), 2),
+            'quantity': round(abs(quantity), 8) if quantity is not None else None,
+        }
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {'total_value': 0.0, 'allocations': [], 'trades': []}
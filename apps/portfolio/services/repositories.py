@@ -2,13 +2,41 @@
 Repository Pattern - Abstraction de l'accès aux données
 """
 
-from typing import List, Optional, Dict, Any
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Iterable, Hashable, Tuple
 from decimal import Decimal
-from django.db.models import Sum
-from ..models import Asset
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import DateTimeField, F, Q, Sum, Value
+from django.dispatch import receiver
+from django.utils import timezone
+from ..models import ArchivedAsset, Asset, PortfolioVersion, versions_bumped
+from ..signals import assets_bulk_saved, assets_bulk_deleted
+from .frame import PortfolioFrame
 from .interfaces import IAssetRepository
 
 
+# Colonnes de l'historique, communes à Asset et ArchivedAsset
+HISTORY_FIELDS = ('id', 'asset_type', 'symbol', 'name', 'quantity', 'purchase_price', 'current_price', 'purchase_date')
+
+
+class AssetVersionConflict(Exception):
+    """La version d'un actif a changé depuis sa lecture par le client"""
+
+    def __init__(self, asset_id: int, expected_version: Optional[int], current_version: int):
+        self.asset_id = asset_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Actif {asset_id} modifié entre-temps : version {expected_version} attendue, "
+            f"version {current_version} en base"
+        )
+
+
 class DjangoAssetRepository(IAssetRepository):
     """
     Implémentation du Repository Pattern pour les modèles Asset Django.
@@ -30,17 +58,55 @@ class DjangoAssetRepository(IAssetRepository):
         except Asset.DoesNotExist:
             return None
 
-    def find_all_by_user(self, user_id: int) -> List[Asset]:
+    def find_all_by_user(self, user_id: int, fields: Optional[List[str]] = None) -> List[Asset]:
         """
         Récupérer tous les actifs d'un utilisateur
         
         Args:
             user_id: ID de l'utilisateur
+            fields: Colonnes à charger (toutes par défaut)
             
         Returns:
             Liste des actifs de l'utilisateur
         """
-        return Asset.objects.filter(user_id=user_id).order_by('-created_at')
+        queryset = Asset.objects.filter(user_id=user_id).order_by('-created_at')
+        if fields:
+            queryset = queryset.only(*fields)
+        return queryset
+
+    def find_frame_by_user(self, user_id: int) -> PortfolioFrame:
+        """
+        Charger les actifs d'un utilisateur en colonnes (une requête values_list)
+        
+        Args:
+            user_id: ID de l'utilisateur
+            
+        Returns:
+            PortfolioFrame dans l'ordre de find_all_by_user
+        """
+        return PortfolioFrame.from_queryset(Asset.objects.filter(user_id=user_id).order_by('-created_at'))
+
+    def find_history_by_user(self, user_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Historique des lots d'un utilisateur : table courante et archive
+        
+        Une seule requête UNION ALL ; archived_at vaut None pour les lots courants.
+        
+        Args:
+            user_id: ID de l'utilisateur
+            filters: Lookups appliqués aux deux tables (symbol__in, purchase_date__gte...)
+            
+        Returns:
+            Dicts HISTORY_FIELDS + archived_at, du plus récent au plus ancien achat
+        """
+        filters = filters or {}
+        hot = Asset.objects.filter(user_id=user_id, **filters).annotate(
+            archived_at=Value(None, output_field=DateTimeField())
+        ).values(*HISTORY_FIELDS, 'archived_at').order_by()
+        cold = ArchivedAsset.objects.filter(user_id=user_id, **filters).annotate(
+            archived_at=F('closed_at')
+        ).values(*HISTORY_FIELDS, 'archived_at').order_by()
+        return list(hot.union(cold, all=True).order_by('-purchase_date', '-id'))
 
     def create(self, user_id: int, asset_data: Dict[str, Any]) -> Asset:
         """
@@ -55,42 +121,195 @@ class DjangoAssetRepository(IAssetRepository):
         """
         return Asset.objects.create(user_id=user_id, **asset_data)
 
-    def update(self, asset_id: int, asset_data: Dict[str, Any]) -> Asset:
+    def update(
+        self,
+        asset_id: int,
+        asset_data: Dict[str, Any],
+        user_id: Optional[int] = None,
+        expected_version: Optional[int] = None
+    ) -> Asset:
         """
-        Mettre à jour un actif
+        Mettre à jour un actif par un UPDATE conditionnel
+        
+        Seuls les champs fournis sont écrits, la version est incrémentée
+        par la base : UPDATE ... SET <champs>, version = version + 1
+        WHERE id = ? [AND user_id = ?] [AND version = ?]. Sans lecture
+        préalable ; avec expected_version, une modification concurrente est
+        détectée au lieu d'être écrasée.
         
         Args:
             asset_id: ID de l'actif à mettre à jour
-            asset_data: Nouvelles données
+            asset_data: Champs modifiés et leurs nouvelles valeurs
+            user_id: Propriétaire attendu (vérification d'ownership dans le WHERE)
+            expected_version: Version lue par le client (verrouillage optimiste)
             
         Returns:
-            Asset mis à jour
+            Asset mis à jour (relu après l'écriture)
             
         Raises:
-            Asset.DoesNotExist
+            Asset.DoesNotExist: Si l'actif n'existe pas (ou n'appartient pas à user_id)
+            AssetVersionConflict: Si la version en base diffère de expected_version
         """
+        queryset = Asset.objects.filter(id=asset_id)
+        if user_id is not None:
+            queryset = queryset.filter(user_id=user_id)
+        updated = queryset.filter(
+            **({} if expected_version is None else {'version': expected_version})
+        ).update(**asset_data, version=F('version') + 1, updated_at=timezone.now())
+        if not updated:
+            # Sans contrôle de version, aucune ligne affectée signifie actif introuvable ;
+            # sinon une lecture distingue l'actif introuvable du conflit
+            current_version = None
+            if expected_version is not None:
+                current_version = queryset.values_list('version', flat=True).first()
+            if current_version is None:
+                raise Asset.DoesNotExist("Actif non trouvé")
+            raise AssetVersionConflict(asset_id, expected_version, current_version)
+
         asset = Asset.objects.get(id=asset_id)
-        for key, value in asset_data.items():
-            setattr(asset, key, value)
-        asset.save()
+        # QuerySet.update n'émet pas post_save : même notification qu'une écriture en lot
+        assets_bulk_saved.send(sender=Asset, assets=[asset], fields=list(asset_data))
         return asset
 
-    def delete(self, asset_id: int) -> bool:
+    def delete(self, asset_id: int, user_id: Optional[int] = None) -> bool:
         """
         Supprimer un actif
         
+        Avec user_id, une seule requête DELETE ... WHERE id = ? AND user_id = ?
+        vérifie l'ownership : un actif absent ou d'un autre utilisateur
+        n'affecte aucune ligne.
+        
         Args:
             asset_id: ID de l'actif à supprimer
+            user_id: Propriétaire attendu
             
         Returns:
             True si suppression réussie, False sinon
         """
+        if user_id is not None:
+            return self.delete_by_ids(user_id, [asset_id]) == 1
         try:
             Asset.objects.get(id=asset_id).delete()
             return True
         except Asset.DoesNotExist:
             return False
 
+    def find_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> Dict[int, Asset]:
+        """
+        Trouver en une requête plusieurs actifs appartenant à un utilisateur
+        
+        Args:
+            user_id: ID de l'utilisateur propriétaire
+            asset_ids: IDs des actifs
+            
+        Returns:
+            Dict {id: Asset} limité aux actifs de l'utilisateur
+        """
+        return Asset.objects.filter(user_id=user_id).in_bulk(list(asset_ids))
+
+    def bulk_create(self, assets: List[Asset], batch_size: int = 500) -> List[Asset]:
+        """
+        Insérer plusieurs actifs par lots (INSERT multi-lignes)
+        
+        Args:
+            assets: Actifs non sauvegardés (user_id renseigné)
+            batch_size: Nombre de lignes par INSERT
+            
+        Returns:
+            Actifs créés (avec leur ID si la base le permet)
+        """
+        created = Asset.objects.bulk_create(assets, batch_size=batch_size)
+        if created:
+            assets_bulk_saved.send(sender=Asset, assets=created)
+        return created
+
+    def bulk_update(self, assets: List[Asset], fields: Iterable[str], batch_size: int = 500) -> int:
+        """
+        Mettre à jour plusieurs actifs en une requête par lot
+        
+        Verrouillage optimiste : chaque ligne n'est écrite que si sa version
+        en base est encore celle de l'actif en mémoire (WHERE (id, version)).
+        À appeler dans une transaction, qu'un conflit doit annuler.
+        
+        Args:
+            assets: Actifs modifiés en mémoire
+            fields: Champs à écrire (updated_at et version sont ajoutés automatiquement)
+            batch_size: Nombre de lignes par UPDATE
+            
+        Returns:
+            Nombre de lignes mises à jour
+            
+        Raises:
+            Asset.DoesNotExist: Si un actif a été supprimé entre-temps
+            AssetVersionConflict: Si un actif a été modifié depuis sa lecture
+        """
+        if not assets:
+            return 0
+        now = timezone.now()
+        versions = [asset.version for asset in assets]
+        for asset in assets:
+            asset.updated_at = now
+            asset.version = F('version') + 1
+        fields_to_write = sorted(set(fields) | {'updated_at', 'version'})
+        updated = 0
+        try:
+            for start in range(0, len(assets), batch_size):
+                chunk = assets[start:start + batch_size]
+                expected = dict(zip((asset.id for asset in chunk), versions[start:start + batch_size]))
+                condition = Q()
+                for asset_id, version in expected.items():
+                    condition |= Q(id=asset_id, version=version)
+                written = Asset.objects.filter(condition).bulk_update(chunk, fields_to_write)
+                if written < len(chunk):
+                    self._raise_version_conflict(expected, now)
+                updated += written
+        finally:
+            for asset, version in zip(assets, versions):
+                asset.version = version
+        for asset in assets:
+            asset.version += 1
+        assets_bulk_saved.send(sender=Asset, assets=assets, fields=list(fields))
+        return updated
+
+    @staticmethod
+    def _raise_version_conflict(expected: Dict[int, int], written_at) -> None:
+        """
+        Identifier l'actif non écrit par le bulk_update (lignes du lot déjà
+        écrites : updated_at == written_at)
+        """
+        current = {
+            asset_id: (version, updated_at)
+            for asset_id, version, updated_at in Asset.objects.filter(
+                id__in=list(expected)
+            ).values_list('id', 'version', 'updated_at')
+        }
+        for asset_id, version in expected.items():
+            if asset_id not in current:
+                raise Asset.DoesNotExist(f"Actif {asset_id} supprimé entre-temps")
+            current_version, updated_at = current[asset_id]
+            if updated_at != written_at:
+                raise AssetVersionConflict(asset_id, version, current_version)
+
+    def delete_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> int:
+        """
+        Supprimer en une requête plusieurs actifs d'un utilisateur
+        
+        Args:
+            user_id: ID de l'utilisateur propriétaire
+            asset_ids: IDs des actifs à supprimer
+            
+        Returns:
+            Nombre d'actifs supprimés
+        """
+        asset_ids = list(asset_ids)
+        if not asset_ids:
+            return 0
+        # DELETE ... WHERE direct, sans Collector (voir Asset.delete_rows)
+        deleted = Asset.delete_rows(asset_ids, user_id=user_id)
+        if deleted:
+            assets_bulk_deleted.send(sender=Asset, user_id=user_id, asset_ids=asset_ids)
+        return deleted
+
     def sum_by_type(self, user_id: int) -> Dict[str, Decimal]:
         """
         Obtenir la somme des valeurs actuelles par type d'actif
@@ -155,3 +374,340 @@ class DjangoAssetRepository(IAssetRepository):
             total=Sum('purchase_price')
         )
         return total['total'] or Decimal(0)
+
+
+MISSING = object()
+
+
+class LRUCache:
+    """Cache mémoire borné (LRU) avec durée de vie, partagé entre threads"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0, clock=time.monotonic):
+        """
+        Args:
+            max_entries: Nombre maximal d'entrées (les moins récemment lues sont évincées)
+            ttl: Durée de vie d'une entrée (s)
+            clock: Horloge (injectable pour les tests)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Valeur en cache, ou MISSING si absente ou expirée"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] <= self.clock():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Même interface qu'LRUCache sur un cache Django (partagé entre processus : Redis, Memcached...)"""
+
+    def __init__(self, alias: str = 'default', ttl: float = 60.0, prefix: str = 'asset-repository'):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: Hashable) -> str:
+        return ':'.join([self.prefix, *map(str, key if isinstance(key, tuple) else (key,))])
+
+    def get(self, key: Hashable) -> Any:
+        return self.cache.get(self._key(key), MISSING)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.cache.set(self._key(key), value, self.ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self.cache.delete(self._key(key))
+
+
+class CachingAssetRepository(IAssetRepository):
+    """
+    Décorateur de repository : mémorise les lectures d'un autre repository.
+
+    Les lectures par utilisateur (find_all_by_user, find_frame_by_user,
+    sum_by_type, agrégats de valeur) sont rangées sous une génération propre
+    à l'utilisateur ; une écriture passant par ce repository remplace la
+    génération (nouvelle valeur aléatoire), ce qui invalide en une opération
+    toutes les lectures de cet utilisateur et uniquement les siennes.
+    find_by_id est invalidé par identifiant et par la génération de son
+    propriétaire. Les écritures faites hors de ce repository (création par
+    l'API, ingestion de prix, archivage...) invalident le cache partagé de
+    get_asset_repository() via PortfolioVersion.bump ; depuis un autre
+    processus, seulement avec un backend partagé (sinon à l'expiration du TTL).
+
+    Les instances Asset sont copiées à la lecture : un appelant peut les
+    modifier sans altérer le cache.
+    """
+
+    CACHED_METHODS = (
+        'find_by_id', 'find_all_by_user', 'find_frame_by_user', 'sum_by_type',
+        'get_portfolio_value', 'get_portfolio_purchase_value',
+    )
+
+    def __init__(self, repository: IAssetRepository, cache=None):
+        """
+        Args:
+            repository: Repository décoré (ex. DjangoAssetRepository)
+            cache: LRUCache (par processus, défaut) ou DjangoCacheBackend (partagé)
+        """
+        self.repository = repository
+        self.cache = cache if cache is not None else LRUCache()
+        self._stats_lock = threading.Lock()
+        self.hits = dict.fromkeys(self.CACHED_METHODS, 0)
+        self.misses = dict.fromkeys(self.CACHED_METHODS, 0)
+        self.invalidations = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Méthodes propres au repository décoré (find_by_user_and_symbol...) : non mémorisées
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    # Statistiques
+    def _record(self, method: str, hit: bool) -> None:
+        with self._stats_lock:
+            (self.hits if hit else self.misses)[method] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Succès, échecs et taux de succès par méthode et au total"""
+        with self._stats_lock:
+            methods = {
+                method: {
+                    'hits': self.hits[method],
+                    'misses': self.misses[method],
+                    'hit_rate': round(self.hits[method] / max(self.hits[method] + self.misses[method], 1), 4),
+                }
+                for method in self.CACHED_METHODS
+            }
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                'methods': methods,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / max(hits + misses, 1), 4),
+                'invalidations': self.invalidations,
+            }
+
+    # Clés et invalidation
+    def _generation(self, user_id: int) -> str:
+        key = ('generation', user_id)
+        generation = self.cache.get(key)
+        if generation is MISSING:
+            # Génération inconnue (jamais lue ou évincée) : une valeur neuve,
+            # pour ne jamais ressusciter des entrées d'une génération perdue
+            generation = uuid.uuid4().hex
+            self.cache.set(key, generation)
+        return generation
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Invalider toutes les lectures mémorisées d'un utilisateur"""
+        new_generation(self.cache, user_id)
+        with self._stats_lock:
+            self.invalidations += 1
+
+    def invalidate_asset(self, asset_id: int) -> None:
+        self.cache.delete(('asset', asset_id))
+
+    def _cached(self, method: str, key: Tuple, load, copy_value=None) -> Any:
+        value = self.cache.get(key)
+        if value is MISSING:
+            self._record(method, False)
+            value = load()
+            if value is not None:
+                self.cache.set(key, value)
+        else:
+            self._record(method, True)
+        # L'appelant reçoit une copie : ses modifications n'altèrent pas le cache
+        return copy_value(value) if copy_value and value is not None else value
+
+    def _user_cached(self, method: str, user_id: int, load, *args, copy_value=None) -> Any:
+        key = ('user', user_id, self._generation(user_id), method, *args)
+        return self._cached(method, key, load, copy_value)
+
+    @staticmethod
+    def _copy_assets(assets: List[Asset]) -> List[Asset]:
+        return [copy.copy(asset) for asset in assets]
+
+    # Lectures mémorisées
+    def find_by_id(self, asset_id: int) -> Optional[Asset]:
+        key = ('asset', asset_id)
+        entry = self.cache.get(key)
+        # Entrée rangée avec la génération de son propriétaire : périmée dès qu'elle change
+        if entry is not MISSING and entry[0] == self._generation(entry[1].user_id):
+            self._record('find_by_id', True)
+            return copy.copy(entry[1])
+        self._record('find_by_id', False)
+        asset = self.repository.find_by_id(asset_id)
+        if asset is not None:
+            self.cache.set(key, (self._generation(asset.user_id), asset))
+            asset = copy.copy(asset)
+        return asset
+
+    def find_all_by_user(self, user_id: int, fields: Optional[List[str]] = None) -> List[Asset]:
+        return self._user_cached(
+            'find_all_by_user', user_id,
+            lambda: list(self.repository.find_all_by_user(user_id, fields=fields)),
+            tuple(fields or ()), copy_value=self._copy_assets
+        )
+
+    def find_frame_by_user(self, user_id: int) -> PortfolioFrame:
+        return self._user_cached('find_frame_by_user', user_id, lambda: self.repository.find_frame_by_user(user_id))
+
+    def sum_by_type(self, user_id: int) -> Dict[str, Decimal]:
+        return self._user_cached(
+            'sum_by_type', user_id, lambda: self.repository.sum_by_type(user_id), copy_value=dict
+        )
+
+    def get_portfolio_value(self, user_id: int) -> Decimal:
+        return self._user_cached(
+            'get_portfolio_value', user_id, lambda: self.repository.get_portfolio_value(user_id)
+        )
+
+    def get_portfolio_purchase_value(self, user_id: int) -> Decimal:
+        return self._user_cached(
+            'get_portfolio_purchase_value', user_id, lambda: self.repository.get_portfolio_purchase_value(user_id)
+        )
+
+    def find_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> Dict[int, Asset]:
+        # Utilisé avant une écriture par lot : toujours lu en base
+        return self.repository.find_by_ids(user_id, asset_ids)
+
+    def find_history_by_user(self, user_id: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        # Lecture rare et paramétrée : non mémorisée
+        return self.repository.find_history_by_user(user_id, filters)
+
+    # Écritures : déléguées puis invalidation ciblée
+    def create(self, user_id: int, asset_data: Dict[str, Any]) -> Asset:
+        asset = self.repository.create(user_id, asset_data)
+        self.invalidate_user(user_id)
+        return asset
+
+    def update(self, asset_id: int, asset_data: Dict[str, Any], **kwargs) -> Asset:
+        try:
+            asset = self.repository.update(asset_id, asset_data, **kwargs)
+        finally:
+            # Aussi en cas de conflit : l'entrée en cache est sans doute périmée
+            self.invalidate_asset(asset_id)
+        self.invalidate_user(asset.user_id)
+        return asset
+
+    def delete(self, asset_id: int, user_id: Optional[int] = None) -> bool:
+        if user_id is None:
+            # Propriétaire connu du cache si l'actif vient d'être lu, sinon relu
+            entry = self.cache.get(('asset', asset_id))
+            owner = entry[1] if entry is not MISSING else self.repository.find_by_id(asset_id)
+            user_id = owner.user_id if owner is not None else None
+            deleted = self.repository.delete(asset_id)
+        else:
+            deleted = self.repository.delete(asset_id, user_id=user_id)
+        self.invalidate_asset(asset_id)
+        if deleted and user_id is not None:
+            self.invalidate_user(user_id)
+        return deleted
+
+    def bulk_create(self, assets: List[Asset], batch_size: int = 500) -> List[Asset]:
+        created = self.repository.bulk_create(assets, batch_size=batch_size)
+        for user_id in {asset.user_id for asset in created}:
+            self.invalidate_user(user_id)
+        return created
+
+    def bulk_update(self, assets: List[Asset], fields: Iterable[str], batch_size: int = 500) -> int:
+        updated = self.repository.bulk_update(assets, fields, batch_size=batch_size)
+        for asset in assets:
+            self.invalidate_asset(asset.id)
+        for user_id in {asset.user_id for asset in assets}:
+            self.invalidate_user(user_id)
+        return updated
+
+    def delete_by_ids(self, user_id: int, asset_ids: Iterable[int]) -> int:
+        asset_ids = list(asset_ids)
+        deleted = self.repository.delete_by_ids(user_id, asset_ids)
+        for asset_id in asset_ids:
+            self.invalidate_asset(asset_id)
+        self.invalidate_user(user_id)
+        return deleted
+
+
+def new_generation(cache, user_id: int) -> None:
+    """Remplacer la génération d'un utilisateur : ses lectures en cache deviennent inaccessibles"""
+    cache.set(('generation', user_id), uuid.uuid4().hex)
+
+
+# Décorateur par processus : son cache et ses statistiques sont communs à toutes les requêtes
+_shared_repository = None
+_shared_repository_lock = threading.Lock()
+
+
+@receiver(versions_bumped, sender=PortfolioVersion)
+def on_versions_bumped(sender, user_ids, **kwargs):
+    """
+    Toute écriture qui incrémente la version d'un portefeuille invalide ses
+    lectures dans le cache partagé, y compris hors CachingAssetRepository
+    (création par l'API, ingestion de prix, archivage). De nouveau à la
+    validation : une lecture concurrente a pu remettre en cache l'état
+    d'avant la transaction.
+    """
+    repository = _shared_repository
+    if repository is None:
+        return
+    cache = repository.cache
+
+    def invalidate():
+        for user_id in user_ids:
+            new_generation(cache, user_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def get_asset_repository() -> IAssetRepository:
+    """
+    Repository utilisé par les vues : DjangoAssetRepository, décoré par
+    CachingAssetRepository si PORTFOLIO_REPOSITORY_CACHE est défini
+    ({'max_entries', 'ttl', 'backend'} ; backend = alias de cache Django
+    pour un cache partagé entre processus, None pour un LRU par processus).
+    Le décorateur est unique par processus : stats() couvre toutes les requêtes
+    """
+    from django.conf import settings
+
+    options = getattr(settings, 'PORTFOLIO_REPOSITORY_CACHE', None)
+    if not options:
+        return DjangoAssetRepository()
+
+    global _shared_repository
+    with _shared_repository_lock:
+        if _shared_repository is None:
+            ttl = options.get('ttl', 60.0)
+            if options.get('backend'):
+                cache = DjangoCacheBackend(options['backend'], ttl=ttl)
+            else:
+                cache = LRUCache(max_entries=options.get('max_entries', 1024), ttl=ttl)
+            _shared_repository = CachingAssetRepository(DjangoAssetRepository(), cache=cache)
+    return _shared_repository
@@ -0,0 +1,175 @@
+"""
+Risk - Métriques de risque du portefeuille
+
+Volatilité annualisée, VaR historique et paramétrique, drawdown maximal et
+matrice de corrélation, calculés avec NumPy sur l'historique des prix
+(PricePoint) de toutes les positions à la fois. Les résultats sont mis en
+cache par (utilisateur, fenêtre, niveau de confiance, version des données).
+"""
+
+from datetime import timedelta
+from statistics import NormalDist
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from ..models import Asset, PortfolioVersion, PricePoint
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class RiskService:
+    """Service de calcul des métriques de risque"""
+
+    CACHE_PREFIX = 'portfolio:risk'
+
+    def __init__(self, window_days: int = 90, confidence: float = 0.95):
+        """
+        Args:
+            window_days: Profondeur de l'historique utilisé (jours)
+            confidence: Niveau de confiance de la VaR (ex: 0.95)
+        """
+        self.window_days = window_days
+        self.confidence = confidence
+
+    def get_risk_metrics(self, user_id: int) -> Dict:
+        """
+        Métriques de risque du portefeuille (depuis le cache si les données n'ont pas changé)
+
+        La version des données combine la version du portefeuille (écritures
+        sur les actifs et les prix courants) et un marqueur de l'historique
+        (dernier horodatage, nombre de points) pour les symboles détenus.
+        """
+        positions = self._load_positions(user_id)
+        start = timezone.now() - timedelta(days=self.window_days)
+        history = PricePoint.objects.filter(symbol__in=list(positions), timestamp__gte=start)
+
+        marker = history.aggregate(last=Max('timestamp'), count=Count('id'))
+        version = PortfolioVersion.get_validator(user_id)[0]
+        key = ':'.join(str(part) for part in (
+            self.CACHE_PREFIX, user_id, self.window_days, self.confidence,
+            version, marker['count'], marker['last'] and marker['last'].timestamp()
+        ))
+        metrics = cache.get(key)
+        if metrics is None:
+            rows = history.order_by('timestamp').values_list('symbol', 'timestamp', 'price')
+            metrics = self.compute(positions, rows)
+            cache.set(key, metrics, getattr(settings, 'PORTFOLIO_RISK_CACHE_TIMEOUT', 300))
+        return metrics
+
+    @staticmethod
+    def _load_positions(user_id: int) -> Dict[str, float]:
+        """Quantité détenue par symbole"""
+        rows = (
+            Asset.objects.filter(user_id=user_id)
+            .values('symbol')
+            .annotate(total_quantity=Sum('quantity'))
+            .order_by('symbol')
+        )
+        return {row['symbol']: float(row['total_quantity']) for row in rows}
+
+    def compute(self, positions: Dict[str, float], rows) -> Dict:
+        """
+        Calculer les métriques à partir des positions et de l'historique
+
+        Args:
+            positions: Quantité par symbole
+            rows: (symbole, horodatage, prix) triés par horodatage
+
+        Returns:
+            Dict des métriques (None quand l'historique est insuffisant)
+        """
+        rows = list(rows)
+        symbols = sorted({row[0] for row in rows})
+        result = {
+            'window_days': self.window_days,
+            'confidence': self.confidence,
+            'observations': 0,
+            'current_value': None,
+            'volatility': None,
+            'var_historical': None,
+            'var_parametric': None,
+            'max_drawdown': None,
+            'correlation': {'symbols': symbols, 'matrix': []},
+            'missing_symbols': [symbol for symbol in positions if symbol not in symbols],
+        }
+        if not rows:
+            return result
+
+        aligned = self._price_matrix(symbols, rows)
+        if aligned is None or len(aligned[0]) < 3:
+            return result
+        matrix, seconds = aligned
+        quantities = np.array([positions[symbol] for symbol in symbols])
+
+        values = matrix @ quantities
+        current_value = float(values[-1])
+        periods_per_year = SECONDS_PER_YEAR / float(np.median(np.diff(seconds)))
+        portfolio_returns = np.diff(values) / values[:-1]
+
+        # Rendements par symbole : corrélation et VaR paramétrique (covariance)
+        asset_returns = np.diff(np.log(matrix), axis=0)
+        covariance = np.atleast_2d(np.cov(asset_returns, rowvar=False))
+        weights = matrix[-1] * quantities / current_value if current_value else np.zeros(len(symbols))
+        sigma = float(np.sqrt(max(weights @ covariance @ weights, 0.0)))
+        mu = float(weights @ asset_returns.mean(axis=0))
+        z = NormalDist().inv_cdf(self.confidence)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = np.atleast_2d(np.corrcoef(asset_returns, rowvar=False))
+        correlation = np.nan_to_num(correlation, nan=0.0)
+
+        running_max = np.maximum.accumulate(values)
+        drawdown = 1 - values / running_max
+
+        result.update({
+            'observations': int(len(portfolio_returns)),
+            'periods_per_year': round(periods_per_year, 2),
+            'current_value': round(current_value, 2),
+            'volatility': round(float(np.std(portfolio_returns, ddof=1) * np.sqrt(periods_per_year)), 6),
+            'var_historical': round(
+                max(-float(np.quantile(portfolio_returns, 1 - self.confidence)), 0.0) * current_value, 2
+            ),
+            'var_parametric': round(max(z * sigma - mu, 0.0) * current_value, 2),
+            'max_drawdown': round(float(drawdown.max()), 6),
+            'correlation': {
+                'symbols': symbols,
+                'matrix': np.round(correlation, 4).tolist(),
+            },
+        })
+        return result
+
+    @staticmethod
+    def _price_matrix(symbols, rows) -> Optional[tuple]:
+        """
+        Aligner l'historique en matrice (horodatages x symboles)
+
+        Les valeurs manquantes sont complétées par le dernier prix connu ;
+        les dates antérieures au premier prix de l'un des symboles sont écartées.
+
+        Returns:
+            (matrice des prix, horodatages en secondes) ou None
+        """
+        symbol_index = {symbol: index for index, symbol in enumerate(symbols)}
+        columns = np.fromiter((symbol_index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+        seconds = np.fromiter((row[1].timestamp() for row in rows), dtype=np.float64, count=len(rows))
+        prices = np.fromiter((float(row[2]) for row in rows), dtype=np.float64, count=len(rows))
+
+        timestamps, line = np.unique(seconds, return_inverse=True)
+        matrix = np.full((len(timestamps), len(symbols)), np.nan)
+        matrix[line, columns] = prices
+
+        # Report du dernier prix connu, colonne par colonne
+        known = ~np.isnan(matrix)
+        last_known = np.where(known, np.arange(len(timestamps))[:, None], 0)
+        np.maximum.accumulate(last_known, axis=0, out=last_known)
+        matrix = matrix[last_known, np.arange(len(symbols))]
+
+        complete = ~np.isnan(matrix).any(axis=1)
+        if not complete.any() or (matrix[complete] <= 0).any():
+            return None
+        return matrix[complete], timestamps[complete]
@@ -0,0 +1,216 @@
+"""
+Search - Index de recherche des actifs (autocomplétion)
+
+Index en mémoire par utilisateur : listes triées de clés (symboles, mots du
+nom) parcourues par dichotomie (bisect), soit O(log n + résultats) par
+recherche de préfixe. L'univers global des symboles est indexé de la même
+façon. Chaque index a son compteur (cache Django), changé seulement quand
+ses symboles ou ses noms peuvent changer : les ticks de prix et les
+quantités ne provoquent aucune reconstruction.
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from ..models import Asset
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Découper un texte normalisé en mots alphanumériques"""
+    return ''.join(char if char.isalnum() else ' ' for char in normalize(text)).split()
+
+
+class SearchIndex:
+    """
+    Index de préfixes sur les symboles et les mots des noms.
+
+    Les entrées sont (clé de résultat, symbole, nom) ; la clé est l'ID de
+    l'actif pour un portefeuille, le symbole pour l'univers global.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, str, str]]):
+        symbols, tokens = [], []
+        self.entries = {}
+        for key, symbol, name in entries:
+            symbol = symbol.upper()
+            self.entries[key] = (symbol, name)
+            symbols.append((symbol, key))
+            tokens.extend((token, key) for token in set(tokenize(name)))
+        symbols.sort(key=lambda item: item[0])
+        tokens.sort(key=lambda item: item[0])
+        self._symbol_keys = [item[0] for item in symbols]
+        self._symbol_values = [item[1] for item in symbols]
+        self._token_keys = [item[0] for item in tokens]
+        self._token_values = [item[1] for item in tokens]
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> range:
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\uffff', lo=start)
+        return range(start, end)
+
+    def search(self, query: str, limit: int = 20) -> List[Hashable]:
+        """
+        Rechercher par préfixe de symbole ou par préfixes de mots du nom
+
+        Classement : symbole exact, préfixe de symbole (les plus courts
+        d'abord), puis noms dont chaque mot de la requête préfixe un mot.
+
+        Returns:
+            Clés des résultats, au plus `limit`
+        """
+        query = query.strip()
+        if not query:
+            return []
+        results, seen = [], set()
+
+        def add(key) -> bool:
+            if key not in seen:
+                seen.add(key)
+                results.append(key)
+            return len(results) >= limit
+
+        prefix = query.upper()
+        matches = self._prefix_range(self._symbol_keys, prefix)
+        # Les symboles exacts sont en tête de plage, puis par longueur croissante
+        ordered = sorted(matches, key=lambda index: (len(self._symbol_keys[index]), self._symbol_keys[index]))
+        for index in ordered:
+            if add(self._symbol_values[index]):
+                return results
+
+        words = tokenize(query)
+        if not words:
+            return results
+        candidates: Optional[set] = None
+        for word in sorted(words, key=len, reverse=True):
+            keys = {self._token_values[index] for index in self._prefix_range(self._token_keys, word)}
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                return results
+        for key in sorted(candidates, key=lambda key: self.entries[key]):
+            if add(key):
+                break
+        return results
+
+
+class SearchService:
+    """Index de recherche mémorisés, invalidés par la version des données"""
+
+    MAX_INDEXES = 1000
+    UNIVERSE = 'universe'
+    UNIVERSE_VERSION_KEY = 'portfolio:search:universe'
+    USER_VERSION_KEY = 'portfolio:search:user:{user_id}'
+    # Écritures d'autres processus avec un cache par processus (locmem) : vues au plus tard après ce délai (s)
+    MAX_AGE = 300
+    # Champs dont la modification change les index (symboles et noms)
+    INDEXED_FIELDS = frozenset({'symbol', 'name'})
+
+    _lock = threading.Lock()
+    _indexes: 'OrderedDict[Hashable, Tuple[object, SearchIndex]]' = OrderedDict()
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._indexes.clear()
+
+    @classmethod
+    def get_version(cls, key: str):
+        """
+        Version courante d'un index (initialisée si absente du cache), avec
+        une tranche de MAX_AGE secondes : reconstruction périodique
+        """
+        version = cache.get(key)
+        if version is None:
+            # Valeur neuve (horloge) : jamais égale à celle d'un index construit avant l'éviction
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version, int(time.monotonic() // cls.MAX_AGE)
+
+    @classmethod
+    def bump(cls, user_ids: Iterable[int] = (), fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Invalider l'univers et les index des utilisateurs après une écriture sur leurs actifs
+
+        Args:
+            user_ids: Utilisateurs dont les actifs ont été écrits
+            fields: Champs écrits (None = création ou suppression) ; sans
+                symbole ni nom (prix, quantité...), les index sont inchangés
+        """
+        if fields is not None and not cls.INDEXED_FIELDS.intersection(fields):
+            return
+        try:
+            cache.incr(cls.UNIVERSE_VERSION_KEY)
+        except ValueError:
+            cache.add(cls.UNIVERSE_VERSION_KEY, time.time_ns(), None)
+        # Clé supprimée : la prochaine lecture la réinitialise à une valeur neuve
+        cache.delete_many([cls.USER_VERSION_KEY.format(user_id=user_id) for user_id in set(user_ids)])
+
+    @classmethod
+    def _get_index(cls, cache_key: Hashable, version, load) -> SearchIndex:
+        with cls._lock:
+            cached = cls._indexes.get(cache_key)
+            if cached is not None and cached[0] == version:
+                cls._indexes.move_to_end(cache_key)
+                return cached[1]
+        index = SearchIndex(load())
+        with cls._lock:
+            cls._indexes[cache_key] = (version, index)
+            cls._indexes.move_to_end(cache_key)
+            while len(cls._indexes) > cls.MAX_INDEXES:
+                cls._indexes.popitem(last=False)
+        return index
+
+    def search_user(self, user_id: int, query: str, limit: int = 20) -> List[Asset]:
+        """
+        Rechercher dans les actifs d'un utilisateur
+
+        Returns:
+            Actifs correspondants, dans l'ordre de pertinence
+        """
+        index = self._get_index(
+            user_id,
+            self.get_version(self.USER_VERSION_KEY.format(user_id=user_id)),
+            lambda: Asset.objects.filter(user_id=user_id).values_list('id', 'symbol', 'name').order_by()
+        )
+        ids = index.search(query, limit)
+        if not ids:
+            return []
+        # Filtré par utilisateur même si l'index l'est déjà (comme find_by_ids)
+        assets = Asset.objects.filter(user_id=user_id).in_bulk(ids)
+        return [assets[asset_id] for asset_id in ids if asset_id in assets]
+
+    def search_universe(self, query: str, limit: int = 20) -> List[dict]:
+        """
+        Rechercher dans l'univers des symboles (tous portefeuilles confondus)
+
+        Returns:
+            [{'symbol', 'name'}] dans l'ordre de pertinence
+        """
+        version = self.get_version(self.UNIVERSE_VERSION_KEY)
+
+        def load():
+            names = {}
+            for symbol, name in Asset.objects.values_list('symbol', 'name').distinct().order_by():
+                names.setdefault(symbol.upper(), name)
+            return ((symbol, symbol, name) for symbol, name in names.items())
+
+        index = self._get_index(self.UNIVERSE, version, load)
+        return [
+            {'symbol': symbol, 'name': index.entries[symbol][1]}
+            for symbol in index.search(query, limit)
+        ]
@@ -0,0 +1,172 @@
+"""
+Simulator - Trajectoires de prix simulées (mouvement brownien géométrique)
+
+Génère des prix corrélés pour tous les symboles présents dans Asset,
+entièrement vectorisé avec NumPy : un pas de simulation pour N symboles
+est un seul tirage gaussien de taille N. Sert aux tests de charge
+(flux de ticks pour ingest_prices) et au remplissage de l'historique.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from django.db.models import Avg, Max
+from django.utils import timezone
+
+from ..models import Asset, PricePoint
+
+# Volatilité annuelle par défaut selon le type d'actif
+DEFAULT_VOLATILITY: Dict[str, float] = {
+    Asset.AssetType.STOCK: 0.25,
+    Asset.AssetType.BOND: 0.05,
+    Asset.AssetType.CRYPTO: 0.80,
+}
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class MarketSimulator:
+    """
+    Mouvement brownien géométrique multi-symboles.
+
+    La corrélation suit un modèle à un facteur : chaque choc est
+    sqrt(rho) * facteur de marché + sqrt(1 - rho) * choc propre, ce qui
+    donne une corrélation constante rho entre tous les symboles sans
+    matrice N x N (coût O(N) par pas).
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        prices: Sequence[float],
+        volatility: Sequence[float],
+        drift: float = 0.05,
+        correlation: float = 0.3,
+        dt: float = 1.0 / SECONDS_PER_YEAR,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            symbols: Symboles simulés
+            prices: Prix initiaux (même ordre que symbols)
+            volatility: Volatilités annuelles (même ordre que symbols)
+            drift: Rendement annuel moyen
+            correlation: Corrélation entre symboles, dans [0, 1]
+            dt: Durée d'un pas en années (par défaut une seconde)
+            seed: Graine du générateur (trajectoires reproductibles)
+
+        Raises:
+            ValueError: Si les paramètres sont incohérents
+        """
+        if not 0 <= correlation <= 1:
+            raise ValueError("La corrélation doit être comprise entre 0 et 1")
+        if not (len(symbols) == len(prices) == len(volatility)):
+            raise ValueError("symbols, prices et volatility doivent avoir la même longueur")
+        self.symbols: List[str] = list(symbols)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.volatility = np.asarray(volatility, dtype=np.float64)
+        self.correlation = correlation
+        self.dt = dt
+        self.drift = drift
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_assets(cls, volatility: Optional[float] = None, **kwargs) -> 'MarketSimulator':
+        """
+        Construire le simulateur à partir des symboles présents dans Asset
+        (prix initial = prix courant moyen du symbole)
+
+        Args:
+            volatility: Volatilité unique pour tous les symboles (sinon selon le type d'actif)
+            **kwargs: Paramètres transmis au constructeur
+        """
+        rows = list(
+            Asset.objects.filter(current_price__gt=0).order_by('symbol').values('symbol').annotate(
+                price=Avg('current_price'),
+                asset_type=Max('asset_type')
+            )
+        )
+        return cls(
+            symbols=[row['symbol'] for row in rows],
+            prices=[float(row['price']) for row in rows],
+            volatility=[
+                volatility if volatility is not None else DEFAULT_VOLATILITY.get(row['asset_type'], 0.25)
+                for row in rows
+            ],
+            **kwargs
+        )
+
+    def simulate(self, steps: int) -> np.ndarray:
+        """
+        Avancer de `steps` pas
+
+        Returns:
+            Tableau (steps, nombre de symboles) des prix, la dernière ligne
+            devenant l'état courant du simulateur
+        """
+        count = len(self.symbols)
+        if not steps or not count:
+            return np.empty((steps, count))
+        market = self.rng.standard_normal((steps, 1))
+        idiosyncratic = self.rng.standard_normal((steps, count))
+        shocks = np.sqrt(self.correlation) * market + np.sqrt(1 - self.correlation) * idiosyncratic
+
+        log_returns = (self.drift - 0.5 * self.volatility ** 2) * self.dt \
+            + self.volatility * np.sqrt(self.dt) * shocks
+        path = self.prices * np.exp(np.cumsum(log_returns, axis=0))
+        self.prices = path[-1]
+        return path
+
+    def ticks(self, steps: int, chunk_size: int = 100) -> Iterator[List[str]]:
+        """
+        Produire les ticks pas par pas, au format lu par ingest_prices
+
+        Yields:
+            Lignes "SYMBOLE PRIX" d'un pas de simulation
+        """
+        remaining = steps
+        while remaining:
+            chunk = self.simulate(min(chunk_size, remaining))
+            remaining -= len(chunk)
+            for row in np.round(chunk, 2):
+                yield [f"{symbol} {price:.2f}\n" for symbol, price in zip(self.symbols, row)]
+
+    def backfill(
+        self,
+        steps: int,
+        interval: timedelta,
+        end: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Remplir l'historique des prix (PricePoint) sur `steps` points
+        espacés de `interval`, la trajectoire se terminant au prix courant
+
+        Returns:
+            Nombre de points insérés : les points déjà présents sont ignorés
+            par la base (ignore_conflicts), d'où un comptage avant/après
+            sur la période, bulk_create renvoyant aussi les lignes ignorées
+        """
+        end = end or timezone.now()
+        current = self.prices.copy()
+        path = self.simulate(steps)
+        if not path.size:
+            return 0
+        # Trajectoire recalée pour aboutir au prix courant à `end`
+        path = np.round(path * (current / path[-1]), 2)
+        self.prices = current
+
+        timestamps = [end - interval * (steps - 1 - index) for index in range(steps)]
+        period = PricePoint.objects.filter(timestamp__gte=timestamps[0], timestamp__lte=timestamps[-1])
+        before = period.count()
+        batch = []
+        for index, timestamp in enumerate(timestamps):
+            for symbol, price in zip(self.symbols, path[index]):
+                batch.append(PricePoint(symbol=symbol, timestamp=timestamp, price=Decimal(f"{price:.2f}")))
+            if len(batch) >= batch_size:
+                PricePoint.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            PricePoint.objects.bulk_create(batch, ignore_conflicts=True)
+        return period.count() - before
@@ -0,0 +1,172 @@
+"""
+Unit of Work - Regroupement des écritures d'une opération de service
+
+Les actifs créés, modifiés et supprimés pendant une opération sont
+enregistrés auprès de l'unité de travail au lieu d'être écrits un par un.
+commit() les écrit en une transaction avec une requête par type
+d'écriture : un DELETE ... WHERE id IN par utilisateur, un bulk_update
+limité aux champs modifiés et un bulk_create. Le nombre de requêtes
+dépend des types d'écriture, pas du nombre d'actifs.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db import transaction
+
+from ..models import Asset
+from .interfaces import IAssetRepository
+
+# Champs suivis pour la détection des modifications (updated_at est géré par bulk_update)
+TRACKED_FIELDS = tuple(
+    field.attname for field in Asset._meta.concrete_fields
+    if not field.primary_key and field.attname not in ('created_at', 'updated_at')
+)
+
+
+class UnitOfWork:
+    """
+    Collecte les actifs nouveaux, modifiés et supprimés puis les écrit en lot.
+
+    Utilisable comme gestionnaire de contexte : commit() à la sortie du
+    bloc, rollback() (abandon des écritures en attente) si une exception
+    est levée.
+    """
+
+    def __init__(self, repository: IAssetRepository, batch_size: int = 500):
+        """
+        Args:
+            repository: Repository utilisé pour les écritures en lot
+            batch_size: Nombre de lignes par INSERT / UPDATE
+        """
+        self.repository = repository
+        self.batch_size = batch_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self.new: List[Asset] = []
+        self.dirty: Dict[int, Asset] = {}
+        self.removed: Dict[int, Asset] = {}
+        self._dirty_fields: Dict[int, Set[str]] = {}
+        self._snapshots: Dict[int, Dict[str, Any]] = {}
+
+    def __enter__(self) -> 'UnitOfWork':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def register_clean(self, asset: Asset) -> None:
+        """Mémoriser l'état chargé d'un actif pour détecter ensuite ses modifications"""
+        self._snapshots[asset.id] = {name: getattr(asset, name) for name in TRACKED_FIELDS}
+
+    def register_new(self, asset: Asset) -> None:
+        """Actif à insérer (non sauvegardé, user_id renseigné)"""
+        self.new.append(asset)
+
+    def register_dirty(self, asset: Asset, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Actif modifié à écrire
+
+        Args:
+            asset: Actif sauvegardé, modifié en mémoire
+            fields: Champs modifiés ; par défaut ceux qui diffèrent de l'état
+                enregistré par register_clean
+
+        Raises:
+            ValueError: Si l'actif est supprimé dans cette unité, ou si ses
+                champs ne peuvent pas être déterminés
+        """
+        if asset.id in self.removed:
+            raise ValueError(f"L'actif {asset.id} est déjà supprimé dans cette unité de travail")
+        if fields is None:
+            snapshot = self._snapshots.get(asset.id)
+            if snapshot is None:
+                raise ValueError(f"Champs modifiés inconnus pour l'actif {asset.id} (register_clean manquant)")
+            fields = [name for name, value in snapshot.items() if getattr(asset, name) != value]
+        fields = {Asset._meta.get_field(name).name for name in fields}
+        if not fields:
+            return
+        self.dirty[asset.id] = asset
+        self._dirty_fields.setdefault(asset.id, set()).update(fields)
+
+    def register_removed(self, asset: Asset) -> None:
+        """Actif à supprimer (ses modifications en attente sont abandonnées)"""
+        self.dirty.pop(asset.id, None)
+        self._dirty_fields.pop(asset.id, None)
+        self.removed[asset.id] = asset
+
+    def changed_fields(self) -> Set[str]:
+        """Union des champs modifiés des actifs à mettre à jour"""
+        return set().union(*self._dirty_fields.values())
+
+    def commit(self) -> Dict[str, int]:
+        """
+        Écrire les changements en attente en une transaction
+
+        Les suppressions passent en premier, puis les mises à jour et les
+        insertions, afin qu'un actif recréé avec la même clé (symbole, date)
+        qu'un actif supprimé ne viole pas la contrainte d'unicité.
+
+        Returns:
+            Nombre de lignes supprimées, mises à jour et créées
+
+        Raises:
+            IntegrityError: Si une écriture viole une contrainte (rien n'est appliqué)
+            AssetVersionConflict, Asset.DoesNotExist: Si un actif à mettre à jour
+                a changé depuis sa lecture (rien n'est appliqué)
+        """
+        removed_by_user: Dict[int, List[int]] = defaultdict(list)
+        for asset in self.removed.values():
+            removed_by_user[asset.user_id].append(asset.id)
+
+        counts = {'deleted': 0, 'updated': 0, 'created': 0}
+        if not (self.removed or self.dirty or self.new):
+            return counts
+        # bulk_update incrémente les versions en mémoire : restaurées si la transaction est annulée
+        versions = {asset_id: asset.version for asset_id, asset in self.dirty.items()}
+        try:
+            with transaction.atomic():
+                for user_id, asset_ids in removed_by_user.items():
+                    counts['deleted'] += self.repository.delete_by_ids(user_id, asset_ids)
+                if self.dirty:
+                    counts['updated'] = self.repository.bulk_update(
+                        list(self.dirty.values()), self.changed_fields(), batch_size=self.batch_size
+                    )
+                if self.new:
+                    counts['created'] = len(self.repository.bulk_create(self.new, batch_size=self.batch_size))
+        except Exception:
+            for asset_id, version in versions.items():
+                self.dirty[asset_id].version = version
+            raise
+        self._reset()
+        return counts
+
+    def split(self) -> Iterator[Tuple[Asset, 'UnitOfWork']]:
+        """
+        Une unité de travail par changement en attente, dans l'ordre de
+        commit() : chacune peut être validée (et échouer) séparément
+
+        Yields:
+            (actif, unité ne contenant que son écriture)
+        """
+        for asset in self.removed.values():
+            unit = UnitOfWork(self.repository, self.batch_size)
+            unit.removed[asset.id] = asset
+            yield asset, unit
+        for asset_id, asset in self.dirty.items():
+            unit = UnitOfWork(self.repository, self.batch_size)
+            unit.dirty[asset_id] = asset
+            unit._dirty_fields[asset_id] = set(self._dirty_fields[asset_id])
+            yield asset, unit
+        for asset in self.new:
+            unit = UnitOfWork(self.repository, self.batch_size)
+            unit.new.append(asset)
+            yield asset, unit
+
+    def rollback(self) -> None:
+        """Abandonner les écritures en attente (rien n'a encore été écrit)"""
+        self._reset()
@@ -0,0 +1,91 @@
+"""
+Signaux - Propagation des écritures sur les actifs
+- version du portefeuille (validateur HTTP)
+- bus de streaming (valorisation en temps réel)
+- restauration des portefeuilles archivés à la connexion
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from .models import Asset, PortfolioVersion
+from .services.archive import ArchiveService
+from .services.search import SearchService
+from .streaming import AssetEvent, PriceEvent, event_bus
+
+# Envoyés par les écritures en lot, qui n'émettent pas post_save / post_delete
+# assets_bulk_saved: assets (liste d'Asset créés ou modifiés), fields (champs écrits, None = création)
+assets_bulk_saved = Signal()
+# assets_bulk_deleted: user_id, asset_ids
+assets_bulk_deleted = Signal()
+# Envoyé après une mise à jour des prix courants par symbole (ingestion de marché)
+# prices_updated: prices (dict symbole -> prix)
+prices_updated = Signal()
+
+# Symboles par requête de recherche des détenteurs (DjangoPriceWriter.MAX_SYMBOLS_PER_STATEMENT)
+PRICE_SYMBOLS_PER_QUERY = 300
+
+
+def publish(event) -> None:
+    """Publier sur le bus de streaming une fois la transaction validée"""
+    if event_bus.has_subscribers():
+        transaction.on_commit(lambda: event_bus.publish(event))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def on_user_saved(sender, instance, update_fields=None, **kwargs):
+    """Connexion (last_login mis à jour) : restaurer le portefeuille archivé pour inactivité"""
+    if update_fields and 'last_login' in update_fields:
+        ArchiveService().restore_user(instance.pk)
+
+
+@receiver(post_save, sender=Asset)
+def on_asset_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    """Un actif a été créé ou modifié"""
+    SearchService.bump([instance.user_id], None if created else update_fields)
+    PortfolioVersion.bump([instance.user_id], touch=True)
+    publish(AssetEvent.from_asset(instance))
+
+
+@receiver(post_delete, sender=Asset)
+def on_asset_deleted(sender, instance, origin=None, **kwargs):
+    """Un actif a été supprimé (hors suppression en cascade de l'utilisateur)"""
+    if isinstance(origin, Asset) or getattr(origin, 'model', None) is Asset:
+        PortfolioVersion.bump([instance.user_id], touch=True)
+        SearchService.bump([instance.user_id])
+        publish(AssetEvent(user_id=instance.user_id, asset_id=instance.id, deleted=True))
+
+
+@receiver(assets_bulk_saved)
+def on_assets_bulk_saved(sender, assets, fields=None, **kwargs):
+    """Plusieurs actifs ont été créés ou modifiés en lot"""
+    SearchService.bump({asset.user_id for asset in assets}, fields)
+    PortfolioVersion.bump((asset.user_id for asset in assets), touch=True)
+    for asset in assets:
+        publish(AssetEvent.from_asset(asset))
+
+
+@receiver(assets_bulk_deleted)
+def on_assets_bulk_deleted(sender, user_id, asset_ids, **kwargs):
+    """Plusieurs actifs d'un utilisateur ont été supprimés en lot"""
+    PortfolioVersion.bump([user_id], touch=True)
+    SearchService.bump([user_id])
+    for asset_id in asset_ids:
+        publish(AssetEvent(user_id=user_id, asset_id=asset_id, deleted=True))
+
+
+@receiver(prices_updated)
+def on_prices_updated(sender, prices, **kwargs):
+    """Les prix courants de plusieurs symboles ont changé"""
+    symbols = list(prices)
+    user_ids = set()
+    # Même découpage que DjangoPriceWriter (bump découpe à son tour les détenteurs)
+    for start in range(0, len(symbols), PRICE_SYMBOLS_PER_QUERY):
+        chunk = symbols[start:start + PRICE_SYMBOLS_PER_QUERY]
+        user_ids.update(
+            Asset.objects.filter(symbol__in=chunk).values_list('user_id', flat=True).order_by().distinct()
+        )
+    PortfolioVersion.bump(user_ids)
+    publish(PriceEvent(dict(prices)))
@@ -0,0 +1,305 @@
+"""
+Streaming - Valorisation du portefeuille en temps réel (Server-Sent Events)
+
+Les écritures (signaux Asset, écritures en lot, mises à jour de prix) sont
+publiées sur un bus en mémoire. Chaque client abonné maintient sa propre
+valorisation de manière incrémentale (delta par actif, sans recalculer le
+résumé complet) et reçoit au plus un événement par intervalle.
+
+Le bus ne voit que les écritures du processus qui sert le flux. Les autres
+(ingestion des prix, autres workers, tâches) sont détectées par la version
+du portefeuille (PortfolioVersion, incrémentée par toute écriture), relue
+à chaque intervalle de contrôle : la valorisation est alors rechargée.
+"""
+
+import asyncio
+import json
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .models import Asset, PortfolioVersion
+
+
+@dataclass(frozen=True)
+class AssetEvent:
+    """Un actif a été créé, modifié ou supprimé"""
+
+    user_id: int
+    asset_id: int
+    asset_type: str = ''
+    symbol: str = ''
+    quantity: Decimal = Decimal(0)
+    current_price: Decimal = Decimal(0)
+    deleted: bool = False
+
+    @classmethod
+    def from_asset(cls, asset: Asset, deleted: bool = False) -> 'AssetEvent':
+        return cls(
+            user_id=asset.user_id,
+            asset_id=asset.id,
+            asset_type=asset.asset_type,
+            symbol=asset.symbol,
+            quantity=asset.quantity,
+            current_price=asset.current_price,
+            deleted=deleted,
+        )
+
+
+@dataclass(frozen=True)
+class PriceEvent:
+    """Nouveaux prix courants par symbole"""
+
+    prices: Dict[str, Decimal]
+
+
+class PortfolioValuation:
+    """
+    Valorisation incrémentale d'un portefeuille.
+    Chaque événement est appliqué en O(1) par actif concerné.
+    """
+
+    def __init__(self, user_id: int, rows=()):
+        """
+        Args:
+            user_id: ID de l'utilisateur
+            rows: (id, asset_type, symbol, quantity, current_price) des actifs
+        """
+        self.user_id = user_id
+        self.positions: Dict[int, tuple] = {}
+        self.by_symbol: Dict[str, set] = {}
+        self.by_type: Dict[str, Decimal] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.total = Decimal(0)
+        for asset_id, asset_type, symbol, quantity, price in rows:
+            self._add(asset_id, asset_type, symbol, quantity, price)
+
+    @classmethod
+    def load(cls, user_id: int) -> 'PortfolioValuation':
+        """Charger l'état initial en une requête (colonnes utiles uniquement)"""
+        rows = Asset.objects.filter(user_id=user_id).values_list(
+            'id', 'asset_type', 'symbol', 'quantity', 'current_price'
+        )
+        return cls(user_id, rows)
+
+    def _add(self, asset_id, asset_type, symbol, quantity, price) -> None:
+        value = quantity * price
+        self.positions[asset_id] = (asset_type, symbol, quantity, price)
+        self.by_symbol.setdefault(symbol, set()).add(asset_id)
+        self.by_type[asset_type] = self.by_type.get(asset_type, Decimal(0)) + value
+        self.type_counts[asset_type] = self.type_counts.get(asset_type, 0) + 1
+        self.total += value
+
+    def _remove(self, asset_id) -> None:
+        asset_type, symbol, quantity, price = self.positions.pop(asset_id)
+        value = quantity * price
+        self.by_symbol[symbol].discard(asset_id)
+        if not self.by_symbol[symbol]:
+            del self.by_symbol[symbol]
+        self.by_type[asset_type] -= value
+        self.type_counts[asset_type] -= 1
+        if not self.type_counts[asset_type]:
+            del self.by_type[asset_type]
+            del self.type_counts[asset_type]
+        self.total -= value
+
+    def apply(self, event) -> bool:
+        """
+        Appliquer un événement
+
+        Returns:
+            True si la valorisation a changé
+        """
+        if isinstance(event, PriceEvent):
+            changed = False
+            for symbol, price in event.prices.items():
+                for asset_id in list(self.by_symbol.get(symbol, ())):
+                    asset_type, _, quantity, old_price = self.positions[asset_id]
+                    if old_price != price:
+                        self._remove(asset_id)
+                        self._add(asset_id, asset_type, symbol, quantity, price)
+                        changed = True
+            return changed
+
+        if event.user_id != self.user_id:
+            return False
+        if event.asset_id in self.positions:
+            self._remove(event.asset_id)
+        if not event.deleted:
+            self._add(event.asset_id, event.asset_type, event.symbol, event.quantity, event.current_price)
+        return True
+
+    def snapshot(self) -> Dict:
+        """Valorisation courante (même libellés que le résumé du portefeuille)"""
+        labels = dict(Asset.AssetType.choices)
+        return {
+            'total_value': float(self.total),
+            'asset_count': len(self.positions),
+            'by_type': {
+                labels.get(asset_type, asset_type): float(value)
+                for asset_type, value in sorted(self.by_type.items())
+            },
+        }
+
+
+class ValuationSource:
+    """État du portefeuille en base, commun à tous les processus"""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+
+    def version(self) -> int:
+        """Version courante du portefeuille (lecture par clé primaire)"""
+        return PortfolioVersion.get_validator(self.user_id)[0]
+
+    def load(self) -> Tuple[int, PortfolioValuation]:
+        """
+        Version puis valorisation complète
+
+        La version est lue avant les actifs : une écriture concurrente
+        est au pire rechargée une seconde fois, jamais manquée.
+        """
+        version = self.version()
+        return version, PortfolioValuation.load(self.user_id)
+
+
+class Subscription:
+    """File d'événements d'un client, alimentée depuis n'importe quel thread"""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.pending: List = []
+        self.ready = asyncio.Event()
+
+    def push(self, event) -> None:
+        """Ajouter un événement (à appeler dans la boucle du client)"""
+        self.pending.append(event)
+        self.ready.set()
+
+    def drain(self) -> List:
+        """Retirer tous les événements en attente"""
+        events, self.pending = self.pending, []
+        self.ready.clear()
+        return events
+
+
+class PortfolioEventBus:
+    """
+    Publisher en mémoire (par processus).
+    Les publications sont thread-safe : elles sont transférées dans la boucle
+    asyncio de chaque abonné via call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, set] = {}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def publish(self, event) -> None:
+        """Publier un AssetEvent (abonnés de l'utilisateur) ou un PriceEvent (tous les abonnés)"""
+        with self._lock:
+            if isinstance(event, PriceEvent):
+                targets = [s for subscriptions in self._subscriptions.values() for s in subscriptions]
+            else:
+                targets = list(self._subscriptions.get(event.user_id, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Boucle fermée : client déconnecté
+                self.unsubscribe(subscription)
+
+
+event_bus = PortfolioEventBus()
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Formater un message Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def valuation_stream(
+    source: ValuationSource,
+    bus: PortfolioEventBus,
+    interval: float = 1.0,
+    heartbeat: float = 15.0,
+    poll_interval: float = 2.0,
+    max_events: Optional[int] = None
+):
+    """
+    Générateur SSE : un premier message avec la valorisation complète,
+    puis au plus un message par `interval` secondes quand elle change.
+
+    Args:
+        source: Portefeuille suivi (chargement et version en base)
+        bus: Bus des écritures du processus (abonnement le temps du flux)
+        interval: Intervalle minimal entre deux messages (coalescence)
+        heartbeat: Délai après lequel un commentaire keep-alive est envoyé
+        poll_interval: Intervalle de relecture de la version (écritures des autres processus)
+        max_events: Arrêter après N messages de valorisation (tests)
+    """
+    loop = asyncio.get_running_loop()
+    subscription = None
+    sent = 0
+    try:
+        # S'abonner avant de charger l'état initial : aucun événement n'est perdu
+        subscription = bus.subscribe(source.user_id)
+        version, valuation = await sync_to_async(source.load)()
+        snapshot = valuation.snapshot()
+        yield format_sse('valuation', snapshot)
+        sent += 1
+        last_sent = last_output = last_poll = loop.time()
+        while max_events is None or sent < max_events:
+            wait = min(last_poll + poll_interval, last_output + heartbeat) - loop.time()
+            try:
+                await asyncio.wait_for(subscription.ready.wait(), timeout=max(wait, 0))
+            except asyncio.TimeoutError:
+                pass
+
+            poll_due = loop.time() - last_poll >= poll_interval
+            if subscription.ready.is_set() or poll_due:
+                # Coalescence : on laisse s'accumuler les événements jusqu'à la fin de l'intervalle
+                delay = interval - (loop.time() - last_sent)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            changed = False
+            for event in subscription.drain():
+                changed = valuation.apply(event) or changed
+            if poll_due:
+                last_poll = loop.time()
+                if await sync_to_async(source.version)() != version:
+                    # Écriture d'un autre processus (ingestion des prix, autre worker)
+                    version, valuation = await sync_to_async(source.load)()
+                    changed = True
+
+            if changed and valuation.snapshot() != snapshot:
+                snapshot = valuation.snapshot()
+                yield format_sse('valuation', snapshot)
+                sent += 1
+                last_sent = last_output = loop.time()
+            elif loop.time() - last_output >= heartbeat:
+                yield ': keep-alive\n\n'
+                last_output = loop.time()
+    finally:
+        if subscription is not None:
+            bus.unsubscribe(subscription)
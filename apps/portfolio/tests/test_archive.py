@@ -0,0 +1,130 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import ArchivedAsset, Asset, PortfolioVersion
+from ..services.archive import ArchiveService
+from ..services.market_data import DjangoPriceWriter
+
+User = get_user_model()
+
+
+class ArchiveTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.apple = self.create_asset(self.user, 'AAPL', '2024-01-15')
+        self.sold = self.create_asset(self.user, 'MSFT', '2023-06-01', quantity=Decimal('0'))
+        self.client.force_authenticate(user=self.user)
+
+    def create_asset(self, user, symbol, purchase_date, quantity=Decimal('10')):
+        return Asset.objects.create(
+            user=user,
+            asset_type='STOCK',
+            symbol=symbol,
+            name=symbol,
+            quantity=quantity,
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date=purchase_date
+        )
+
+    def make_dormant(self, username):
+        long_ago = timezone.now() - timedelta(days=400)
+        user = User.objects.create_user(username=username, email=f'{username}@example.com', password='testpass123')
+        User.objects.filter(id=user.id).update(date_joined=long_ago, last_login=long_ago)
+        self.create_asset(user, 'BTC', '2022-01-01')
+        self.create_asset(user, 'ETH', '2022-02-01')
+        PortfolioVersion.objects.filter(user=user).update(updated_at=long_ago, touched_at=long_ago)
+        return user
+
+    def test_closed_lots_are_moved_in_batches(self):
+        for index in range(4):
+            self.create_asset(self.user, f'OLD{index}', f'2022-01-0{index + 1}', quantity=Decimal('0'))
+        version = PortfolioVersion.get_validator(self.user.id)[0]
+
+        moved = list(ArchiveService(batch_size=2).iter_archive(
+            ArchiveService().closed_lots(), ArchivedAsset.Reason.CLOSED
+        ))
+        self.assertEqual(moved, [2, 2, 1])
+        self.assertEqual(list(Asset.objects.filter(user=self.user)), [self.apple])
+
+        archived = ArchivedAsset.objects.get(id=self.sold.id)
+        self.assertEqual((archived.symbol, archived.reason), ('MSFT', ArchivedAsset.Reason.CLOSED))
+        self.assertEqual(archived.created_at, self.sold.created_at)
+        self.assertGreater(PortfolioVersion.get_validator(self.user.id)[0], version)
+
+    def test_history_reads_through_archive(self):
+        ArchiveService().archive_closed()
+        response = self.client.get('/api/portfolio/assets/history/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['symbol'] for row in response.data], ['AAPL', 'MSFT'])
+        self.assertEqual([row['archived'] for row in response.data], [False, True])
+        self.assertEqual(response.data[1]['id'], self.sold.id)
+        self.assertEqual(response.data[1]['quantity'], '0.00000000')
+
+        response = self.client.get('/api/portfolio/assets/history/', {'purchase_date_before': '2023-12-31'})
+        self.assertEqual([row['symbol'] for row in response.data], ['MSFT'])
+        response = self.client.get('/api/portfolio/assets/history/', {'purchase_date_after': 'hier'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # La liste courante ne contient plus le lot soldé
+        self.assertEqual(len(self.client.get('/api/portfolio/assets/').data), 1)
+
+    def test_dormant_users_are_archived_and_restored_on_login(self):
+        dormant = self.make_dormant('dormant')
+        self.assertEqual(ArchiveService().dormant_user_ids(365), [dormant.id])
+
+        self.assertEqual(ArchiveService().archive_dormant(365), {'users': 1, 'assets': 2})
+        self.assertFalse(Asset.objects.filter(user=dormant).exists())
+        self.assertEqual(ArchivedAsset.objects.filter(user=dormant, reason='DORMANT').count(), 2)
+        created_at = list(ArchivedAsset.objects.filter(user=dormant).values_list('created_at', flat=True))
+
+        self.client.force_authenticate(user=None)
+        response = self.client.post('/api/auth/login/', {'username': 'dormant', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Asset.objects.filter(user=dormant).count(), 2)
+        self.assertFalse(ArchivedAsset.objects.filter(user=dormant).exists())
+        self.assertEqual(
+            sorted(Asset.objects.filter(user=dormant).values_list('created_at', flat=True)), sorted(created_at)
+        )
+
+    def test_active_users_are_not_dormant(self):
+        self.make_dormant('dormant')
+        # Portefeuille modifié récemment : l'utilisateur n'est plus inactif
+        recent = self.make_dormant('recent')
+        PortfolioVersion.bump([recent.id], touch=True)
+        self.assertEqual(len(ArchiveService().dormant_user_ids(365)), 1)
+
+    def test_price_updates_do_not_keep_holders_active(self):
+        dormant = self.make_dormant('dormant')
+        DjangoPriceWriter().write({'BTC': Decimal('50000')})
+        self.assertEqual(ArchiveService().dormant_user_ids(365), [dormant.id])
+
+    def test_restore_skips_reused_keys(self):
+        dormant = self.make_dormant('dormant')
+        ArchiveService().archive_dormant(365)
+        self.create_asset(dormant, 'BTC', '2022-01-01')
+        self.assertEqual(ArchiveService().restore_user(dormant.id), 1)
+        self.assertEqual(ArchivedAsset.objects.get(user=dormant).symbol, 'BTC')
+
+    def test_command(self):
+        self.make_dormant('dormant')
+        out = StringIO()
+        call_command('archive_assets', dry_run=True, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual((report['closed'], report['dormant_users'], report['dormant_assets']), (1, 1, 2))
+        self.assertFalse(ArchivedAsset.objects.exists())
+
+        out = StringIO()
+        call_command('archive_assets', batch_size=1, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual((report['closed'], report['dormant_assets']), (1, 2))
+        self.assertEqual(ArchivedAsset.objects.count(), 3)
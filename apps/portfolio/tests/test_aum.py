@@ -0,0 +1,133 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import ArchivedAsset, Asset
+from ..services.aum import AumService, AumUnavailable
+
+User = get_user_model()
+
+
+class AumTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.rich = User.objects.create_user(username='rich', email='rich@example.com', password='testpass123')
+        # testuser : 1 500 + 500 = 2 000 ; rich : 150 000 + 10 000 = 160 000
+        self.create_asset(self.user, 'STOCK', 'AAPL', '10', '150')
+        self.create_asset(self.user, 'BOND', 'US10Y', '5', '100')
+        self.create_asset(self.rich, 'STOCK', 'AAPL', '1000', '150')
+        self.create_asset(self.rich, 'CRYPTO', 'BTC', '1', '10000')
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def create_asset(self, user, asset_type, symbol, quantity, price):
+        return Asset.objects.create(
+            user=user,
+            asset_type=asset_type,
+            symbol=symbol,
+            name=symbol,
+            quantity=Decimal(quantity),
+            purchase_price=Decimal(price),
+            current_price=Decimal(price),
+            purchase_date='2024-01-15'
+        )
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get('/api/portfolio/aum/').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_dashboard(self):
+        response = self.client.get('/api/portfolio/aum/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_value'], 162000.0)
+        self.assertEqual((response.data['asset_count'], response.data['user_count']), (4, 2))
+        self.assertFalse(response.data['stale'])
+        self.assertEqual(
+            [(row['asset_type'], row['value'], row['count']) for row in response.data['by_asset_type']],
+            [('STOCK', 151500.0, 2), ('CRYPTO', 10000.0, 1), ('BOND', 500.0, 1)]
+        )
+        top = response.data['top_symbols'][0]
+        self.assertEqual((top['symbol'], top['value'], top['holders'], top['share']), ('AAPL', 151500.0, 2, 93.52))
+        self.assertNotIn('asset_type', top)
+        self.assertEqual(
+            [(row['label'], row['users'], row['value']) for row in response.data['user_buckets']],
+            [('<10k', 1, 2000.0), ('10k-100k', 0, 0.0), ('100k-1M', 1, 160000.0), ('>=1M', 0, 0.0)]
+        )
+
+    def test_dormant_archive_is_counted(self):
+        asset = Asset.objects.get(user=self.rich, symbol='BTC')
+        ArchivedAsset.objects.create(
+            **{field.attname: getattr(asset, field.attname) for field in Asset._meta.concrete_fields},
+            closed_at=timezone.now(), reason=ArchivedAsset.Reason.DORMANT
+        )
+        Asset.objects.filter(id=asset.id).delete()
+
+        data = AumService().compute()
+        self.assertEqual((data['total_value'], data['asset_count']), (162000.0, 4))
+        self.assertEqual(data['top_symbols'][1]['symbol'], 'BTC')
+
+    def test_cached_until_stale(self):
+        now = timezone.now()
+        service = AumService(refresh_interval=300, clock=lambda: now)
+        service.get_dashboard()
+        self.create_asset(self.user, 'STOCK', 'MSFT', '1', '100')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(service.get_dashboard()['total_value'], 162000.0)
+
+        later = AumService(refresh_interval=300, clock=lambda: now + timedelta(seconds=301))
+        self.assertEqual(later.get_dashboard()['total_value'], 162100.0)
+
+    def test_stale_snapshot_served_during_refresh(self):
+        now = timezone.now()
+        AumService(clock=lambda: now).get_dashboard()
+        # Recalcul déjà en cours dans une autre requête
+        cache.add(AumService.LOCK_KEY, True)
+        with self.assertNumQueries(0):
+            dashboard = AumService(clock=lambda: now + timedelta(seconds=301)).get_dashboard()
+        self.assertTrue(dashboard['stale'])
+
+    def test_cold_cache_is_computed_once(self):
+        # Calcul lancé par une autre requête, cache encore vide
+        cache.add(AumService.LOCK_KEY, True)
+        with self.assertNumQueries(0), self.assertRaises(AumUnavailable):
+            AumService(wait_timeout=0.3, sleep=lambda seconds: None).get_dashboard()
+        with override_settings(PORTFOLIO_AUM_WAIT_TIMEOUT=0):
+            response = self.client.get('/api/portfolio/aum/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '5')
+
+        # Résultat publié pendant l'attente
+        def sleep(seconds):
+            cache.set(AumService.CACHE_KEY, {'computed_at': timezone.now(), 'total_value': 1.0}, None)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(AumService(sleep=sleep).get_dashboard()['total_value'], 1.0)
+
+    def test_empty(self):
+        Asset.objects.all().delete()
+        data = AumService().compute()
+        self.assertEqual((data['total_value'], data['user_count'], data['top_symbols']), (0, 0, []))
+
+    def test_command(self):
+        out = StringIO()
+        call_command('refresh_aum', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['total_value'], 162000.0)
+        with self.assertNumQueries(0):
+            self.client.get('/api/portfolio/aum/')
@@ -0,0 +1,196 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from django.db import transaction
+from ..models import Asset, PortfolioVersion
+from ..services.repositories import AssetVersionConflict, DjangoAssetRepository
+
+User = get_user_model()
+
+
+class AssetBatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.apple = Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+        self.bitcoin = Asset.objects.create(
+            user=self.user,
+            asset_type='CRYPTO',
+            symbol='BTC',
+            name='Bitcoin',
+            quantity=Decimal('0.5'),
+            purchase_price=Decimal('40000'),
+            current_price=Decimal('50000'),
+            purchase_date='2024-01-01'
+        )
+        self.foreign = Asset.objects.create(
+            user=self.other_user,
+            asset_type='STOCK',
+            symbol='MSFT',
+            name='Microsoft',
+            quantity=Decimal('5'),
+            purchase_price=Decimal('300'),
+            current_price=Decimal('350'),
+            purchase_date='2024-01-15'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.create_data = {
+            'asset_type': 'BOND',
+            'symbol': 'US10Y',
+            'name': 'US Treasury',
+            'quantity': '5',
+            'purchase_price': '100',
+            'current_price': '102',
+            'purchase_date': '2024-01-20'
+        }
+
+    def post(self, operations, atomic=True):
+        return self.client.post(
+            '/api/portfolio/assets/batch/',
+            {'atomic': atomic, 'operations': operations},
+            format='json'
+        )
+
+    def test_mixed_batch(self):
+        version = PortfolioVersion.get_validator(self.user.id)[0]
+        # 1 SELECT des cibles + INSERT, UPDATE, DELETE (et leur version) + savepoint
+        with self.assertNumQueries(9):
+            response = self.post([
+                {'op': 'create', 'data': self.create_data},
+                {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200'}},
+                {'op': 'delete', 'id': self.bitcoin.id},
+            ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        self.assertEqual([r['status'] for r in response.data['results']], [201, 200, 204])
+        self.assertEqual(response.data['results'][0]['asset']['symbol'], 'US10Y')
+
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.current_price, Decimal('200'))
+        self.assertFalse(Asset.objects.filter(id=self.bitcoin.id).exists())
+        self.assertTrue(Asset.objects.filter(user=self.user, symbol='US10Y').exists())
+        self.assertGreater(PortfolioVersion.get_validator(self.user.id)[0], version)
+
+    def test_atomic_batch_rolls_back_on_invalid_operation(self):
+        response = self.post([
+            {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200'}},
+            {'op': 'update', 'id': self.bitcoin.id, 'data': {'quantity': '-1'}},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['applied'])
+        self.assertEqual([r['status'] for r in response.data['results']], [424, 400])
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.current_price, Decimal('150'))
+
+    def test_atomic_batch_rejects_foreign_asset(self):
+        response = self.post([
+            {'op': 'delete', 'id': self.apple.id},
+            {'op': 'delete', 'id': self.foreign.id},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([r['status'] for r in response.data['results']], [424, 404])
+        self.assertTrue(Asset.objects.filter(id=self.apple.id).exists())
+        self.assertTrue(Asset.objects.filter(id=self.foreign.id).exists())
+
+    def test_non_atomic_batch_applies_valid_operations(self):
+        response = self.post([
+            {'op': 'delete', 'id': self.apple.id},
+            {'op': 'delete', 'id': self.foreign.id},
+        ], atomic=False)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['status'] for r in response.data['results']], [204, 404])
+        self.assertFalse(Asset.objects.filter(id=self.apple.id).exists())
+
+    def test_non_atomic_batch_reports_write_errors_per_operation(self):
+        duplicate = dict(self.create_data, symbol='AAPL', purchase_date='2024-01-15')
+        response = self.post([
+            {'op': 'create', 'data': self.create_data},
+            {'op': 'create', 'data': duplicate},
+            {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200'}},
+            {'op': 'delete', 'id': self.bitcoin.id},
+        ], atomic=False)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        self.assertEqual([r['status'] for r in response.data['results']], [201, 409, 200, 204])
+        self.assertEqual(response.data['results'][2]['asset']['version'], 2)
+        self.assertTrue(Asset.objects.filter(user=self.user, symbol='US10Y').exists())
+        self.assertEqual(Asset.objects.filter(user=self.user, symbol='AAPL').count(), 1)
+        self.apple.refresh_from_db()
+        self.assertEqual((self.apple.current_price, self.apple.version), (Decimal('200'), 2))
+        self.assertFalse(Asset.objects.filter(id=self.bitcoin.id).exists())
+
+    def test_duplicate_create_conflict(self):
+        duplicate = dict(self.create_data, symbol='AAPL', purchase_date='2024-01-15')
+        response = self.post([
+            {'op': 'create', 'data': self.create_data},
+            {'op': 'create', 'data': duplicate},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Asset.objects.filter(symbol='US10Y').exists())
+
+    def test_same_asset_twice(self):
+        response = self.post([
+            {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200'}},
+            {'op': 'delete', 'id': self.apple.id},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['results'][1]['status'], 400)
+
+    def test_stale_version_is_rejected(self):
+        Asset.objects.filter(id=self.apple.id).update(version=2)
+        response = self.post([
+            {'op': 'update', 'id': self.bitcoin.id, 'data': {'quantity': '1', 'version': 1}},
+            {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200', 'version': 1}},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([r['status'] for r in response.data['results']], [424, 409])
+        self.assertEqual(response.data['results'][1]['current_version'], 2)
+        self.bitcoin.refresh_from_db()
+        self.assertEqual(self.bitcoin.quantity, Decimal('0.5'))
+
+    def test_current_version_is_accepted(self):
+        response = self.post([
+            {'op': 'update', 'id': self.apple.id, 'data': {'current_price': '200', 'version': 1}},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['asset']['version'], 2)
+
+    def test_concurrent_write_after_load_is_a_conflict(self):
+        repository = DjangoAssetRepository()
+        assets = repository.find_by_ids(self.user.id, [self.apple.id, self.bitcoin.id])
+        # Écriture d'une autre requête entre le chargement et le bulk_update
+        Asset.objects.filter(id=self.apple.id).update(version=5)
+        for asset in assets.values():
+            asset.name = 'Renamed'
+        with self.assertRaises(AssetVersionConflict) as conflict, transaction.atomic():
+            repository.bulk_update(list(assets.values()), ['name'])
+        self.assertEqual((conflict.exception.asset_id, conflict.exception.current_version), (self.apple.id, 5))
+        self.assertFalse(Asset.objects.filter(name='Renamed').exists())
+
+    def test_create_ignores_version(self):
+        response = self.post([{'op': 'create', 'data': dict(self.create_data, version=7)}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Asset.objects.get(symbol='US10Y').version, 1)
+
+    def test_empty_batch(self):
+        response = self.post([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from ..models import Asset
+from ..services.benchmark import BenchmarkSuite, compare, measure, sample_records
+
+
+class MeasureTests(SimpleTestCase):
+
+    def test_calibrates_number_of_calls(self):
+        calls = []
+        measurement = measure(lambda: calls.append(1), min_time=0.001, rounds=3)
+        self.assertEqual(measurement['rounds'], 3)
+        self.assertGreater(measurement['number'], 1)
+        self.assertLessEqual(measurement['min_us'], measurement['median_us'])
+        self.assertGreater(len(calls), 3 * measurement['number'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': {'a[10]': {'min_us': 100.0}, 'b[10]': {'min_us': 100.0}, 'c[10]': {'min_us': 100.0}}}
+        results = {'results': {
+            'a[10]': {'min_us': 130.0},
+            'b[10]': {'min_us': 110.0},
+            'c[10]': {'min_us': 50.0},
+            'd[10]': {'min_us': 10.0},
+        }}
+        statuses = {entry['benchmark']: entry['status'] for entry in compare(results, baseline, threshold=0.2)}
+        self.assertEqual(statuses, {'a[10]': 'regression', 'b[10]': 'ok', 'c[10]': 'improvement', 'd[10]': 'new'})
+
+    def test_sample_records_are_deterministic(self):
+        self.assertEqual(sample_records(20, seed=1), sample_records(20, seed=1))
+        self.assertNotEqual(sample_records(20, seed=1), sample_records(20, seed=2))
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def test_run_covers_sizes_and_rolls_back(self):
+        suite = BenchmarkSuite(sizes=[5, 20], min_time=0.0, rounds=1)
+        report = suite.run(only=['calculator.simple_roi', 'service.', 'serializer.summary'])
+        self.assertEqual(
+            sorted(report['results']),
+            sorted(f'{name}[{size}]' for name in
+                   ['calculator.simple_roi', 'service.summary', 'service.performance', 'serializer.summary']
+                   for size in (5, 20))
+        )
+        self.assertFalse(Asset.objects.exists())
+
+    def test_command_saves_baseline_and_detects_regressions(self):
+        options = {'sizes': [5], 'only': 'calculator.absolute_gain', 'min_time': 0.0, 'rounds': 1}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark', baseline=path, save=True, stdout=StringIO(), stderr=StringIO(), **options)
+            with open(path) as handle:
+                baseline = json.load(handle)
+            self.assertIn('calculator.absolute_gain[5]', baseline['results'])
+
+            out = StringIO()
+            call_command('benchmark', baseline=path, threshold=1000, stdout=out, stderr=StringIO(), **options)
+            self.assertEqual(json.loads(out.getvalue())['comparison'][0]['status'], 'ok')
+
+            # Baseline artificiellement rapide : le temps mesuré devient une régression
+            baseline['results']['calculator.absolute_gain[5]']['min_us'] = 1e-6
+            with open(path, 'w') as handle:
+                json.dump(baseline, handle)
+            with self.assertRaisesMessage(CommandError, 'calculator.absolute_gain[5]'):
+                call_command('benchmark', baseline=path, stdout=StringIO(), stderr=StringIO(), **options)
@@ -0,0 +1,206 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..models import Asset
+from ..services import repositories
+from ..services.market_data import DjangoPriceWriter
+from ..services.portfolio_service import PortfolioService
+from ..services.repositories import (
+    CachingAssetRepository,
+    DjangoAssetRepository,
+    DjangoCacheBackend,
+    LRUCache,
+    MISSING,
+    get_asset_repository,
+)
+
+User = get_user_model()
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTests(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set('a', 1)
+        clock.now = 9.9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 10
+        self.assertIs(cache.get('a'), MISSING)
+
+
+class CachingAssetRepositoryTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.asset = self.create_asset(self.user, 'AAPL')
+        self.create_asset(self.other, 'MSFT')
+        self.repository = CachingAssetRepository(DjangoAssetRepository())
+        self.service = PortfolioService(self.repository)
+
+    def create_asset(self, user, symbol):
+        return Asset.objects.create(
+            user=user,
+            asset_type='STOCK',
+            symbol=symbol,
+            name=symbol,
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+
+    def asset_data(self, symbol):
+        return {
+            'asset_type': 'STOCK',
+            'symbol': symbol,
+            'name': symbol,
+            'quantity': Decimal('1'),
+            'purchase_price': Decimal('10'),
+            'current_price': Decimal('20'),
+            'purchase_date': '2024-02-01',
+        }
+
+    def test_reads_are_memoized(self):
+        self.service.get_portfolio_summary(self.user.id)
+        self.service.get_asset_detail(self.user.id, self.asset.id)
+        self.repository.sum_by_type(self.user.id)
+        with self.assertNumQueries(0):
+            summary = self.service.get_portfolio_summary(self.user.id)
+            self.service.get_asset_detail(self.user.id, self.asset.id)
+            self.assertEqual(self.repository.sum_by_type(self.user.id), {'STOCK': Decimal('150')})
+        self.assertEqual(summary['asset_count'], 1)
+
+    def test_cached_instances_are_copies(self):
+        first = self.repository.find_by_id(self.asset.id)
+        first.name = 'Modifié'
+        self.assertEqual(self.repository.find_by_id(self.asset.id).name, 'AAPL')
+        assets = self.repository.find_all_by_user(self.user.id)
+        assets[0].quantity = Decimal('0')
+        self.assertEqual(self.repository.find_all_by_user(self.user.id)[0].quantity, Decimal('10'))
+
+    def test_create_invalidates_only_the_owner(self):
+        self.service.get_portfolio_summary(self.user.id)
+        self.service.get_portfolio_summary(self.other.id)
+
+        self.service.create_asset(self.user.id, self.asset_data('NVDA'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.service.get_portfolio_summary(self.other.id)['asset_count'], 1)
+        self.assertEqual(self.service.get_portfolio_summary(self.user.id)['asset_count'], 2)
+
+    def test_update_and_delete_invalidate(self):
+        self.service.get_portfolio_summary(self.user.id)
+        self.service.update_asset(self.user.id, self.asset.id, {'current_price': Decimal('200')})
+        self.assertEqual(self.service.get_asset_detail(self.user.id, self.asset.id).current_price, Decimal('200'))
+        self.assertEqual(self.service.get_portfolio_summary(self.user.id)['total_current_value'], 2000.0)
+
+        self.service.delete_asset(self.user.id, self.asset.id)
+        self.assertEqual(self.service.get_portfolio_summary(self.user.id)['asset_count'], 0)
+        with self.assertRaises(Asset.DoesNotExist):
+            self.service.get_asset_detail(self.user.id, self.asset.id)
+
+    def test_batch_invalidates(self):
+        self.service.get_portfolio_summary(self.user.id)
+        self.service.get_asset_detail(self.user.id, self.asset.id)
+        results, applied = self.service.apply_batch(self.user.id, [
+            {'op': 'update', 'id': self.asset.id, 'data': {'current_price': Decimal('300')}},
+            {'op': 'create', 'data': self.asset_data('AMZN')},
+        ])
+        self.assertTrue(applied)
+        self.assertEqual(self.service.get_asset_detail(self.user.id, self.asset.id).current_price, Decimal('300'))
+        self.assertEqual(self.service.get_portfolio_summary(self.user.id)['asset_count'], 2)
+
+    def test_hit_rate_stats(self):
+        for _ in range(4):
+            self.repository.find_by_id(self.asset.id)
+        stats = self.repository.stats()
+        self.assertEqual(stats['methods']['find_by_id'], {'hits': 3, 'misses': 1, 'hit_rate': 0.75})
+        self.assertEqual(stats['hit_rate'], 0.75)
+        self.repository.create(self.user.id, self.asset_data('NVDA'))
+        self.assertEqual(self.repository.stats()['invalidations'], 1)
+
+    def test_shared_backend_across_instances(self):
+        backend = DjangoCacheBackend('default', prefix='test-repository')
+        first = CachingAssetRepository(DjangoAssetRepository(), cache=backend)
+        second = CachingAssetRepository(DjangoAssetRepository(), cache=backend)
+        self.assertEqual(len(first.find_all_by_user(self.user.id)), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(second.find_all_by_user(self.user.id)), 1)
+        # Une écriture par une instance invalide la lecture de l'autre
+        first.create(self.user.id, self.asset_data('NVDA'))
+        self.assertEqual(len(second.find_all_by_user(self.user.id)), 2)
+
+    def test_delegates_other_methods(self):
+        self.assertEqual(len(self.repository.find_by_user_and_symbol(self.user.id, 'AAPL')), 1)
+
+
+@override_settings(PORTFOLIO_REPOSITORY_CACHE={'max_entries': 100, 'ttl': 60})
+class SharedCacheInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        repositories._shared_repository = None
+
+    def test_writes_outside_the_repository_invalidate(self):
+        self.assertEqual(self.client.get('/api/portfolio/summary/').data['asset_count'], 0)
+        response = self.client.post('/api/portfolio/assets/', {
+            'asset_type': 'STOCK', 'symbol': 'AAPL', 'name': 'Apple', 'quantity': '10',
+            'purchase_price': '100', 'current_price': '150', 'purchase_date': '2024-01-15',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get('/api/portfolio/summary/').data['asset_count'], 1)
+
+        repository, asset_id = get_asset_repository(), Asset.objects.get(symbol='AAPL').id
+        self.assertEqual(repository.find_by_id(asset_id).current_price, Decimal('150'))
+        DjangoPriceWriter().write({'AAPL': Decimal('180')})
+        self.assertEqual(repository.find_by_id(asset_id).current_price, Decimal('180'))
+        self.assertEqual(self.client.get('/api/portfolio/summary/').data['total_current_value'], 1800.0)
+
+    def test_stats_span_requests(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/portfolio/summary/').status_code, 200)
+        stats = get_asset_repository().stats()
+        # Un échec à la première requête, des succès aux suivantes
+        self.assertEqual(stats['hits'], 2 * stats['misses'])
+
+
+class GetAssetRepositoryTests(SimpleTestCase):
+
+    def tearDown(self):
+        repositories._shared_repository = None
+
+    def test_disabled_by_default(self):
+        self.assertIsInstance(get_asset_repository(), DjangoAssetRepository)
+
+    @override_settings(PORTFOLIO_REPOSITORY_CACHE={'max_entries': 10, 'ttl': 5})
+    def test_enabled_shares_one_repository(self):
+        first, second = get_asset_repository(), get_asset_repository()
+        self.assertIsInstance(first, CachingAssetRepository)
+        self.assertIs(first, second)
+        self.assertEqual(first.cache.max_entries, 10)
@@ -0,0 +1,84 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from ..models import Asset, PortfolioVersion
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.asset = Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_endpoints_return_304_when_unchanged(self):
+        urls = [
+            '/api/portfolio/assets/',
+            f'/api/portfolio/assets/{self.asset.id}/',
+            '/api/portfolio/assets/summary/',
+            '/api/portfolio/assets/performance/',
+            '/api/portfolio/summary/',
+            '/api/portfolio/performance/',
+        ]
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(response['ETag'], etag)
+
+    def test_304_skips_asset_queries(self):
+        etag = self.client.get('/api/portfolio/summary/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/portfolio/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update_changes_etag(self):
+        etag = self.client.get('/api/portfolio/assets/')['ETag']
+        self.client.patch(f'/api/portfolio/assets/{self.asset.id}/', {'current_price': Decimal('200')})
+        response = self.client.get('/api/portfolio/assets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete_changes_etag(self):
+        etag = self.client.get('/api/portfolio/assets/')['ETag']
+        self.client.delete(f'/api/portfolio/assets/{self.asset.id}/')
+        response = self.client.get('/api/portfolio/assets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 0)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get('/api/portfolio/summary/')['Last-Modified']
+        response = self.client.get('/api/portfolio/summary/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bump_creates_and_increments(self):
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.assertEqual(PortfolioVersion.get_validator(other_user.id), (0, None))
+        PortfolioVersion.bump([other_user.id])
+        PortfolioVersion.bump([other_user.id])
+        self.assertEqual(PortfolioVersion.get_validator(other_user.id)[0], 2)
+
+    def test_user_deletion_cascades(self):
+        self.user.delete()
+        self.assertFalse(PortfolioVersion.objects.exists())
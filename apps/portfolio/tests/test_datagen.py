@@ -0,0 +1,79 @@
+from datetime import date
+from io import StringIO
+import json
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from ..models import Asset
+from ..services.datagen import DatasetGenerator, make_symbol
+
+User = get_user_model()
+
+
+class DatasetGeneratorTests(TestCase):
+
+    def make_generator(self, seed=42, **kwargs):
+        return DatasetGenerator(seed=seed, end_date=date(2026, 1, 1), **kwargs)
+
+    def test_same_seed_same_lots(self):
+        user_ids = np.arange(1, 201)
+        first = self.make_generator().generate_lots(user_ids)
+        second = self.make_generator().generate_lots(user_ids)
+        for column in first:
+            np.testing.assert_array_equal(first[column], second[column])
+        other = self.make_generator(seed=7).generate_lots(user_ids)
+        self.assertFalse(np.array_equal(first['symbol'], other['symbol']))
+
+    def test_distribution(self):
+        lots = self.make_generator(mean_assets=40).generate_lots(np.arange(2000))
+        sizes = np.bincount(lots['user_id'])
+        # Tailles asymétriques : la moyenne est tirée par quelques gros portefeuilles
+        self.assertAlmostEqual(sizes.mean(), 40, delta=6)
+        self.assertGreater(sizes.max(), 5 * np.median(sizes))
+        shares = np.bincount(lots['type'], minlength=3) / len(lots['type'])
+        np.testing.assert_allclose(shares, [0.60, 0.25, 0.15], atol=0.05)
+        self.assertTrue((lots['purchase_price'] > 0).all())
+        self.assertTrue((lots['quantity'] > 0).all())
+
+    def test_symbols_are_disjoint_between_types(self):
+        symbols = {make_symbol(asset_type, index) for asset_type in Asset.AssetType.values for index in range(500)}
+        self.assertEqual(len(symbols), 1500)
+        self.assertTrue(all(len(symbol) <= 10 for symbol in symbols))
+
+    def test_populate_creates_users_and_lots(self):
+        generator = self.make_generator(mean_assets=20, lots_per_position=4)
+        batches = list(generator.populate(30, prefix='gen_', user_batch=12, batch_size=200))
+
+        self.assertEqual([users for users, _ in batches], [12, 12, 6])
+        self.assertEqual(User.objects.filter(username__startswith='gen_').count(), 30)
+        self.assertEqual(Asset.objects.count(), sum(assets for _, assets in batches))
+        user = User.objects.get(username='gen_0000000')
+        self.assertTrue(user.check_password('synthetic'))
+        # Plusieurs lots par symbole, jamais deux lots à la même date
+        lots = Asset.objects.values('user', 'symbol').annotate(count=Count('id'))
+        self.assertGreater(max(entry['count'] for entry in lots), 1)
+        self.assertFalse(
+            Asset.objects.values('user', 'symbol', 'purchase_date').annotate(count=Count('id')).filter(count__gt=1)
+        )
+
+
+class GenerateDatasetCommandTests(TestCase):
+
+    def test_command_and_reset(self):
+        out = StringIO()
+        call_command('generate_dataset', users=5, mean_assets=10, seed=1, prefix='cmd_', stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['users'], 5)
+        self.assertEqual(Asset.objects.count(), report['assets'])
+
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', users=5, prefix='cmd_', stdout=StringIO(), stderr=StringIO())
+
+        call_command('generate_dataset', users=3, mean_assets=10, seed=1, prefix='cmd_', reset=True,
+                     stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='cmd_').count(), 3)
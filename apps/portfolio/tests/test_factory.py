@@ -129,3 +129,59 @@ class AssetFactoryTests(TestCase):
                 current_price=Decimal('100'),
                 purchase_date='2024-01-01'
             )
+
+
+class AssetFactoryCreateManyTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def make_record(self, asset_type, symbol, **overrides):
+        record = {
+            'asset_type': asset_type,
+            'user_id': self.user.id,
+            'symbol': symbol,
+            'name': symbol,
+            'quantity': Decimal('1'),
+            'purchase_price': Decimal('100'),
+            'current_price': Decimal('110'),
+            'purchase_date': '2024-01-01',
+        }
+        record.update(overrides)
+        return record
+
+    def test_create_many_batches_inserts(self):
+        types = ['STOCK', 'BOND', 'CRYPTO']
+        records = [self.make_record(types[i % 3], f'SYM{i}') for i in range(90)]
+        # Savepoint + INSERT par lot + version du portefeuille (UPDATE puis INSERT)
+        with self.assertNumQueries(6):
+            assets = AssetFactory.create_many(records, batch_size=50)
+
+        self.assertEqual(len(assets), 90)
+        self.assertEqual([asset.symbol for asset in assets], [f'SYM{i}' for i in range(90)])
+        self.assertEqual(Asset.objects.filter(user=self.user, asset_type='BOND').count(), 30)
+
+    def test_create_many_unknown_type_writes_nothing(self):
+        records = [self.make_record('STOCK', 'AAPL'), self.make_record('UNKNOWN', 'X')]
+        with self.assertRaises(ValueError):
+            AssetFactory.create_many(records)
+        self.assertFalse(Asset.objects.exists())
+
+    def test_create_many_custom_type_without_builder(self):
+        def create_legacy(user_id, **kwargs):
+            return Asset.objects.create(user_id=user_id, asset_type='STOCK', **kwargs)
+
+        AssetFactory.register('LEGACY', create_legacy)
+        self.addCleanup(AssetFactory._creators.pop, 'LEGACY')
+
+        assets = AssetFactory.create_many([
+            self.make_record('CRYPTO', 'BTC'),
+            self.make_record('LEGACY', 'OLD'),
+            self.make_record('STOCK', 'AAPL'),
+        ])
+        self.assertEqual([asset.symbol for asset in assets], ['BTC', 'OLD', 'AAPL'])
+        self.assertTrue(all(asset.pk for asset in assets))
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework import status
+from decimal import Decimal
+from ..models import Asset
+
+User = get_user_model()
+
+
+class AssetFilteringTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        # symbole, type, quantité, prix d'achat, prix actuel, date d'achat
+        rows = [
+            ('AAPL', 'STOCK', '10', '100', '150', '2024-01-15'),   # valeur 1500, +50 %
+            ('MSFT', 'STOCK', '5', '400', '380', '2024-03-01'),    # valeur 1900, -5 %
+            ('BTC', 'CRYPTO', '0.1', '20000', '50000', '2023-06-01'),  # valeur 5000, +150 %
+            ('US10Y', 'BOND', '20', '100', '101', '2024-06-01'),   # valeur 2020, +1 %
+        ]
+        for symbol, asset_type, quantity, purchase_price, current_price, purchase_date in rows:
+            Asset.objects.create(
+                user=self.user,
+                asset_type=asset_type,
+                symbol=symbol,
+                name=symbol,
+                quantity=Decimal(quantity),
+                purchase_price=Decimal(purchase_price),
+                current_price=Decimal(current_price),
+                purchase_date=purchase_date
+            )
+
+    def symbols(self, query):
+        response = self.client.get(f'/api/portfolio/assets/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [asset['symbol'] for asset in response.data]
+
+    def test_filter_by_type_and_symbol(self):
+        self.assertEqual(sorted(self.symbols('asset_type=STOCK')), ['AAPL', 'MSFT'])
+        self.assertEqual(sorted(self.symbols('asset_type=BOND,CRYPTO')), ['BTC', 'US10Y'])
+        self.assertEqual(self.symbols('symbol=MSFT'), ['MSFT'])
+
+    def test_filter_by_date_range(self):
+        self.assertEqual(
+            sorted(self.symbols('purchase_date_after=2024-01-01&purchase_date_before=2024-03-31')),
+            ['AAPL', 'MSFT']
+        )
+
+    def test_filter_by_computed_metrics(self):
+        self.assertEqual(sorted(self.symbols('min_value=1900&max_value=2100')), ['MSFT', 'US10Y'])
+        self.assertEqual(self.symbols('max_performance=0'), ['MSFT'])
+        self.assertEqual(sorted(self.symbols('min_gain_loss=100')), ['AAPL', 'BTC'])
+
+    def test_ordering_by_computed_metrics(self):
+        self.assertEqual(self.symbols('ordering=-performance_percentage'), ['BTC', 'AAPL', 'US10Y', 'MSFT'])
+        self.assertEqual(self.symbols('ordering=current_value'), ['AAPL', 'MSFT', 'US10Y', 'BTC'])
+        self.assertEqual(self.symbols('ordering=-gain_loss&asset_type=STOCK'), ['AAPL', 'MSFT'])
+        self.assertEqual(self.symbols('ordering=asset_type,symbol'), ['US10Y', 'BTC', 'AAPL', 'MSFT'])
+
+    def test_single_query(self):
+        with self.assertNumQueries(2):
+            # Version du portefeuille (ETag) + liste filtrée et triée
+            self.symbols('min_performance=10&ordering=-current_value')
+
+    def test_invalid_params(self):
+        for query in ('asset_type=GOLD', 'min_value=abc', 'purchase_date_after=2024-13-01', 'ordering=password'):
+            response = self.client.get(f'/api/portfolio/assets/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
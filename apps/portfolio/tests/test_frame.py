@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..models import Asset
+from ..services.calculators import AbsoluteGainCalculator, AnnualizedReturnCalculator, SimpleROICalculator
+from ..services.frame import PortfolioFrame
+from ..services.interfaces import IPerformanceCalculator
+from ..services.portfolio_service import PortfolioService
+from ..services.repositories import DjangoAssetRepository
+
+User = get_user_model()
+
+
+class DoubleValueCalculator(IPerformanceCalculator):
+    """Calculator sans version vectorisée : calculate_many passe par calculate"""
+
+    def calculate(self, asset) -> float:
+        return float(asset.quantity * asset.current_price) * 2
+
+
+class PortfolioFrameTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        rows = [
+            ('AAPL', 'STOCK', '10', '100.00', '150.00', 400),
+            ('AAPL', 'STOCK', '5', '120.00', '150.00', 100),
+            ('BTC', 'CRYPTO', '0.12345678', '20000.00', '50000.00', 800),
+            ('US10Y', 'BOND', '20', '100.00', '99.50', 30),
+            ('ZERO', 'STOCK', '3', '0.00', '10.00', 10),
+        ]
+        for symbol, asset_type, quantity, purchase_price, current_price, age in rows:
+            Asset.objects.create(
+                user=self.user,
+                asset_type=asset_type,
+                symbol=symbol,
+                name=f'{symbol} name',
+                quantity=Decimal(quantity),
+                purchase_price=Decimal(purchase_price),
+                current_price=Decimal(current_price),
+                purchase_date=date.today() - timedelta(days=age)
+            )
+        self.repository = DjangoAssetRepository()
+        self.assets = list(self.repository.find_all_by_user(self.user.id))
+
+    def test_single_query_and_interned_columns(self):
+        with self.assertNumQueries(1):
+            frame = self.repository.find_frame_by_user(self.user.id)
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(frame.symbols.count('AAPL'), 1)
+        self.assertEqual(frame.type_codes.dtype, np.int8)
+        self.assertEqual(frame.ids.tolist(), [asset.id for asset in self.assets])
+        self.assertEqual(frame.value('quantity', 2), Decimal('0.12345678'))
+        self.assertEqual(frame.value('purchase_date', 0), self.assets[0].purchase_date)
+
+    def test_columns_match_model_properties(self):
+        frame = self.repository.find_frame_by_user(self.user.id)
+        for index, asset in enumerate(self.assets):
+            self.assertAlmostEqual(frame.current_value[index], asset.current_value, places=9)
+            self.assertAlmostEqual(frame.gain_loss[index], asset.gain_loss, places=9)
+            self.assertAlmostEqual(frame.performance_percentage[index], asset.performance_percentage, places=9)
+        rows = list(frame.rows())
+        self.assertEqual([row.symbol for row in rows], [asset.symbol for asset in self.assets])
+
+    def test_vectorized_calculators_match_row_by_row(self):
+        frame = self.repository.find_frame_by_user(self.user.id)
+        for calculator in (SimpleROICalculator(), AbsoluteGainCalculator(), AnnualizedReturnCalculator(),
+                           DoubleValueCalculator()):
+            expected = [calculator.calculate(asset) for asset in self.assets]
+            np.testing.assert_allclose(calculator.calculate_many(frame), expected, rtol=1e-12, atol=1e-9)
+
+    def test_decimals_beyond_float_precision_are_exact(self):
+        # Texte exact tel que renvoyé par un CAST PostgreSQL (NUMERIC exact)
+        frame = PortfolioFrame.from_rows([
+            (1, 'CRYPTO', 'ETH', 'Ether', 1234567890.1234567, 1.0, 99999999999999.99, date.today(),
+             '1234567890.12345678', '1.00', '99999999999999.99'),
+            (2, 'STOCK', 'AAPL', 'Apple', 10.0, 100.0, 150.0, date.today(), '10.00000000', '100.00', '150.00'),
+        ])
+        self.assertEqual(frame.value('quantity', 0), Decimal('1234567890.12345678'))
+        self.assertEqual(frame.value('current_price', 0), Decimal('99999999999999.99'))
+        self.assertEqual(frame.take([1, 0]).column('quantity'), [Decimal('10'), Decimal('1234567890.12345678')])
+        self.assertEqual(frame.exact, {
+            'quantity': {0: '1234567890.12345678'}, 'current_price': {0: '99999999999999.99'}
+        })
+
+    def test_summary_echoes_stored_decimals(self):
+        asset = Asset.objects.create(
+            user=self.user, asset_type='CRYPTO', symbol='ETH', name='Ether',
+            quantity=Decimal('1234567890.12345678'), purchase_price=Decimal('1.00'),
+            current_price=Decimal('99999999999999.99'), purchase_date=date.today()
+        )
+        stored = Asset.objects.get(id=asset.id)
+        summary = PortfolioService(self.repository).get_portfolio_summary(self.user.id)
+        entry = next(item for item in summary['by_type']['Crypto-monnaie']['assets'] if item['symbol'] == 'ETH')
+        self.assertEqual((entry['quantity'], entry['current_price']), (str(stored.quantity), str(stored.current_price)))
+        self.assertEqual(PortfolioFrame.from_assets([stored]).value('quantity', 0), stored.quantity)
+
+    def test_empty_frame(self):
+        frame = self.repository.find_frame_by_user(self.user.id + 1)
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(frame.current_value.sum(), 0)
+        self.assertEqual(SimpleROICalculator().calculate_many(frame).shape, (0,))
+
+    def test_compact_memory(self):
+        frame = PortfolioFrame.from_assets(self.assets * 200)
+        # 8 colonnes numériques : 4 de 8 octets, 3 de 4 octets, 1 d'un octet par ligne
+        self.assertEqual(frame.nbytes(), len(frame) * 45)
+        self.assertEqual(len(frame.symbols), 4)
+
+    def test_service_uses_frame(self):
+        service = PortfolioService(self.repository)
+        with self.assertNumQueries(1):
+            summary = service.get_portfolio_summary(self.user.id)
+        self.assertAlmostEqual(summary['total_current_value'], sum(asset.current_value for asset in self.assets))
+        # Types dans l'ordre de première apparition, comme avant le frame
+        self.assertEqual(list(summary['by_type']), list(dict.fromkeys(a.get_asset_type_display() for a in self.assets)))
+        self.assertEqual(summary['by_type']['Action']['count'], 3)
+        self.assertIn('10.00000000', [entry['quantity'] for entry in summary['by_type']['Action']['assets']])
+
+        performance = service.get_portfolio_performance(self.user.id)
+        self.assertEqual(performance['best_performer']['symbol'], 'BTC')
+        self.assertEqual(performance['worst_performer']['symbol'], 'US10Y')
+        self.assertEqual([entry['performance'] for entry in performance['assets']],
+                         sorted((entry['performance'] for entry in performance['assets']), reverse=True))
@@ -0,0 +1,149 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from .. import instrumentation
+from ..instrumentation import QueryBudgetExceeded, QueryRecorder, query_shape, track_queries
+from ..models import Asset
+from ..services.portfolio_service import PortfolioService
+from ..services.repositories import DjangoAssetRepository
+
+User = get_user_model()
+
+
+def create_assets(user, count):
+    for index in range(count):
+        Asset.objects.create(
+            user=user,
+            asset_type='STOCK',
+            symbol=f'SYM{index}',
+            name=f'Actif {index}',
+            quantity=Decimal('1'),
+            purchase_price=Decimal('10'),
+            current_price=Decimal('12'),
+            purchase_date='2024-01-15'
+        )
+
+
+class Probe:
+    """Méthodes de service factices : une requête par actif (N+1) ou une seule"""
+
+    @track_queries(2)
+    def one_query_per_asset(self, user_id):
+        return [Asset.objects.filter(pk=pk).first() for pk in
+                Asset.objects.filter(user_id=user_id).values_list('pk', flat=True)]
+
+    @track_queries(2)
+    def single_query(self, user_id):
+        return list(Asset.objects.filter(user_id=user_id))
+
+
+class QueryRecorderTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        create_assets(self.user, 6)
+
+    def test_in_lists_share_one_shape(self):
+        self.assertEqual(
+            query_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            query_shape('SELECT * FROM t WHERE id IN (%s)')
+        )
+
+    def test_counts_queries_and_repeated_selects(self):
+        with QueryRecorder() as recorder:
+            Probe.one_query_per_asset.__wrapped__(Probe(), self.user.id)
+        self.assertEqual(recorder.count, 7)
+        repeated = recorder.repeated(5)
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0][1], 6)
+        self.assertIn('test_instrumentation.py', repeated[0][2])
+
+    def test_stacks_captured_only_on_problems(self):
+        with mock.patch.object(instrumentation, 'project_stack', wraps=instrumentation.project_stack) as stack:
+            with QueryRecorder(threshold=5) as recorder:
+                Probe.single_query.__wrapped__(Probe(), self.user.id)
+                Asset.objects.count()
+            self.assertEqual(stack.call_count, 0)
+
+            with QueryRecorder(threshold=5, budget=3) as recorder:
+                Probe.one_query_per_asset.__wrapped__(Probe(), self.user.id)
+            # Seuil de N+1 atteint une fois, budget dépassé une fois
+            self.assertEqual(stack.call_count, 2)
+        self.assertIn('test_instrumentation.py', recorder.budget_stack)
+
+
+class TrackQueriesTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        create_assets(self.user, 6)
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_budget_exceeded_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'Probe.one_query_per_asset : 7 requêtes (budget 2)'):
+            Probe().one_query_per_asset(self.user.id)
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_within_budget(self):
+        self.assertEqual(len(Probe().single_query(self.user.id)), 6)
+
+    @override_settings(QUERY_BUDGET_MODE='raise', QUERY_BUDGETS={'Probe.single_query': 0})
+    def test_settings_budget_overrides_default(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            Probe().single_query(self.user.id)
+
+    @override_settings(QUERY_BUDGET_MODE='log', QUERY_BUDGETS={'Probe.one_query_per_asset': 10})
+    def test_log_mode_reports_n_plus_one(self):
+        with self.assertLogs('apps.portfolio.instrumentation', level='WARNING') as logs:
+            assets = Probe().one_query_per_asset(self.user.id)
+        self.assertEqual(len(assets), 6)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('N+1 probable', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_portfolio_service_within_budgets(self):
+        service = PortfolioService(DjangoAssetRepository())
+        asset = Asset.objects.filter(user=self.user).first()
+        service.get_asset_detail(self.user.id, asset.id)
+        service.update_asset(self.user.id, asset.id, {'name': 'Renommé'})
+        service.get_portfolio_summary(self.user.id)
+        service.get_portfolio_performance(self.user.id)
+        service.delete_asset(self.user.id, asset.id)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', DEBUG=True)
+class QueryBudgetMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        create_assets(self.user, 20)
+
+    def test_endpoints_within_budget(self):
+        for url in ['/api/portfolio/assets/', '/api/portfolio/assets/summary/', '/api/portfolio/assets/search/?q=sym']:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertLessEqual(int(response['X-Query-Count']), 5)
+
+    def test_batch_within_budget(self):
+        ids = list(Asset.objects.filter(user=self.user).values_list('id', flat=True))
+        operations = [{'op': 'update', 'id': pk, 'data': {'current_price': '13.00'}} for pk in ids[:10]]
+        operations += [{'op': 'delete', 'id': pk} for pk in ids[10:]]
+        response = self.client.post('/api/portfolio/assets/batch/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    @override_settings(QUERY_BUDGETS={'asset-list': 1})
+    def test_view_budget_exceeded_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/portfolio/assets/')
+
+    @override_settings(QUERY_BUDGET_MODE='off')
+    def test_off_mode_skips_counting(self):
+        response = self.client.get('/api/portfolio/assets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Query-Count', response)
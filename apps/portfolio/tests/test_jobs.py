@@ -0,0 +1,149 @@
+from io import StringIO
+from unittest import mock
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from ..models import Asset, Job
+from ..services.jobs import JobService
+
+User = get_user_model()
+
+
+class JobServiceTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+        self.service = JobService()
+
+    def test_enqueue_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            self.service.enqueue(self.user.id, 'unknown')
+
+    def test_claim_is_exclusive(self):
+        job = self.service.enqueue(self.user.id, 'portfolio_summary')
+        claimed = self.service.claim_next('worker-1')
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, Job.Status.RUNNING)
+        self.assertIsNone(self.service.claim_next('worker-2'))
+
+    def test_run_next_stores_result(self):
+        self.service.enqueue(self.user.id, 'asset_export')
+        job = self.service.run_next('worker-1')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result['count'], 1)
+        self.assertEqual(job.result['assets'][0]['symbol'], 'AAPL')
+
+    def test_enqueue_validates_params(self):
+        with self.assertRaises(ValueError):
+            self.service.enqueue(self.user.id, 'portfolio_summary', {'unexpected': 1})
+        with self.assertRaises(ValueError):
+            self.service.enqueue(self.user.id, 'portfolio_projection', {'paths': 'many'})
+        with self.assertRaises(ValueError):
+            self.service.enqueue(self.user.id, 'portfolio_projection', {'horizon_years': True})
+        job = self.service.enqueue(self.user.id, 'portfolio_projection', {'horizon_years': 5, 'seed': None})
+        self.assertEqual(job.params, {'horizon_years': 5, 'seed': None})
+        self.service.enqueue(self.user.id, 'portfolio_rebalance', {'tolerance': 1})
+
+    def test_run_failure_is_recorded_without_internals(self):
+        def failing_job(service, user_id):
+            raise RuntimeError('/srv/app/secret.py: SELECT * FROM auth_user')
+
+        self.service.enqueue(self.user.id, 'portfolio_summary')
+        with mock.patch.dict(JobService._handlers, {'portfolio_summary': failing_job}), \
+                self.assertLogs('apps.portfolio.services.jobs', 'ERROR') as logs:
+            job = self.service.run_next('worker-1')
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertTrue(job.error.startswith('RuntimeError: '))
+        self.assertNotIn('SELECT', job.error)
+        self.assertNotIn('Traceback', job.error)
+        self.assertIn('SELECT', '\n'.join(logs.output))
+
+    def test_value_error_message_is_kept(self):
+        def rejecting_job(service, user_id):
+            raise ValueError("Aucune allocation cible définie")
+
+        self.service.enqueue(self.user.id, 'portfolio_summary')
+        with mock.patch.dict(JobService._handlers, {'portfolio_summary': rejecting_job}), \
+                self.assertLogs('apps.portfolio.services.jobs', 'ERROR'):
+            job = self.service.run_next('worker-1')
+        self.assertEqual(job.error, "ValueError: Aucune allocation cible définie")
+
+
+class JobAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_enqueue_and_poll(self):
+        response = self.client.post('/api/portfolio/jobs/', {'kind': 'portfolio_performance'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data['id']
+
+        response = self.client.get(f'/api/portfolio/jobs/{job_id}/')
+        self.assertEqual(response.data['status'], Job.Status.PENDING)
+
+        JobService().run_next('worker-1')
+        response = self.client.get(f'/api/portfolio/jobs/{job_id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], Job.Status.SUCCEEDED)
+        self.assertEqual(response.data['result']['total_assets'], 0)
+
+    def test_enqueue_invalid_kind(self):
+        response = self.client.post('/api/portfolio/jobs/', {'kind': 'unknown'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_enqueue_invalid_params(self):
+        response = self.client.post(
+            '/api/portfolio/jobs/', {'kind': 'portfolio_summary', 'params': {'unexpected': 1}}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('params', response.data)
+        self.assertFalse(Job.objects.exists())
+
+    def test_other_user_job_not_found(self):
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        job = JobService().enqueue(other_user.id, 'portfolio_summary')
+        response = self.client.get(f'/api/portfolio/jobs/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RunJobsCommandTests(TransactionTestCase):
+
+    def test_command_drains_queue(self):
+        user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        for _ in range(3):
+            JobService().enqueue(user.id, 'portfolio_summary')
+
+        call_command('run_jobs', '--once', '--workers', '1', stdout=StringIO())
+        self.assertEqual(Job.objects.filter(status=Job.Status.SUCCEEDED).count(), 3)
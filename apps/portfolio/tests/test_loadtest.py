@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TransactionTestCase
+
+from ..models import Asset
+from ..services.loadtest import InProcessTransport, LoadTest, parse_mix
+
+User = get_user_model()
+
+
+class ParseMixTests(SimpleTestCase):
+
+    def test_weights(self):
+        self.assertEqual(parse_mix('list=5, summary=2,create'), {'list': 5.0, 'summary': 2.0, 'create': 1.0})
+
+    def test_invalid_mix(self):
+        for spec in ['', 'unknown=1', 'list=abc', 'list=-1', 'list=0']:
+            with self.assertRaises(ValueError, msg=spec):
+                parse_mix(spec)
+
+
+class LoadTestTests(TransactionTestCase):
+
+    def test_authenticates_synthetic_users(self):
+        load_test = LoadTest(InProcessTransport, parse_mix('list'), users=3, concurrency=1)
+        tokens = load_test.authenticate_users()
+        self.assertEqual(len(set(tokens)), 3)
+        self.assertEqual(User.objects.filter(username__startswith='loadtest_').count(), 3)
+        # Second passage : les comptes existants sont réutilisés
+        LoadTest(InProcessTransport, parse_mix('list'), users=3, concurrency=1).authenticate_users()
+        self.assertEqual(User.objects.filter(username__startswith='loadtest_').count(), 3)
+
+    def test_report_per_endpoint(self):
+        load_test = LoadTest(InProcessTransport, parse_mix('list=2,summary=1,create=1'), users=1, concurrency=1, seed=3)
+        report = load_test.run(duration=None, requests=40)
+
+        self.assertEqual(report['total']['requests'], 40)
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertEqual(sum(entry['requests'] for entry in report['endpoints'].values()), 40)
+        for entry in report['endpoints'].values():
+            self.assertLessEqual(entry['p50_ms'], entry['p95_ms'])
+            self.assertLessEqual(entry['p95_ms'], entry['p99_ms'])
+        self.assertEqual(Asset.objects.count(), report['endpoints']['create']['requests'])
+        self.assertEqual(report['status_codes'].get('201'), report['endpoints']['create']['requests'])
+
+    def test_consecutive_runs_do_not_collide(self):
+        for _ in range(2):
+            report = LoadTest(InProcessTransport, parse_mix('create'), users=1, concurrency=1, seed=1).run(
+                duration=None, requests=20
+            )
+            self.assertEqual(report['status_codes'], {'201': 20})
+        self.assertEqual(Asset.objects.count(), 40)
+        self.assertLessEqual(max(len(symbol) for symbol in Asset.objects.values_list('symbol', flat=True)), 10)
+
+    def test_concurrent_read_traffic(self):
+        load_test = LoadTest(InProcessTransport, parse_mix('list,performance'), users=2, concurrency=3)
+        report = load_test.run(duration=None, requests=30)
+        self.assertEqual(report['total']['requests'], 30)
+        self.assertEqual(report['total']['errors'], 0)
+
+    def test_command_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            call_command('load_test', users=1, concurrency=1, requests=5, mix='summary',
+                         output=path, cleanup=True, stdout=StringIO())
+            with open(path) as handle:
+                report = json.load(handle)
+        self.assertEqual(report['config']['target'], 'in-process')
+        self.assertEqual(report['endpoints']['summary']['requests'], 5)
+        self.assertFalse(User.objects.filter(username__startswith='loadtest_').exists())
+
+    def test_command_rejects_invalid_mix(self):
+        with self.assertRaises(CommandError):
+            call_command('load_test', mix='unknown=1', stdout=StringIO())
@@ -0,0 +1,153 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from ..models import Asset, PortfolioVersion
+from ..services.market_data import DjangoPriceWriter, PriceIngestor, parse_tick, open_source
+
+User = get_user_model()
+
+
+async def lines(*items):
+    for item in items:
+        yield item
+
+
+class RecordingWriter:
+
+    def __init__(self):
+        self.batches = []
+
+    def write(self, prices):
+        self.batches.append(dict(prices))
+        return len(prices)
+
+
+class ParseTickTests(TestCase):
+
+    def test_formats(self):
+        self.assertEqual(parse_tick('aapl 189.5\n'), ('AAPL', Decimal('189.50')))
+        self.assertEqual(parse_tick('BTC,50000'), ('BTC', Decimal('50000.00')))
+        self.assertEqual(parse_tick('{"symbol": "MSFT", "price": 410.1}'), ('MSFT', Decimal('410.10')))
+
+    def test_invalid(self):
+        for line in ('', 'AAPL', 'AAPL abc', 'AAPL -1', '{"symbol": "X"}'):
+            self.assertIsNone(parse_tick(line))
+
+    def test_unknown_source(self):
+        with self.assertRaises(ValueError):
+            open_source('ftp:somewhere')
+
+
+class PriceIngestorTests(TestCase):
+
+    def test_ticks_are_coalesced(self):
+        writer = RecordingWriter()
+        ingestor = PriceIngestor(writer=writer, window=60)
+        ticks = [f'AAPL {price}' for price in range(100, 200)] + ['BTC 50000', 'oops']
+        stats = async_to_sync(ingestor.run)(lines(*ticks))
+
+        self.assertEqual(writer.batches, [{'AAPL': Decimal('199.00'), 'BTC': Decimal('50000.00')}])
+        self.assertEqual(stats.received, 101)
+        self.assertEqual(stats.coalesced, 99)
+        self.assertEqual(stats.invalid, 1)
+        self.assertEqual(stats.flushes, 1)
+
+    def test_backpressure_bounds_pending(self):
+        writer = RecordingWriter()
+        ingestor = PriceIngestor(writer=writer, window=0.01, max_pending=2)
+        stats = async_to_sync(ingestor.run)(lines('A 1', 'B 1', 'C 1', 'D 1', 'E 1'))
+
+        self.assertTrue(all(len(batch) <= 2 for batch in writer.batches))
+        self.assertEqual(sum(len(batch) for batch in writer.batches), 5)
+        self.assertGreater(stats.backpressure_waits, 0)
+
+
+class DjangoPriceWriterTests(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='testpass123')
+            for i in range(2)
+        ]
+        for user in self.users:
+            for symbol, price in (('AAPL', '150'), ('BTC', '50000'), ('MSFT', '400')):
+                Asset.objects.create(
+                    user=user,
+                    asset_type='STOCK',
+                    symbol=symbol,
+                    name=symbol,
+                    quantity=Decimal('1'),
+                    purchase_price=Decimal(price),
+                    current_price=Decimal(price),
+                    purchase_date='2024-01-15'
+                )
+
+    def test_single_update_per_window(self):
+        versions = {user.id: PortfolioVersion.get_validator(user.id)[0] for user in self.users}
+        # UPDATE groupé + recherche des utilisateurs + incrément des versions
+        with self.assertNumQueries(3):
+            rows = DjangoPriceWriter().write({'AAPL': Decimal('200.00'), 'BTC': Decimal('60000.00')})
+
+        self.assertEqual(rows, 4)
+        self.assertEqual(
+            set(Asset.objects.filter(symbol='AAPL').values_list('current_price', flat=True)),
+            {Decimal('200.00')}
+        )
+        self.assertEqual(
+            set(Asset.objects.filter(symbol='MSFT').values_list('current_price', flat=True)),
+            {Decimal('400.00')}
+        )
+        for user in self.users:
+            self.assertGreater(PortfolioVersion.get_validator(user.id)[0], versions[user.id])
+
+    def test_holder_lookups_and_bumps_are_chunked(self):
+        versions = {user.id: PortfolioVersion.get_validator(user.id)[0] for user in self.users}
+        prices = {'AAPL': Decimal('200.00'), 'BTC': Decimal('60000.00')}
+        with mock.patch('apps.portfolio.signals.PRICE_SYMBOLS_PER_QUERY', 1), \
+                mock.patch.object(PortfolioVersion, 'BUMP_BATCH_SIZE', 1):
+            # 2 UPDATE de prix (1 symbole par requête) + 2 recherches de détenteurs + 1 UPDATE par détenteur
+            with self.assertNumQueries(2 + 2 + len(self.users)):
+                with mock.patch.object(DjangoPriceWriter, 'MAX_SYMBOLS_PER_STATEMENT', 1):
+                    DjangoPriceWriter().write(prices)
+        for user in self.users:
+            self.assertEqual(PortfolioVersion.get_validator(user.id)[0], versions[user.id] + 1)
+
+    def test_prices_do_not_change_asset_versions(self):
+        # Un client ayant lu l'actif avant le tick peut toujours l'écrire
+        DjangoPriceWriter().write({'AAPL': Decimal('200.00')})
+        self.assertEqual(set(Asset.objects.values_list('version', flat=True)), {1})
+
+    @skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN propre à SQLite")
+    def test_updates_and_holder_lookups_use_symbol_index(self):
+        with connection.cursor() as cursor:
+            for sql in (
+                "UPDATE portfolio_asset SET current_price = 1 WHERE symbol IN ('AAPL', 'BTC')",
+                "SELECT DISTINCT user_id FROM portfolio_asset WHERE symbol IN ('AAPL', 'BTC')",
+            ):
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+                self.assertIn('asset_symbol_user_idx', plan)
+                self.assertNotIn('SCAN portfolio_asset', plan)
+
+    def test_unknown_symbols_are_ignored(self):
+        self.assertEqual(DjangoPriceWriter().write({'ZZZ': Decimal('1.00')}), 0)
+
+    def test_command_reads_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as handle:
+            handle.write('AAPL 201\nAAPL 202\nMSFT 410\n')
+        self.addCleanup(os.unlink, handle.name)
+        out = StringIO()
+        call_command(
+            'ingest_prices', '--source', f'file:{handle.name}',
+            '--from-start', '--no-follow', '--stats-interval', '0', stdout=out
+        )
+        self.assertIn('"ticks_coalesced": 1', out.getvalue())
+        self.assertEqual(Asset.objects.filter(symbol='AAPL').first().current_price, Decimal('202.00'))
+        self.assertEqual(Asset.objects.filter(symbol='MSFT').first().current_price, Decimal('410.00'))
@@ -0,0 +1,114 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Asset
+from ..services.market_data import DjangoPriceWriter
+
+User = get_user_model()
+
+
+class OptimisticLockingTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.asset = Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple Inc.',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('150.50'),
+            current_price=Decimal('175.25'),
+            purchase_date='2024-01-15'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = f'/api/portfolio/assets/{self.asset.id}/'
+
+    def test_version_is_exposed_and_incremented(self):
+        self.assertEqual(self.client.get(self.url).data['version'], 1)
+        response = self.client.patch(self.url, {'current_price': '200', 'version': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+        self.assertEqual(response.data['current_price'], '200.00')
+
+    def test_stale_version_is_rejected(self):
+        self.client.patch(self.url, {'quantity': '12', 'version': 1})
+        response = self.client.patch(self.url, {'current_price': '200', 'version': 1})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['current_version'], 2)
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.current_price, Decimal('175.25'))
+
+    def test_concurrent_updates_of_different_fields_are_kept(self):
+        # Deux clients ayant lu la même version, sans contrôle de version
+        self.client.patch(self.url, {'current_price': '200'})
+        self.client.patch(self.url, {'quantity': '20'})
+        self.asset.refresh_from_db()
+        self.assertEqual((self.asset.current_price, self.asset.quantity), (Decimal('200'), Decimal('20')))
+        self.assertEqual(self.asset.version, 3)
+
+    def test_update_is_a_single_write(self):
+        # UPDATE conditionnel, relecture, version du portefeuille (+ savepoint et release)
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, {'current_price': '200', 'version': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_foreign_asset_is_not_found(self):
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.put(self.url, {
+            'asset_type': 'STOCK',
+            'symbol': 'AAPL',
+            'name': 'Pirate',
+            'quantity': '1',
+            'purchase_price': '1',
+            'current_price': '1',
+            'purchase_date': '2024-01-15',
+        })
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.name, 'Apple Inc.')
+
+    def test_duplicate_key_is_a_conflict(self):
+        Asset.objects.create(
+            user=self.user, asset_type='STOCK', symbol='MSFT', name='Microsoft', quantity=Decimal('1'),
+            purchase_price=Decimal('1'), current_price=Decimal('1'), purchase_date='2024-01-15'
+        )
+        response = self.client.patch(self.url, {'symbol': 'MSFT'})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_create_ignores_version(self):
+        response = self.client.post('/api/portfolio/assets/', {
+            'asset_type': 'BOND',
+            'symbol': 'US10Y',
+            'name': 'US Treasury',
+            'quantity': '5',
+            'purchase_price': '100',
+            'current_price': '102',
+            'purchase_date': '2024-01-20',
+            'version': 7,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Asset.objects.get(symbol='US10Y').version, 1)
+
+    def test_other_writes_increment_version(self):
+        self.asset.name = 'Apple'
+        self.asset.save(update_fields=['name'])
+        # Les ticks de prix ne touchent pas à la version (verrouillage des clients)
+        DjangoPriceWriter().write({'AAPL': Decimal('180')})
+        self.client.post('/api/portfolio/assets/batch/', {'operations': [
+            {'op': 'update', 'id': self.asset.id, 'data': {'quantity': '11'}},
+        ]}, format='json')
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.version, 3)
@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import Future
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework import status
+from decimal import Decimal
+from ..models import Asset
+from ..services.projection import ProjectionService, get_executor
+
+User = get_user_model()
+
+
+class ProjectionServiceTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        for symbol, asset_type, price in (('AAPL', 'STOCK', '600'), ('US10Y', 'BOND', '300'), ('BTC', 'CRYPTO', '100')):
+            Asset.objects.create(
+                user=self.user,
+                asset_type=asset_type,
+                symbol=symbol,
+                name=symbol,
+                quantity=Decimal('10'),
+                purchase_price=Decimal(price),
+                current_price=Decimal(price),
+                purchase_date='2024-01-15'
+            )
+
+    def project(self, workers=0, time_budget=60, **kwargs):
+        service = ProjectionService(workers=workers, time_budget=time_budget)
+        with mock.patch('os.getloadavg', return_value=(0.0, 0.0, 0.0)):
+            return service.project(self.user.id, **kwargs)
+
+    def test_distribution(self):
+        result = self.project(horizon_years=5, paths=40000, seed=42)
+        self.assertEqual(result['initial_value'], 10000.0)
+        self.assertEqual(result['paths_simulated'], 40000)
+        self.assertFalse(result['degraded'])
+        self.assertEqual(len(result['percentiles']['p50']), 5)
+        terminal = result['terminal']
+        self.assertLess(terminal['p5'], terminal['p50'])
+        self.assertLess(terminal['p50'], terminal['p95'])
+        self.assertEqual(terminal['p50'], result['percentiles']['p50'][-1])
+        # Rendement attendu positif : la médiane progresse
+        self.assertGreater(terminal['p50'], 10000.0)
+
+    def test_seed_is_deterministic_across_workers(self):
+        inline = self.project(workers=0, paths=40000, seed=7)
+        pooled = self.project(workers=2, paths=40000, seed=7)
+        self.assertEqual(inline['percentiles'], pooled['percentiles'])
+        self.assertNotEqual(inline['percentiles'], self.project(paths=40000, seed=8)['percentiles'])
+
+    def test_time_budget_degrades_paths(self):
+        result = self.project(time_budget=0, paths=100000, seed=1)
+        self.assertEqual(result['paths_simulated'], ProjectionService.CHUNK_SIZE)
+        self.assertTrue(result['degraded'])
+
+    def test_load_reduces_paths(self):
+        service = ProjectionService(workers=0)
+        with mock.patch('os.getloadavg', return_value=(4.0 * (os.cpu_count() or 1), 0, 0)):
+            # 200000 / 4 = 50000, arrondi au bloc supérieur
+            self.assertEqual(service.admissible_paths(200000), 60000)
+            self.assertEqual(service.admissible_paths(30000), 20000)
+            self.assertEqual(service.admissible_paths(5000), 5000)
+
+    def test_saturated_pool_respects_budget(self):
+        class SaturatedExecutor:
+            def submit(self, *args):
+                return Future()
+
+        with mock.patch('apps.portfolio.services.projection.get_executor', return_value=SaturatedExecutor()):
+            result = self.project(workers=2, time_budget=0, paths=40000, seed=5)
+        self.assertEqual(result['paths_simulated'], ProjectionService.FALLBACK_PATHS)
+        self.assertTrue(result['degraded'])
+
+    def test_paths_bounded_by_memory_budget(self):
+        self.assertEqual(ProjectionService.max_paths(5), ProjectionService.MAX_PATHS)
+        self.assertEqual(ProjectionService.max_paths(50), 40000)
+        result = self.project(horizon_years=50, paths=100000, seed=6)
+        self.assertEqual(result['paths_simulated'], 40000)
+        self.assertFalse(result['degraded'])
+
+    def test_requested_paths_are_simulated_exactly(self):
+        for paths in (30000, 1):
+            result = self.project(paths=paths, seed=4)
+            self.assertEqual(result['paths_simulated'], paths)
+            self.assertFalse(result['degraded'])
+
+    def test_pool_follows_worker_count(self):
+        first = get_executor(1)
+        self.assertIs(get_executor(1), first)
+        second = get_executor(2)
+        self.assertIsNot(second, first)
+        self.assertEqual(second._max_workers, 2)
+
+    def test_empty_portfolio(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        result = ProjectionService(workers=0).project(other.id, seed=1)
+        self.assertEqual(result['paths_simulated'], 0)
+        self.assertIsNone(result['terminal'])
+
+
+class ProjectionAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def test_projection(self):
+        response = self.client.get('/api/portfolio/projection/?horizon=3&paths=20000&seed=3')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['horizon_years'], 3)
+        self.assertEqual(response.data['seed'], 3)
+
+    def test_invalid_params(self):
+        for query in ('horizon=0', 'horizon=2.5', 'paths=0', 'seed=-1', 'horizon=50&paths=50000'):
+            response = self.client.get(f'/api/portfolio/projection/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework import status
+from decimal import Decimal
+from ..models import Asset, TargetAllocation
+from ..services.rebalancing import RebalancingService
+
+User = get_user_model()
+
+
+def create_asset(user, symbol, asset_type, quantity, price, purchase_date='2024-01-15'):
+    return Asset.objects.create(
+        user=user,
+        asset_type=asset_type,
+        symbol=symbol,
+        name=symbol,
+        quantity=Decimal(quantity),
+        purchase_price=Decimal(price),
+        current_price=Decimal(price),
+        purchase_date=purchase_date
+    )
+
+
+class RebalancingServiceTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        create_asset(self.user, 'AAPL', 'STOCK', '20', '150')
+        create_asset(self.user, 'AAPL', 'STOCK', '10', '150', purchase_date='2024-02-01')
+        create_asset(self.user, 'BTC', 'CRYPTO', '0.1', '40000')
+        create_asset(self.user, 'DOGE', 'CRYPTO', '1000', '1.5')
+        TargetAllocation.objects.create(user=self.user, asset_type='STOCK', weight=Decimal('0.8'))
+        TargetAllocation.objects.create(user=self.user, symbol='BTC', weight=Decimal('0.2'))
+
+    def trades(self, result):
+        return {trade['symbol']: trade for trade in result['trades']}
+
+    def test_drift_and_trades(self):
+        result = RebalancingService().rebalance_user(self.user.id)
+        self.assertEqual(result['total_value'], 10000.0)
+        allocations = {a['asset_type'] or a['symbol']: a for a in result['allocations']}
+        self.assertEqual(allocations['STOCK']['current_weight'], 0.45)
+        self.assertEqual(allocations['STOCK']['drift'], -0.35)
+        # DOGE n'a pas de cible : poids cible nul
+        self.assertEqual(allocations['DOGE']['target_weight'], 0.0)
+
+        trades = self.trades(result)
+        self.assertEqual(trades['AAPL'], {
+            'symbol': 'AAPL', 'asset_type': 'STOCK', 'side': 'BUY', 'value': 3500.0, 'quantity': 23.33333333
+        })
+        self.assertEqual(trades['BTC']['side'], 'SELL')
+        self.assertEqual(trades['BTC']['value'], 2000.0)
+        self.assertEqual(trades['DOGE']['value'], 1500.0)
+        # Ordres autofinancés
+        signed = sum(t['value'] if t['side'] == 'BUY' else -t['value'] for t in result['trades'])
+        self.assertAlmostEqual(signed, 0.0, places=2)
+
+    def test_tolerance_skips_small_drift(self):
+        result = RebalancingService(tolerance=0.2).rebalance_user(self.user.id)
+        self.assertEqual(set(self.trades(result)), {'AAPL'})
+
+    def test_target_without_position(self):
+        TargetAllocation.objects.create(user=self.user, symbol='MSFT', weight=Decimal('0.25'))
+        trades = self.trades(RebalancingService().rebalance_user(self.user.id))
+        self.assertEqual(trades['MSFT']['side'], 'BUY')
+        self.assertIsNone(trades['MSFT']['quantity'])
+
+    def test_user_without_targets(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        create_asset(other, 'AAPL', 'STOCK', '1', '150')
+        self.assertEqual(RebalancingService().rebalance_user(other.id)['trades'], [])
+
+    def test_batch_matches_single_user(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        create_asset(other, 'MSFT', 'STOCK', '10', '400')
+        create_asset(other, 'US10Y', 'BOND', '10', '100')
+        TargetAllocation.objects.create(user=other, asset_type='BOND', weight=Decimal('0.5'))
+        TargetAllocation.objects.create(user=other, asset_type='STOCK', weight=Decimal('0.5'))
+
+        service = RebalancingService()
+        with self.assertNumQueries(3):
+            results = service.rebalance_all()
+        self.assertEqual(results[self.user.id], service.rebalance_user(self.user.id))
+        self.assertEqual(results[other.id], service.rebalance_user(other.id))
+
+        # Par lots d'un utilisateur : mêmes résultats, listes IN bornées
+        self.assertEqual(RebalancingService(batch_size=1).rebalance_all(), results)
+        self.assertEqual(RebalancingService(batch_size=1).rebalance([other.id, self.user.id]), results)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('rebalance_portfolios', '--tolerance', '0.1', stdout=out, stderr=StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['user_id'] for row in rows], [self.user.id])
+
+
+class RebalanceAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        create_asset(self.user, 'AAPL', 'STOCK', '10', '100')
+        create_asset(self.user, 'US10Y', 'BOND', '10', '300')
+
+    def test_targets_and_rebalance(self):
+        for data in ({'asset_type': 'STOCK', 'weight': '0.5'}, {'asset_type': 'BOND', 'weight': '0.5'}):
+            response = self.client.post('/api/portfolio/targets/', data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get('/api/portfolio/rebalance/?tolerance=0.1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        trades = {trade['symbol']: trade for trade in response.data['trades']}
+        self.assertEqual(trades['AAPL']['side'], 'BUY')
+        self.assertEqual(trades['AAPL']['value'], 1000.0)
+        self.assertEqual(trades['US10Y']['side'], 'SELL')
+
+    def test_invalid_targets(self):
+        response = self.client.post('/api/portfolio/targets/', {'asset_type': 'STOCK', 'symbol': 'AAPL', 'weight': '0.5'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/api/portfolio/targets/', {'symbol': 'aapl', 'weight': '1.5'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.post('/api/portfolio/targets/', {'symbol': 'aapl', 'weight': '0.5'})
+        response = self.client.post('/api/portfolio/targets/', {'symbol': 'AAPL', 'weight': '0.3'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_tolerance(self):
+        response = self.client.get('/api/portfolio/rebalance/?tolerance=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
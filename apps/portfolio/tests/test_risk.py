@@ -0,0 +1,111 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from decimal import Decimal
+from ..models import Asset, PricePoint
+from ..services.risk import RiskService
+
+User = get_user_model()
+
+
+class RiskComputeTests(TestCase):
+
+    def setUp(self):
+        self.start = timezone.now() - timedelta(days=10)
+
+    def rows(self, series):
+        return [
+            (symbol, self.start + timedelta(days=day), Decimal(str(price)))
+            for symbol, prices in series.items()
+            for day, price in enumerate(prices)
+            if price is not None
+        ]
+
+    def test_single_symbol(self):
+        metrics = RiskService(confidence=0.95).compute({'AAPL': 1.0}, self.rows({'AAPL': [100, 110, 99, 121]}))
+        self.assertEqual(metrics['observations'], 3)
+        self.assertEqual(metrics['current_value'], 121.0)
+        self.assertEqual(metrics['max_drawdown'], 0.1)
+        self.assertEqual(metrics['var_historical'], 9.68)
+        self.assertEqual(metrics['periods_per_year'], 365.0)
+        self.assertEqual(metrics['correlation']['matrix'], [[1.0]])
+
+    def test_correlation_and_alignment(self):
+        metrics = RiskService().compute({'A': 1.0, 'B': 2.0, 'C': 1.0}, self.rows({
+            # B commence plus tard, A manque un point (prix reporté)
+            'A': [100, 101, 103, None, 104, 102],
+            'B': [None, 50, 51.5, 51, 52, 51],
+        }))
+        self.assertEqual(metrics['correlation']['symbols'], ['A', 'B'])
+        self.assertEqual(metrics['observations'], 4)
+        self.assertEqual(metrics['missing_symbols'], ['C'])
+        matrix = metrics['correlation']['matrix']
+        self.assertEqual(matrix[0][1], matrix[1][0])
+        self.assertGreater(metrics['var_parametric'], 0)
+
+    def test_insufficient_history(self):
+        metrics = RiskService().compute({'AAPL': 1.0}, self.rows({'AAPL': [100, 101]}))
+        self.assertIsNone(metrics['volatility'])
+
+
+class RiskCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.asset = Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+        now = timezone.now()
+        PricePoint.objects.bulk_create([
+            PricePoint(symbol='AAPL', timestamp=now - timedelta(days=day), price=Decimal(140 + day % 7))
+            for day in range(30)
+        ])
+
+    def test_cached_until_data_changes(self):
+        service = RiskService(window_days=60)
+        first = service.get_risk_metrics(self.user.id)
+        self.assertEqual(first['observations'], 29)
+
+        # Positions + marqueur de l'historique + version, sans relire l'historique
+        with self.assertNumQueries(3):
+            self.assertEqual(service.get_risk_metrics(self.user.id), first)
+
+        self.asset.quantity = Decimal('20')
+        self.asset.save()
+        with self.assertNumQueries(4):
+            second = service.get_risk_metrics(self.user.id)
+        self.assertNotEqual(second['current_value'], first['current_value'])
+
+        PricePoint.objects.create(symbol='AAPL', timestamp=timezone.now(), price=Decimal('150'))
+        self.assertEqual(service.get_risk_metrics(self.user.id)['observations'], 30)
+
+
+class RiskAPITests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def test_empty_portfolio(self):
+        response = self.client.get('/api/portfolio/risk/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['window_days'], 90)
+        self.assertIsNone(response.data['volatility'])
+
+    def test_invalid_params(self):
+        for query in ('window=0', 'window=1.5', 'confidence=1', 'confidence=abc'):
+            response = self.client.get(f'/api/portfolio/risk/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
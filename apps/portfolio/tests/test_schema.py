@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+from django.test import RequestFactory, TestCase, override_settings
+from config import schema
+
+
+class SchemaViewTests(TestCase):
+
+    def setUp(self):
+        schema.reset_schema()
+        self.addCleanup(schema.reset_schema)
+
+    def test_serves_artifact(self):
+        with tempfile.NamedTemporaryFile('wb', suffix='.json', delete=False) as handle:
+            handle.write(b'{"openapi": "3.0.3", "info": {"title": "artefact"}}')
+        self.addCleanup(os.unlink, handle.name)
+
+        with override_settings(API_SCHEMA_FILE=handle.name):
+            response = self.client.get('/api/schema/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], schema.SCHEMA_CONTENT_TYPE)
+            self.assertEqual(json.loads(response.content)['info']['title'], 'artefact')
+            self.assertIn('max-age=3600', response['Cache-Control'])
+
+            response = self.client.get('/api/schema/', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_generated_once_when_artifact_missing(self):
+        with override_settings(API_SCHEMA_FILE='/nonexistent/openapi.json'):
+            first = self.client.get('/api/schema/')
+            self.assertEqual(first.status_code, 200)
+            self.assertIn('/api/portfolio/assets/', json.loads(first.content)['paths'])
+
+            generate = schema.generate_schema
+            schema.generate_schema = lambda: self.fail("Le schéma doit être mémorisé")
+            try:
+                second = self.client.get('/api/schema/')
+            finally:
+                schema.generate_schema = generate
+            self.assertEqual(second.content, first.content)
+
+    def test_docs_machinery_is_lazy(self):
+        # L'import de l'URLconf ne charge pas les vues de documentation
+        # (processus neuf : d'autres tests ont pu les importer dans celui-ci)
+        script = (
+            "import sys, django; django.setup(); import config.urls; "
+            "print('drf_spectacular.views' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings'}
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_lazy_view_imports_on_first_call(self):
+        with mock.patch.object(schema, 'import_module', wraps=schema.import_module) as import_module:
+            view = schema.lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema')
+            import_module.assert_not_called()
+            request = RequestFactory().get('/api/docs/')
+            self.assertEqual(view(request).status_code, 200)
+            self.assertEqual(view(request).status_code, 200)
+        import_module.assert_called_once_with('drf_spectacular.views')
@@ -0,0 +1,131 @@
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework import status
+from decimal import Decimal
+from ..models import Asset
+from ..services.market_data import DjangoPriceWriter
+from ..services.repositories import DjangoAssetRepository
+from ..services.search import SearchIndex, SearchService
+
+User = get_user_model()
+
+
+def create_asset(user, symbol, name, purchase_date='2024-01-15'):
+    return Asset.objects.create(
+        user=user,
+        asset_type='STOCK',
+        symbol=symbol,
+        name=name,
+        quantity=Decimal('1'),
+        purchase_price=Decimal('100'),
+        current_price=Decimal('100'),
+        purchase_date=purchase_date
+    )
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex([
+            (1, 'AAPL', 'Apple Inc.'),
+            (2, 'AA', 'Alcoa Corporation'),
+            (3, 'AMZN', 'Amazon.com'),
+            (4, 'MC', 'LVMH Moët Hennessy'),
+            (5, 'BNP', 'BNP Paribas'),
+        ])
+
+    def test_symbol_prefix_ranking(self):
+        self.assertEqual(self.index.search('aa'), [2, 1])
+        self.assertEqual(self.index.search('a', limit=2), [2, 1])
+
+    def test_name_tokens(self):
+        self.assertEqual(self.index.search('apple'), [1])
+        self.assertEqual(self.index.search('moet henn'), [4])
+        self.assertEqual(self.index.search('hennessy lvmh'), [4])
+        self.assertEqual(self.index.search('moet apple'), [])
+
+    def test_symbol_before_name(self):
+        self.assertEqual(self.index.search('bnp'), [5])
+        self.assertEqual(self.index.search('am'), [3])
+        self.assertEqual(self.index.search(''), [])
+
+
+class SearchServiceTests(TestCase):
+
+    def setUp(self):
+        SearchService.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.apple = create_asset(self.user, 'AAPL', 'Apple Inc.')
+        create_asset(self.user, 'MSFT', 'Microsoft')
+
+    def test_index_reused_until_portfolio_changes(self):
+        service = SearchService()
+        self.assertEqual(service.search_user(self.user.id, 'app'), [self.apple])
+        # Chargement des résultats seulement, sans reconstruire l'index
+        with self.assertNumQueries(1):
+            self.assertEqual(service.search_user(self.user.id, 'micro')[0].symbol, 'MSFT')
+        # Prix et quantités : l'index de l'utilisateur reste valide
+        DjangoPriceWriter().write({'AAPL': Decimal('200')})
+        DjangoAssetRepository().update(self.apple.id, {'quantity': Decimal('3')})
+        with self.assertNumQueries(1):
+            self.assertEqual(service.search_user(self.user.id, 'app')[0].quantity, Decimal('3'))
+
+        create_asset(self.user, 'AMD', 'Advanced Micro Devices')
+        symbols = [asset.symbol for asset in service.search_user(self.user.id, 'micro')]
+        self.assertEqual(symbols, ['AMD', 'MSFT'])
+
+    def test_results_scoped_to_user(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        foreign = create_asset(other, 'AIR', 'Airbus')
+        index = SearchIndex([(foreign.id, 'AIR', 'Airbus')])
+        with mock.patch.object(SearchService, '_get_index', return_value=index):
+            self.assertEqual(SearchService().search_user(self.user.id, 'air'), [])
+
+    def test_universe(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        create_asset(other, 'AIR', 'Airbus')
+        self.assertEqual(
+            SearchService().search_universe('a'),
+            [{'symbol': 'AIR', 'name': 'Airbus'}, {'symbol': 'AAPL', 'name': 'Apple Inc.'}]
+        )
+
+    def test_universe_rebuilt_only_when_symbols_change(self):
+        service = SearchService()
+        service.search_universe('a')
+        # Prix et quantités : l'univers reste valide, aucune requête
+        DjangoPriceWriter().write({'AAPL': Decimal('200')})
+        DjangoAssetRepository().update(self.apple.id, {'quantity': Decimal('3')})
+        with self.assertNumQueries(0):
+            self.assertEqual(service.search_universe('app'), [{'symbol': 'AAPL', 'name': 'Apple Inc.'}])
+
+        DjangoAssetRepository().update(self.apple.id, {'name': 'Apple'})
+        self.assertEqual(service.search_universe('app'), [{'symbol': 'AAPL', 'name': 'Apple'}])
+        create_asset(self.user, 'AMZN', 'Amazon.com')
+        self.assertEqual(service.search_universe('amaz'), [{'symbol': 'AMZN', 'name': 'Amazon.com'}])
+
+
+class SearchAPITests(APITestCase):
+
+    def setUp(self):
+        SearchService.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        create_asset(self.user, 'AAPL', 'Apple Inc.')
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        create_asset(other, 'AMZN', 'Amazon.com')
+
+    def test_search_own_assets(self):
+        response = self.client.get('/api/portfolio/assets/search/?q=a&fields=symbol')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'symbol': 'AAPL'}])
+
+    def test_search_universe(self):
+        response = self.client.get('/api/portfolio/assets/search/?q=amaz&scope=universe')
+        self.assertEqual(response.data, [{'symbol': 'AMZN', 'name': 'Amazon.com'}])
+
+    def test_invalid_params(self):
+        for query in ('', 'q=a&limit=0', 'q=a&limit=500'):
+            response = self.client.get(f'/api/portfolio/assets/search/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
@@ -1,3 +1,4 @@
+from unittest import mock
 from django.test import TestCase
 from decimal import Decimal
 from ..models import Asset
@@ -370,6 +371,35 @@ class PortfolioServiceDetailTests(TestCase):
         updated = self.service.update_asset(self.user.id, self.asset1.id, new_data)
         self.assertEqual(updated.current_price, Decimal('200'))
 
+    def test_mutations_wrong_user(self):
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        # Une seule requête chacune : l'UPDATE / le DELETE filtré n'affecte aucune ligne
+        with self.assertNumQueries(1), self.assertRaises(Asset.DoesNotExist):
+            self.service.update_asset(other_user.id, self.asset1.id, {'current_price': Decimal('1')})
+        with self.assertNumQueries(1), self.assertRaises(Asset.DoesNotExist):
+            self.service.delete_asset(other_user.id, self.asset1.id)
+        self.asset1.refresh_from_db()
+        self.assertEqual(self.asset1.current_price, Decimal('150'))
+
+    def test_delete_asset_single_statement(self):
+        # DELETE filtré par propriétaire + version du portefeuille
+        with self.assertNumQueries(2):
+            self.assertTrue(self.service.delete_asset(self.user.id, self.asset1.id))
+        self.assertFalse(Asset.objects.filter(id=self.asset1.id).exists())
+        with self.assertRaises(Asset.DoesNotExist):
+            self.service.delete_asset(self.user.id, self.asset1.id)
+
+    def test_delete_rows_in_batches(self):
+        with mock.patch.object(Asset, 'DELETE_BATCH_SIZE', 1):
+            with self.assertNumQueries(2):
+                self.assertEqual(Asset.delete_rows([self.asset1.id, 0], user_id=self.user.id + 1), 0)
+            self.assertEqual(Asset.delete_rows([self.asset1.id, 0], user_id=self.user.id), 1)
+        self.assertFalse(Asset.objects.filter(user=self.user).exists())
+
     def test_portfolio_summary_by_type(self):
         Asset.objects.create(
             user=self.user,
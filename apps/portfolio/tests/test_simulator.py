@@ -0,0 +1,100 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from decimal import Decimal
+from ..models import Asset, PricePoint
+from ..services.market_data import parse_tick
+from ..services.simulator import MarketSimulator
+
+User = get_user_model()
+
+
+class MarketSimulatorTests(TestCase):
+
+    def make_simulator(self, seed=42, count=50, correlation=0.5):
+        return MarketSimulator(
+            symbols=[f'S{i}' for i in range(count)],
+            prices=[100.0] * count,
+            volatility=[0.3] * count,
+            correlation=correlation,
+            dt=1 / 252,
+            seed=seed
+        )
+
+    def test_seed_is_reproducible(self):
+        first = self.make_simulator().simulate(100)
+        second = self.make_simulator().simulate(100)
+        self.assertEqual(first.shape, (100, 50))
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.array_equal(first, self.make_simulator(seed=7).simulate(100)))
+
+    def test_returns_are_correlated(self):
+        path = self.make_simulator(count=20, correlation=0.6).simulate(5000)
+        returns = np.diff(np.log(path), axis=0)
+        correlations = np.corrcoef(returns, rowvar=False)
+        mean = correlations[np.triu_indices(20, k=1)].mean()
+        self.assertAlmostEqual(mean, 0.6, delta=0.05)
+
+    def test_invalid_correlation(self):
+        with self.assertRaises(ValueError):
+            self.make_simulator(correlation=1.5)
+
+    def test_ticks_format(self):
+        lines = next(self.make_simulator(count=3).ticks(1))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(parse_tick(lines[0])[0], 'S0')
+
+
+class MarketSimulatorAssetsTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        for symbol, asset_type, price in (('AAPL', 'STOCK', '150'), ('BTC', 'CRYPTO', '50000')):
+            Asset.objects.create(
+                user=user,
+                asset_type=asset_type,
+                symbol=symbol,
+                name=symbol,
+                quantity=Decimal('1'),
+                purchase_price=Decimal(price),
+                current_price=Decimal(price),
+                purchase_date='2024-01-15'
+            )
+
+    def test_from_assets(self):
+        simulator = MarketSimulator.from_assets(seed=1)
+        self.assertEqual(simulator.symbols, ['AAPL', 'BTC'])
+        self.assertEqual(list(simulator.volatility), [0.25, 0.80])
+
+    def test_backfill_ends_at_current_price(self):
+        written = MarketSimulator.from_assets(seed=1).backfill(10, timedelta(minutes=1), batch_size=7)
+        self.assertEqual(written, 20)
+        self.assertEqual(PricePoint.objects.count(), 20)
+        last = PricePoint.objects.filter(symbol='BTC').last()
+        self.assertEqual(last.price, Decimal('50000.00'))
+
+    def test_backfill_counts_only_inserted_points(self):
+        end = timezone.now()
+        MarketSimulator.from_assets(seed=1).backfill(10, timedelta(minutes=1), end=end)
+        # Mêmes horodatages : tous ignorés par la base
+        self.assertEqual(MarketSimulator.from_assets(seed=2).backfill(10, timedelta(minutes=1), end=end), 0)
+        self.assertEqual(MarketSimulator.from_assets(seed=2).backfill(12, timedelta(minutes=1), end=end), 4)
+
+    def test_ticks_command_writes_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as handle:
+            pass
+        self.addCleanup(os.unlink, handle.name)
+        call_command(
+            'simulate_market', 'ticks', '--steps', '5', '--seed', '3',
+            '--target', f'file:{handle.name}', stderr=StringIO()
+        )
+        with open(handle.name) as output:
+            ticks = [parse_tick(line) for line in output]
+        self.assertEqual(len(ticks), 10)
+        self.assertTrue(all(ticks))
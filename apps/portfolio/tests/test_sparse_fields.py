@@ -0,0 +1,116 @@
+import gzip
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from decimal import Decimal
+from ..models import Asset
+
+User = get_user_model()
+
+
+class SparseFieldsTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_asset_list_fields(self):
+        response = self.client.get('/api/portfolio/assets/?fields=symbol,current_value')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {'symbol': 'AAPL', 'current_value': 1500.0})
+
+    def test_asset_list_exclude(self):
+        response = self.client.get('/api/portfolio/assets/?exclude=created_at,updated_at')
+        self.assertNotIn('created_at', response.data[0])
+        self.assertIn('performance_percentage', response.data[0])
+
+    def test_asset_list_prunes_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/portfolio/assets/?fields=symbol')
+        select = [q['sql'] for q in context.captured_queries if 'portfolio_asset' in q['sql']][-1]
+        self.assertIn('"symbol"', select)
+        self.assertNotIn('"purchase_price"', select)
+
+    def test_summary_fields(self):
+        response = self.client.get('/api/portfolio/summary/?fields=total_current_value,asset_count')
+        self.assertEqual(response.data, {'total_current_value': 1500.0, 'asset_count': 1})
+
+    def test_summary_asset_fields(self):
+        response = self.client.get('/api/portfolio/assets/summary/?fields=by_type&asset_fields=symbol,current_value')
+        self.assertEqual(list(response.data), ['by_type'])
+        self.assertEqual(response.data['by_type']['Action']['assets'], [{'symbol': 'AAPL', 'current_value': 1500.0}])
+
+    def test_performance_exclude(self):
+        response = self.client.get('/api/portfolio/performance/?exclude=assets&asset_fields=symbol')
+        self.assertNotIn('assets', response.data)
+        self.assertEqual(response.data['best_performer'], {'symbol': 'AAPL'})
+        self.assertEqual(response.data['average_performance'], 50.0)
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_SIZE=200)
+class CompressionTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        for index in range(5):
+            Asset.objects.create(
+                user=self.user,
+                asset_type='STOCK',
+                symbol=f'SYM{index}',
+                name='Asset',
+                quantity=Decimal('10'),
+                purchase_price=Decimal('100'),
+                current_price=Decimal('150'),
+                purchase_date='2024-01-15'
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def test_large_response_is_gzipped(self):
+        response = self.client.get('/api/portfolio/assets/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'SYM4', gzip.decompress(response.content))
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+    def test_small_response_not_compressed(self):
+        response = self.client.get('/api/portfolio/summary/?fields=asset_count', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_gzip_length_is_randomized(self):
+        sizes = {
+            len(self.client.get('/api/portfolio/assets/', HTTP_ACCEPT_ENCODING='gzip').content)
+            for _ in range(10)
+        }
+        self.assertGreater(len(sizes), 1)
+
+    def test_only_portfolio_paths_are_compressed(self):
+        response = self.client.post(
+            '/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'},
+            format='json', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertGreater(len(response.content), 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_no_accept_encoding(self):
+        response = self.client.get('/api/portfolio/assets/')
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from ..models import Asset, PortfolioVersion
+from ..streaming import (
+    AssetEvent,
+    PriceEvent,
+    PortfolioEventBus,
+    PortfolioValuation,
+    ValuationSource,
+    valuation_stream
+)
+
+User = get_user_model()
+
+
+def parse_events(chunks):
+    return [
+        json.loads(chunk.split('data: ', 1)[1])
+        for chunk in chunks if chunk.startswith('event: valuation')
+    ]
+
+
+class PortfolioValuationTests(TestCase):
+
+    def setUp(self):
+        self.valuation = PortfolioValuation(1, [
+            (1, 'STOCK', 'AAPL', Decimal('10'), Decimal('150')),
+            (2, 'STOCK', 'AAPL', Decimal('5'), Decimal('150')),
+            (3, 'CRYPTO', 'BTC', Decimal('0.5'), Decimal('50000')),
+        ])
+
+    def test_initial_snapshot(self):
+        snapshot = self.valuation.snapshot()
+        self.assertEqual(snapshot['total_value'], 27250.0)
+        self.assertEqual(snapshot['by_type'], {'Crypto-monnaie': 25000.0, 'Action': 2250.0})
+
+    def test_price_event_updates_all_lots(self):
+        self.assertTrue(self.valuation.apply(PriceEvent({'AAPL': Decimal('200')})))
+        self.assertEqual(self.valuation.snapshot()['by_type']['Action'], 3000.0)
+        self.assertFalse(self.valuation.apply(PriceEvent({'MSFT': Decimal('1')})))
+
+    def test_asset_events(self):
+        self.valuation.apply(AssetEvent(user_id=1, asset_id=3, deleted=True))
+        self.assertNotIn('Crypto-monnaie', self.valuation.snapshot()['by_type'])
+        self.valuation.apply(AssetEvent(
+            user_id=1, asset_id=4, asset_type='BOND', symbol='US10Y',
+            quantity=Decimal('5'), current_price=Decimal('100')
+        ))
+        self.assertEqual(self.valuation.snapshot()['total_value'], 2750.0)
+        self.assertFalse(self.valuation.apply(AssetEvent(user_id=2, asset_id=9, deleted=True)))
+
+
+class StaticSource:
+    """Portefeuille dont la version en base ne change pas (écritures locales uniquement)"""
+
+    def __init__(self, valuation):
+        self.user_id = valuation.user_id
+        self.valuation = valuation
+
+    def version(self):
+        return 0
+
+    def load(self):
+        return 0, self.valuation
+
+
+class ValuationStreamTests(TestCase):
+
+    def test_burst_is_coalesced(self):
+        async def scenario():
+            bus = PortfolioEventBus()
+            valuation = PortfolioValuation(1, [(1, 'STOCK', 'AAPL', Decimal('10'), Decimal('150'))])
+            stream = valuation_stream(StaticSource(valuation), bus, interval=0.2, max_events=2)
+            chunks = [await stream.__anext__()]
+
+            def burst():
+                for price in range(151, 251):
+                    bus.publish(PriceEvent({'AAPL': Decimal(price)}))
+
+            # Publication depuis un autre thread, comme un signal Django
+            await asyncio.get_running_loop().run_in_executor(None, burst)
+            async for chunk in stream:
+                chunks.append(chunk)
+            return chunks, bus
+
+        chunks, bus = async_to_sync(scenario)()
+        events = parse_events(chunks)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0]['total_value'], 1500.0)
+        self.assertEqual(events[1]['total_value'], 2500.0)
+        self.assertFalse(bus.has_subscribers())
+
+    def test_writes_from_other_processes_are_polled(self):
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        Asset.objects.create(
+            user=user, asset_type='STOCK', symbol='AAPL', name='Apple', quantity=Decimal('10'),
+            purchase_price=Decimal('100'), current_price=Decimal('150'), purchase_date='2024-01-15'
+        )
+
+        def ingest_elsewhere():
+            # Ingestion dans un autre processus : rien n'est publié sur ce bus
+            Asset.objects.filter(user=user).update(current_price=Decimal('200'))
+            PortfolioVersion.bump([user.id])
+
+        async def scenario():
+            bus = PortfolioEventBus()
+            stream = valuation_stream(
+                ValuationSource(user.id), bus, interval=0.05, poll_interval=0.05, max_events=2
+            )
+            chunks = [await stream.__anext__()]
+            await sync_to_async(ingest_elsewhere)()
+            async for chunk in stream:
+                chunks.append(chunk)
+            return chunks
+
+        events = parse_events(async_to_sync(scenario)())
+        self.assertEqual([event['total_value'] for event in events], [1500.0, 2000.0])
+
+    def test_subscription_released_when_initial_load_fails(self):
+        class BrokenSource(StaticSource):
+            def load(self):
+                raise RuntimeError("base indisponible")
+
+        async def scenario():
+            bus = PortfolioEventBus()
+            stream = valuation_stream(BrokenSource(PortfolioValuation(1)), bus)
+            with self.assertRaises(RuntimeError):
+                await stream.__anext__()
+            return bus
+
+        self.assertFalse(async_to_sync(scenario)().has_subscribers())
+
+
+class PortfolioStreamViewTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        Asset.objects.create(
+            user=self.user,
+            asset_type='STOCK',
+            symbol='AAPL',
+            name='Apple',
+            quantity=Decimal('10'),
+            purchase_price=Decimal('100'),
+            current_price=Decimal('150'),
+            purchase_date='2024-01-15'
+        )
+
+    async def test_stream_first_event(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/portfolio/stream/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunk = await response.streaming_content.__anext__()
+        await response.streaming_content.aclose()
+        self.assertEqual(parse_events([chunk.decode()])[0]['total_value'], 1500.0)
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get('/api/portfolio/stream/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_requires_asgi(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/api/portfolio/stream/')
+        self.assertEqual(response.status_code, 501)
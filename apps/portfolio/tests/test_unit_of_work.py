@@ -0,0 +1,117 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+
+from ..models import Asset
+from ..services.repositories import DjangoAssetRepository
+from ..services.unit_of_work import UnitOfWork
+
+User = get_user_model()
+
+
+class UnitOfWorkTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.assets = [self.create_asset(f'SYM{index}', index) for index in range(10)]
+        self.repository = DjangoAssetRepository()
+
+    def create_asset(self, symbol, index, **kwargs):
+        return Asset.objects.create(**{
+            'user': self.user,
+            'asset_type': 'STOCK',
+            'symbol': symbol,
+            'name': symbol,
+            'quantity': Decimal('10'),
+            'purchase_price': Decimal('100'),
+            'current_price': Decimal('150'),
+            'purchase_date': date(2024, 1, 1 + index),
+            **kwargs,
+        })
+
+    def new_asset(self, symbol, index):
+        return Asset(
+            user_id=self.user.id, asset_type='BOND', symbol=symbol, name=symbol,
+            quantity=Decimal('1'), purchase_price=Decimal('10'), current_price=Decimal('11'),
+            purchase_date=date(2024, 2, 1 + index)
+        )
+
+    def test_queries_do_not_grow_with_assets(self):
+        unit = UnitOfWork(self.repository)
+        for index, asset in enumerate(self.assets[:5]):
+            unit.register_clean(asset)
+            asset.current_price = Decimal(200 + index)
+            unit.register_dirty(asset)
+        for asset in self.assets[5:]:
+            unit.register_removed(asset)
+        for index in range(5):
+            unit.register_new(self.new_asset(f'NEW{index}', index))
+
+        # savepoint + DELETE, UPDATE, INSERT (et la version du portefeuille après chacun)
+        with self.assertNumQueries(8):
+            counts = unit.commit()
+        self.assertEqual(counts, {'deleted': 5, 'updated': 5, 'created': 5})
+        self.assertEqual(
+            sorted(Asset.objects.filter(user=self.user).values_list('symbol', flat=True)),
+            ['NEW0', 'NEW1', 'NEW2', 'NEW3', 'NEW4', 'SYM0', 'SYM1', 'SYM2', 'SYM3', 'SYM4']
+        )
+        self.assertEqual(Asset.objects.get(id=self.assets[3].id).current_price, Decimal('203'))
+
+    def test_only_changed_fields_are_written(self):
+        asset = self.assets[0]
+        unit = UnitOfWork(self.repository)
+        unit.register_clean(asset)
+        asset.current_price = Decimal('175')
+        asset.quantity = Decimal('10')  # valeur inchangée
+        unit.register_dirty(asset)
+        self.assertEqual(unit.changed_fields(), {'current_price'})
+
+        # Modification concurrente d'un champ non modifié : elle n'est pas écrasée
+        Asset.objects.filter(id=asset.id).update(name='Renommé')
+        unit.commit()
+        asset = Asset.objects.get(id=asset.id)
+        self.assertEqual((asset.current_price, asset.name), (Decimal('175'), 'Renommé'))
+
+    def test_unchanged_asset_is_not_written(self):
+        unit = UnitOfWork(self.repository)
+        unit.register_clean(self.assets[0])
+        unit.register_dirty(self.assets[0])
+        with self.assertNumQueries(0):
+            self.assertEqual(unit.commit(), {'deleted': 0, 'updated': 0, 'created': 0})
+
+    def test_delete_before_insert_allows_same_key(self):
+        replaced = self.assets[0]
+        unit = UnitOfWork(self.repository)
+        unit.register_removed(replaced)
+        unit.register_new(Asset(
+            user_id=self.user.id, asset_type='STOCK', symbol=replaced.symbol, name='Remplacé',
+            quantity=Decimal('1'), purchase_price=Decimal('1'), current_price=Decimal('1'),
+            purchase_date=replaced.purchase_date
+        ))
+        unit.commit()
+        self.assertEqual(Asset.objects.get(user=self.user, symbol=replaced.symbol).name, 'Remplacé')
+
+    def test_removed_asset_cannot_be_dirty(self):
+        unit = UnitOfWork(self.repository)
+        unit.register_removed(self.assets[0])
+        with self.assertRaises(ValueError):
+            unit.register_dirty(self.assets[0], ['current_price'])
+        with self.assertRaises(ValueError):
+            unit.register_dirty(self.assets[1])
+
+    def test_context_manager_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork(self.repository) as unit:
+                unit.register_removed(self.assets[0])
+                raise RuntimeError
+        self.assertTrue(Asset.objects.filter(id=self.assets[0].id).exists())
+
+        with self.assertRaises(IntegrityError):
+            with UnitOfWork(self.repository) as unit:
+                unit.register_removed(self.assets[1])
+                unit.register_new(self.new_asset('DUP', 0))
+                unit.register_new(self.new_asset('DUP', 0))
+        self.assertTrue(Asset.objects.filter(id=self.assets[1].id).exists())
@@ -1,12 +1,30 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AssetViewSet, PortfolioSummaryView, PortfolioPerformanceView
+from .views import (
+    AssetViewSet,
+    AumView,
+    PortfolioSummaryView,
+    PortfolioPerformanceView,
+    JobViewSet,
+    ProjectionView,
+    RebalanceView,
+    RiskView,
+    TargetAllocationViewSet,
+    portfolio_stream
+)
 
 router = DefaultRouter()
 router.register(r'assets', AssetViewSet, basename='asset')
+router.register(r'jobs', JobViewSet, basename='job')
+router.register(r'targets', TargetAllocationViewSet, basename='target')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('summary/', PortfolioSummaryView.as_view(), name='portfolio_summary'),
     path('performance/', PortfolioPerformanceView.as_view(), name='portfolio_performance'),
+    path('rebalance/', RebalanceView.as_view(), name='portfolio_rebalance'),
+    path('risk/', RiskView.as_view(), name='portfolio_risk'),
+    path('projection/', ProjectionView.as_view(), name='portfolio_projection'),
+    path('aum/', AumView.as_view(), name='portfolio_aum'),
+    path('stream/', portfolio_stream, name='portfolio_stream'),
 ]
@@ -1,37 +1,112 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.decorators import action
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.reverse import reverse
+from rest_framework.viewsets import ModelViewSet, ViewSet
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from .models import Asset
+from .filters import filter_assets, history_filters
+from .mixins import ConditionalGetMixin
+from .models import Asset, Job, TargetAllocation
 from .serializers import (
     AssetSerializer,
     AssetCreateUpdateSerializer,
+    AssetBatchSerializer,
+    AssetBatchOperationSerializer,
+    AssetHistorySerializer,
+    AumSerializer,
     PortfolioSummarySerializer,
-    PerformanceSerializer
+    PerformanceSerializer,
+    JobSerializer,
+    JobCreateSerializer,
+    TargetAllocationSerializer,
+    RebalanceSerializer,
+    RiskMetricsSerializer,
+    ProjectionSerializer,
+    parse_field_selection
 )
+from .services.aum import AumService, AumUnavailable
+from .services.jobs import JobService
 from .services.portfolio_service import PortfolioService
-from .services.repositories import DjangoAssetRepository
+from .services.projection import ProjectionService
+from .services.rebalancing import RebalancingService
+from .services.search import SearchService
+from .services.risk import RiskService
+from .services.repositories import AssetVersionConflict, get_asset_repository
 from .services.calculators import SimpleROICalculator
+from .streaming import ValuationSource, event_bus, valuation_stream
 
 
-class AssetViewSet(ModelViewSet):
+def get_summary_selection(request):
+    """Champs demandés pour le résumé (?fields=, ?exclude=, ?asset_fields=, ?asset_exclude=)"""
+    return {
+        'fields': parse_field_selection(request.query_params, PortfolioService.SUMMARY_FIELDS),
+        'asset_fields': parse_field_selection(
+            request.query_params, PortfolioService.SUMMARY_ASSET_FIELDS, 'asset_fields', 'asset_exclude'
+        ),
+    }
+
+
+def get_performance_selection(request):
+    """Champs demandés pour la performance (?fields=, ?exclude=, ?asset_fields=, ?asset_exclude=)"""
+    return {
+        'fields': parse_field_selection(request.query_params, PortfolioService.PERFORMANCE_FIELDS),
+        'asset_fields': parse_field_selection(
+            request.query_params, PortfolioService.PERFORMANCE_ASSET_FIELDS, 'asset_fields', 'asset_exclude'
+        ),
+    }
+
+
+def get_float_param(request, name: str, default: float = 0.0) -> float:
+    """Lire un paramètre numérique positif de la requête (400 si invalide)"""
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise ValidationError({name: "Nombre positif attendu"})
+    return value
+
+
+class AssetViewSet(ConditionalGetMixin, ModelViewSet):
     """
     ViewSet pour la gestion des actifs
     Endpoints:
     - GET /api/portfolio/assets/ - Lister tous les actifs de l'utilisateur
+      (filtres ?asset_type=, ?symbol=, ?purchase_date_after=, ?min_value=, ?min_performance=...,
+      tri ?ordering=-performance_percentage)
     - POST /api/portfolio/assets/ - Créer un nouvel actif
     - GET /api/portfolio/assets/{id}/ - Récupérer les détails d'un actif
-    - PUT /api/portfolio/assets/{id}/ - Mettre à jour un actif
+    - PUT/PATCH /api/portfolio/assets/{id}/ - Mettre à jour un actif (409 si `version` est périmée)
     - DELETE /api/portfolio/assets/{id}/ - Supprimer un actif
+    - POST /api/portfolio/assets/batch/ - Appliquer un lot d'opérations en une transaction
+    - GET /api/portfolio/assets/search/?q= - Rechercher par symbole ou nom (autocomplétion)
+    - GET /api/portfolio/assets/history/ - Historique des lots, archives comprises
     """
     
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         """Ne retourner que les actifs de l'utilisateur connecté"""
-        return Asset.objects.filter(user=self.request.user).order_by('-created_at')
+        queryset = Asset.objects.filter(user=self.request.user).order_by('-created_at')
+        if self.action == 'list':
+            queryset = filter_assets(queryset, self.request.query_params)
+        if self.action in ['list', 'retrieve']:
+            # Réponse partielle : ne charger que les colonnes utiles
+            selected = parse_field_selection(self.request.query_params, AssetSerializer.Meta.fields)
+            if selected is not None:
+                queryset = queryset.only(*AssetSerializer.get_model_fields(selected))
+        return queryset
 
     def get_serializer_class(self):
         """Utiliser des serializers différents selon l'action"""
@@ -39,13 +114,150 @@ class AssetViewSet(ModelViewSet):
             return AssetCreateUpdateSerializer
         return AssetSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Lister les actifs (304 si le portefeuille n'a pas changé)"""
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Détail d'un actif (304 si le portefeuille n'a pas changé)"""
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Créer un actif associé à l'utilisateur connecté"""
         serializer.save(user=self.request.user)
 
-    def perform_update(self, serializer):
-        """Mettre à jour un actif"""
-        serializer.save()
+    def update(self, request, *args, **kwargs):
+        """
+        Mettre à jour un actif (PUT / PATCH) par un UPDATE conditionnel
+        
+        Seuls les champs envoyés sont écrits. Si le corps contient `version`,
+        la mise à jour n'est appliquée que si l'actif est toujours à cette
+        version : sinon 409 avec la version courante.
+        """
+        serializer = self.get_serializer(data=request.data, partial=kwargs.pop('partial', False))
+        serializer.is_valid(raise_exception=True)
+        asset_data = dict(serializer.validated_data)
+        expected_version = asset_data.pop('version', None)
+
+        service = PortfolioService(asset_repository=get_asset_repository())
+        try:
+            with transaction.atomic():
+                asset = service.update_asset(request.user.id, int(kwargs['pk']), asset_data, expected_version)
+        except (Asset.DoesNotExist, ValueError):
+            return Response({'detail': "Actif non trouvé"}, status=status.HTTP_404_NOT_FOUND)
+        except AssetVersionConflict as conflict:
+            return Response(
+                {'detail': "L'actif a été modifié entre-temps", 'current_version': conflict.current_version},
+                status=status.HTTP_409_CONFLICT
+            )
+        except IntegrityError:
+            return Response(
+                {'detail': "Conflit : un actif existe déjà pour ce symbole et cette date"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(self.get_serializer(asset).data, status=status.HTTP_200_OK)
+
+    def destroy(self, request, *args, **kwargs):
+        """Supprimer un actif en une requête (DELETE filtré par propriétaire)"""
+        service = PortfolioService(asset_repository=get_asset_repository())
+        try:
+            service.delete_asset(request.user.id, int(kwargs['pk']))
+        except (Asset.DoesNotExist, ValueError):
+            return Response({'detail': "Actif non trouvé"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Appliquer un lot d'opérations create/update/delete
+        POST /api/portfolio/assets/batch/
+        {"atomic": true, "operations": [{"op": "create", "data": {...}},
+                                        {"op": "update", "id": 1, "data": {...}},
+                                        {"op": "delete", "id": 2}]}
+        """
+        payload = AssetBatchSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        atomic = payload.validated_data['atomic']
+        raw_operations = payload.validated_data['operations']
+
+        results = [None] * len(raw_operations)
+        operations, positions = [], []
+        for index, raw_operation in enumerate(raw_operations):
+            operation = AssetBatchOperationSerializer(data=raw_operation)
+            if operation.is_valid():
+                operations.append(operation.validated_data)
+                positions.append(index)
+            else:
+                results[index] = {
+                    'op': raw_operation.get('op'),
+                    'id': raw_operation.get('id'),
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': operation.errors,
+                }
+
+        if atomic and len(operations) < len(raw_operations):
+            for index, operation in zip(positions, operations):
+                results[index] = {
+                    'op': operation['op'],
+                    'id': operation.get('id'),
+                    'status': status.HTTP_424_FAILED_DEPENDENCY,
+                    'errors': "Lot annulé",
+                }
+            return Response({'applied': False, 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+        service = PortfolioService(
+            asset_repository=get_asset_repository(),
+            calculator=SimpleROICalculator()
+        )
+        service_results, applied = service.apply_batch(request.user.id, operations, atomic=atomic)
+        for index, result in zip(positions, service_results):
+            if 'asset' in result:
+                result['asset'] = AssetSerializer(result['asset']).data
+            results[index] = result
+
+        if applied:
+            response_status = status.HTTP_200_OK
+        elif any(result['status'] == status.HTTP_409_CONFLICT for result in results):
+            response_status = status.HTTP_409_CONFLICT
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'applied': applied, 'results': results}, status=response_status)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Recherche par préfixe de symbole ou de mots du nom
+        GET /api/portfolio/assets/search/?q=app&limit=20
+        GET /api/portfolio/assets/search/?q=app&scope=universe (tous les symboles connus)
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': "Ce paramètre est obligatoire."})
+        limit = get_float_param(request, 'limit', 20)
+        if not 1 <= limit <= 100 or limit != int(limit):
+            raise ValidationError({'limit': "Entier entre 1 et 100 attendu"})
+
+        service = SearchService()
+        if request.query_params.get('scope') == SearchService.UNIVERSE:
+            return Response(service.search_universe(query, int(limit)), status=status.HTTP_200_OK)
+        assets = service.search_user(request.user.id, query, int(limit))
+        serializer = AssetSerializer(assets, many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Historique des lots, archives comprises (positions soldées, portefeuille inactif)
+        GET /api/portfolio/assets/history/?symbol=AAPL&purchase_date_after=2023-01-01
+        """
+        rows = get_asset_repository().find_history_by_user(request.user.id, history_filters(request.query_params))
+        return Response(AssetHistorySerializer(rows, many=True).data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
@@ -53,13 +265,17 @@ class AssetViewSet(ModelViewSet):
         Endpoint personnalisé pour le résumé du portefeuille
         GET /api/portfolio/assets/summary/
         """
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
         service = PortfolioService(
-            asset_repository=DjangoAssetRepository(),
+            asset_repository=get_asset_repository(),
             calculator=SimpleROICalculator()
         )
         
-        summary = service.get_portfolio_summary(request.user.id)
-        serializer = PortfolioSummarySerializer(summary)
+        summary = service.get_portfolio_summary(request.user.id, **get_summary_selection(request))
+        serializer = PortfolioSummarySerializer(summary, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
@@ -68,17 +284,21 @@ class AssetViewSet(ModelViewSet):
         Endpoint personnalisé pour la performance du portefeuille
         GET /api/portfolio/assets/performance/
         """
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
         service = PortfolioService(
-            asset_repository=DjangoAssetRepository(),
+            asset_repository=get_asset_repository(),
             calculator=SimpleROICalculator()
         )
         
-        performance = service.get_portfolio_performance(request.user.id)
-        serializer = PerformanceSerializer(performance)
+        performance = service.get_portfolio_performance(request.user.id, **get_performance_selection(request))
+        serializer = PerformanceSerializer(performance, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class PortfolioSummaryView(generics.GenericAPIView):
+class PortfolioSummaryView(ConditionalGetMixin, generics.GenericAPIView):
     """
     Vue pour obtenir le résumé du portefeuille
     GET /api/portfolio/summary/
@@ -89,17 +309,21 @@ class PortfolioSummaryView(generics.GenericAPIView):
 
     def get(self, request, *args, **kwargs):
         """Récupérer le résumé du portefeuille"""
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
         service = PortfolioService(
-            asset_repository=DjangoAssetRepository(),
+            asset_repository=get_asset_repository(),
             calculator=SimpleROICalculator()
         )
         
-        summary = service.get_portfolio_summary(request.user.id)
+        summary = service.get_portfolio_summary(request.user.id, **get_summary_selection(request))
         serializer = self.get_serializer(summary)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class PortfolioPerformanceView(generics.GenericAPIView):
+class PortfolioPerformanceView(ConditionalGetMixin, generics.GenericAPIView):
     """
     Vue pour obtenir la performance du portefeuille
     GET /api/portfolio/performance/
@@ -110,11 +334,231 @@ class PortfolioPerformanceView(generics.GenericAPIView):
 
     def get(self, request, *args, **kwargs):
         """Récupérer la performance du portefeuille"""
+        not_modified = self.get_not_modified_response(request)
+        if not_modified is not None:
+            return not_modified
+
         service = PortfolioService(
-            asset_repository=DjangoAssetRepository(),
+            asset_repository=get_asset_repository(),
             calculator=SimpleROICalculator()
         )
         
-        performance = service.get_portfolio_performance(request.user.id)
+        performance = service.get_portfolio_performance(request.user.id, **get_performance_selection(request))
         serializer = self.get_serializer(performance)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TargetAllocationViewSet(ModelViewSet):
+    """
+    ViewSet pour les allocations cibles
+    Endpoints:
+    - GET /api/portfolio/targets/ - Lister les allocations cibles
+    - POST /api/portfolio/targets/ - Ajouter une cible (asset_type ou symbol, weight)
+    - PUT/PATCH/DELETE /api/portfolio/targets/{id}/ - Modifier ou supprimer une cible
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TargetAllocationSerializer
+
+    def get_queryset(self):
+        """Ne retourner que les cibles de l'utilisateur connecté"""
+        return TargetAllocation.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        """Créer une cible associée à l'utilisateur connecté"""
+        serializer.save(user=self.request.user)
+
+
+class RebalanceView(generics.GenericAPIView):
+    """
+    Vue pour obtenir l'écart à l'allocation cible et les ordres de rééquilibrage
+    GET /api/portfolio/rebalance/?tolerance=0.05&min_trade_value=10
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = RebalanceSerializer
+
+    def get(self, request, *args, **kwargs):
+        """Calculer écarts et ordres pour l'utilisateur connecté"""
+        service = RebalancingService(
+            tolerance=get_float_param(request, 'tolerance'),
+            min_trade_value=get_float_param(request, 'min_trade_value')
+        )
+        serializer = self.get_serializer(service.rebalance_user(request.user.id))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class RiskView(generics.GenericAPIView):
+    """
+    Vue pour obtenir les métriques de risque du portefeuille
+    GET /api/portfolio/risk/?window=90&confidence=0.95
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = RiskMetricsSerializer
+
+    def get(self, request, *args, **kwargs):
+        """Volatilité, VaR, drawdown maximal et corrélations (mis en cache)"""
+        window = get_float_param(request, 'window', 90)
+        confidence = get_float_param(request, 'confidence', 0.95)
+        if not 1 <= window <= 3650 or window != int(window):
+            raise ValidationError({'window': "Nombre de jours entier entre 1 et 3650 attendu"})
+        if not 0.5 <= confidence < 1:
+            raise ValidationError({'confidence': "Niveau de confiance entre 0.5 et 1 attendu"})
+
+        service = RiskService(window_days=int(window), confidence=confidence)
+        serializer = self.get_serializer(service.get_risk_metrics(request.user.id))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ProjectionView(generics.GenericAPIView):
+    """
+    Vue pour obtenir la distribution de la valeur future du portefeuille
+    GET /api/portfolio/projection/?horizon=10&paths=100000&seed=42
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProjectionSerializer
+
+    def get(self, request, *args, **kwargs):
+        """Projection Monte Carlo (percentiles annuels)"""
+        horizon = get_float_param(request, 'horizon', 10)
+        paths = get_float_param(request, 'paths', 100000)
+        seed = request.query_params.get('seed')
+        if not 1 <= horizon <= ProjectionService.MAX_HORIZON or horizon != int(horizon):
+            raise ValidationError({'horizon': f"Nombre d'années entier entre 1 et {ProjectionService.MAX_HORIZON} attendu"})
+        max_paths = ProjectionService.max_paths(int(horizon))
+        if not 1 <= paths <= max_paths:
+            raise ValidationError({'paths': f"Nombre de trajectoires entre 1 et {max_paths} attendu (horizon {int(horizon)} ans)"})
+        if seed is not None and not seed.isdigit():
+            raise ValidationError({'seed': "Entier positif attendu"})
+
+        projection = ProjectionService().project(
+            request.user.id,
+            horizon_years=int(horizon),
+            paths=int(paths),
+            seed=int(seed) if seed is not None else None
+        )
+        serializer = self.get_serializer(projection)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AumView(generics.GenericAPIView):
+    """
+    Vue pour le tableau de bord de l'encours sous gestion (tous utilisateurs)
+    GET /api/portfolio/aum/
+    Réservée aux administrateurs (is_staff).
+    """
+
+    permission_classes = [IsAdminUser]
+    serializer_class = AumSerializer
+
+    def get(self, request, *args, **kwargs):
+        """Encours total, par type d'actif, principaux symboles et tranches d'utilisateurs (mis en cache)"""
+        service = AumService(
+            top_symbols=getattr(settings, 'PORTFOLIO_AUM_TOP_SYMBOLS', 10),
+            refresh_interval=getattr(settings, 'PORTFOLIO_AUM_REFRESH_INTERVAL', 300),
+            wait_timeout=getattr(settings, 'PORTFOLIO_AUM_WAIT_TIMEOUT', 5)
+        )
+        try:
+            dashboard = service.get_dashboard()
+        except AumUnavailable:
+            response = Response(
+                {'detail': "Calcul de l'encours en cours, réessayer dans quelques secondes"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            response['Retry-After'] = '5'
+            return response
+        serializer = self.get_serializer(dashboard)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class JobViewSet(ViewSet):
+    """
+    ViewSet pour les tâches asynchrones (calculs lourds)
+    Endpoints:
+    - POST /api/portfolio/jobs/ - Mettre une tâche en file (202 Accepted)
+    - GET /api/portfolio/jobs/{id}/ - Consulter l'état et le résultat d'une tâche
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSerializer
+
+    def create(self, request):
+        """Mettre une tâche en file, le worker `run_jobs` l'exécutera"""
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = JobService().enqueue(
+            request.user.id,
+            serializer.validated_data['kind'],
+            serializer.validated_data['params']
+        )
+        return Response(
+            {
+                'id': job.id,
+                'status': job.status,
+                'url': reverse('job-detail', kwargs={'pk': job.id}, request=request),
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    def retrieve(self, request, pk=None):
+        """Consulter une tâche de l'utilisateur connecté"""
+        try:
+            job = JobService().get_job(request.user.id, pk)
+        except (Job.DoesNotExist, ValueError):
+            return Response({'detail': "Tâche non trouvée"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(JobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+async def get_stream_user(request):
+    """Authentifier une requête de streaming (session ou JWT Bearer)"""
+    user = await request.auser()
+    if user.is_authenticated:
+        return user
+    try:
+        result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+async def portfolio_stream(request):
+    """
+    Flux Server-Sent Events de la valorisation du portefeuille
+    GET /api/portfolio/stream/?interval=1
+    Nécessite un serveur ASGI (config.asgi).
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': "Méthode non autorisée"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'detail': "Le streaming nécessite un serveur ASGI"},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+
+    user = await get_stream_user(request)
+    if user is None:
+        return JsonResponse(
+            {'detail': "Informations d'authentification non fournies."},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    default_interval = getattr(settings, 'PORTFOLIO_STREAM_INTERVAL', 1.0)
+    try:
+        interval = float(request.GET.get('interval', default_interval))
+    except ValueError:
+        interval = default_interval
+    interval = min(max(interval, 0.1), 60.0)
+
+    response = StreamingHttpResponse(
+        valuation_stream(
+            ValuationSource(user.id), event_bus, interval=interval,
+            poll_interval=getattr(settings, 'PORTFOLIO_STREAM_POLL_INTERVAL', 2.0)
+        ),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
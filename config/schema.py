@@ -0,0 +1,93 @@
+"""
+Schéma OpenAPI précalculé
+
+Le schéma est servi depuis un artefact généré au déploiement
+(python manage.py spectacular --format openapi-json --file <API_SCHEMA_FILE>)
+ou, à défaut, généré une seule fois au premier appel puis mémorisé.
+drf_spectacular n'est importé qu'à ce moment-là : le démarrage d'un
+worker ne paie pas l'introspection des vues et serializers.
+"""
+
+import hashlib
+import threading
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+SCHEMA_CONTENT_TYPE = 'application/vnd.oai.openapi+json'
+
+_lock = threading.Lock()
+_schema = None
+
+
+def generate_schema() -> bytes:
+    """Introspecter l'API et produire le schéma OpenAPI (JSON)"""
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def get_schema():
+    """
+    Retourner (contenu, etag) du schéma, calculés une seule fois par processus
+
+    Returns:
+        Tuple (bytes du schéma, ETag)
+    """
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                path = getattr(settings, 'API_SCHEMA_FILE', None)
+                if path and Path(path).is_file():
+                    content = Path(path).read_bytes()
+                else:
+                    content = generate_schema()
+                _schema = (content, f'"{hashlib.md5(content).hexdigest()}"')
+    return _schema
+
+
+def reset_schema() -> None:
+    """Oublier le schéma mémorisé (nouvel artefact, tests)"""
+    global _schema
+    with _lock:
+        _schema = None
+
+
+def schema_view(request):
+    """
+    Servir le schéma OpenAPI
+    GET /api/schema/
+    """
+    content, etag = get_schema()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=SCHEMA_CONTENT_TYPE)
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'API_SCHEMA_MAX_AGE', 3600))
+    return response
+
+
+def lazy_view(dotted_path: str, **initkwargs):
+    """
+    Vue basée sur une classe importée au premier appel seulement
+
+    Args:
+        dotted_path: Chemin de la classe de vue (module.Classe)
+        **initkwargs: Arguments passés à as_view()
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            module_path, _, class_name = dotted_path.rpartition('.')
+            view = getattr(import_module(module_path), class_name).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
@@ -36,6 +36,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.portfolio.middleware.CompressionMiddleware',
+    'apps.portfolio.instrumentation.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -91,6 +93,8 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # last_login sert à détecter les utilisateurs inactifs (archivage)
+    'UPDATE_LAST_LOGIN': True,
 }
 
 # Configuration Documentation API (Source: 6.8 drf-spectacular)
@@ -101,6 +105,65 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Schéma OpenAPI précalculé au déploiement (généré au premier appel s'il est absent)
+API_SCHEMA_FILE = BASE_DIR / 'docs' / 'openapi.json'
+API_SCHEMA_MAX_AGE = 3600
+
+# Compression des réponses (brotli si le paquet est installé, sinon gzip)
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+# Préfixes d'URL compressés (BREACH : pas de secret ni de saisie réfléchie dans ces réponses)
+RESPONSE_COMPRESSION_PATHS = ['/api/portfolio/']
+
+# Flux SSE de valorisation : intervalle minimal (s) entre deux événements par client
+PORTFOLIO_STREAM_INTERVAL = 1.0
+# Relecture (s) de la version du portefeuille : écritures des autres processus (ingestion, workers)
+PORTFOLIO_STREAM_POLL_INTERVAL = 2.0
+
+# Cache applicatif (mémoire locale du processus ; Redis/Memcached en production multi-process)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Métriques de risque : durée de vie (s) d'un résultat en cache
+PORTFOLIO_RISK_CACHE_TIMEOUT = 300
+
+# Cache des lectures du repository d'actifs (None = désactivé) :
+# {'max_entries': 1024, 'ttl': 60, 'backend': None} ; backend = alias de CACHES pour un cache partagé
+PORTFOLIO_REPOSITORY_CACHE = None
+
+# Archivage (manage.py archive_assets) : inactivité avant archivage d'un portefeuille (jours) et taille des lots
+ARCHIVE_DORMANT_DAYS = 365
+ARCHIVE_BATCH_SIZE = 1000
+
+# Projection Monte Carlo : processus du pool (0 = calcul dans le processus web) et budget de temps (s)
+PORTFOLIO_PROJECTION_WORKERS = 2
+PORTFOLIO_PROJECTION_TIME_BUDGET = 2.0
+
+# Tableau de bord AUM (administrateurs) : âge (s) avant recalcul et nombre de symboles affichés
+PORTFOLIO_AUM_REFRESH_INTERVAL = 300
+PORTFOLIO_AUM_TOP_SYMBOLS = 10
+# Cache vide : attente maximale (s) du calcul lancé par une autre requête avant un 503
+PORTFOLIO_AUM_WAIT_TIMEOUT = 5
+
+# Budget de requêtes SQL : 'off', 'log' ou 'raise' (développement), budgets par vue
+# ou par méthode de service ('PortfolioService.update_asset'), seuil de N+1
+QUERY_BUDGET_MODE = 'log'
+QUERY_BUDGETS = {
+    'asset-list': 5,
+    'asset-detail': 5,
+    'asset-summary': 4,
+    'asset-performance': 4,
+    'asset-search': 5,
+    'asset-batch': 10,
+}
+QUERY_BUDGET_DEFAULT = None
+QUERY_N_PLUS_ONE_THRESHOLD = 5
+
+# Baseline des microbenchmarks (python manage.py benchmark --save)
+BENCHMARK_BASELINE_FILE = BASE_DIR / 'benchmarks' / 'baseline.json'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
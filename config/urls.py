@@ -16,11 +16,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework.documentation import include_docs_urls
+
+from .schema import lazy_view, schema_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('apps.users.urls')),
     path('api/portfolio/', include('apps.portfolio.urls')),
     path('api-auth/', include('rest_framework.urls')),  
+    path('api/schema/', schema_view, name='schema'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='docs'),
 ]